@@ -15,6 +15,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import logging
+from trnltk.morphology.model.tracing import get_tracer
 
 logger = logging.getLogger('query')
 
@@ -187,7 +188,7 @@ class QueryExecutor(object):
 
     def count(self):
         count = float(self.find().count())
-        logger.log(logging.DEBUG, u'\tFound {} results \n'.format(count))
+        _trace_query_counted(self._query_execution_context, count, False)
         return count
 
     def _build_query_with_params(self):
@@ -196,9 +197,9 @@ class QueryExecutor(object):
         for index, param in enumerate(self._params):
             mongo_query[self._query_execution_context.keys[index]] = param
 
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.log(logging.DEBUG, u'Using collection ' + self._query_execution_context.collection.full_name)
-            logger.log(logging.DEBUG, u'\tRunning query : ' + unicode(mongo_query))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'query_built', collection=self._query_execution_context.collection.full_name, query=mongo_query)
         return mongo_query
 
 class CachingQueryExecutor(QueryExecutor):
@@ -217,11 +218,11 @@ class CachingQueryExecutor(QueryExecutor):
         cached_count = query_cache_collection.find_one({'query': query_str}, fields=['count'])
 
         if cached_count and cached_count['count'] is not None:
-            logger.log(logging.DEBUG, u'\tFound query in the cache, returning result {}'.format(cached_count['count']))
+            _trace_query_counted(self._query_execution_context, cached_count['count'], True)
             return cached_count['count']
         else:
             count = self._query_execution_context.collection.find(query_with_params).count()
-            logger.log(logging.DEBUG, u'\tPutting query into the cache, with result {}'.format(count))
+            _trace_query_counted(self._query_execution_context, count, False)
             query_cache_collection.insert({'query' : query_str, 'count' : count})
             return count
 
@@ -235,10 +236,15 @@ class InMemoryCachingQueryExecutor(QueryExecutor):
         cached_count = InMemoryCachingQueryExecutor.query_cache.get(query_str)
 
         if cached_count is not None:
-            logger.log(logging.DEBUG, u'\tFound query in the cache, returning result {}'.format(cached_count))
+            _trace_query_counted(self._query_execution_context, cached_count, True)
             return cached_count
         else:
             count = self._query_execution_context.collection.find(query_with_params).count()
-            logger.log(logging.DEBUG, u'\tPutting query into the cache, with result {}'.format(count))
+            _trace_query_counted(self._query_execution_context, count, False)
             InMemoryCachingQueryExecutor.query_cache[query_str] = count
-            return count
\ No newline at end of file
+            return count
+
+def _trace_query_counted(query_execution_context, count, from_cache):
+    tracer = get_tracer()
+    if tracer.enabled:
+        tracer.trace(logger.name, 'query_counted', collection=query_execution_context.collection.full_name, count=count, from_cache=from_cache)
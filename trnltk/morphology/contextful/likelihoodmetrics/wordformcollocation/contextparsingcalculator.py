@@ -20,7 +20,7 @@ import numpy
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.querykeyappender import _context_word_appender, _target_surface_syn_cat_appender, _target_stem_syn_cat_appender, _target_lemma_root_syn_cat_appender, _context_surface_syn_cat_appender, _context_stem_syn_cat_appender, _context_lemma_root_syn_cat_appender
 from trnltk.morphology.contextful.likelihoodmetrics.hidden import query
 from trnltk.morphology.contextful.parser.sequencelikelihoodcalculator import SequenceLikelihoodCalculator
-from trnltk.morphology.model import formatter
+from trnltk.morphology.model.tracing import get_tracer
 
 numpy.seterr(divide='ignore', invalid='ignore')
 
@@ -32,11 +32,9 @@ class BaseContextParsingLikelihoodCalculator(object):
     WEIGHT_FOLLOWING_CONTEXT = 0.4
 
     def calculate_likelihood(self, target, leading_context, following_context, calculation_context=None):
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(u"  Calculating twoway likelihood of \n\t{0}\n\t{1}\n\t{2}".format(
-                [t[0].get_surface() if t else "<Unparsable>" for t in leading_context],
-                formatter.format_morpheme_container_for_simple_parseset(target),
-                [t[0].get_surface() if t else "<Unparsable>" for t in following_context]))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'twoway_likelihood_started', target=target, leading_context=leading_context, following_context=following_context)
 
         assert leading_context or following_context
 
@@ -65,7 +63,8 @@ class BaseContextParsingLikelihoodCalculator(object):
         if calculation_context is not None:
             calculation_context['sum_likelihood'] = likelihood
 
-        logger.debug("  Calculated likelihood is {}".format(likelihood))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'twoway_likelihood_calculated', target=target, likelihood=likelihood)
 
         return likelihood
 
@@ -139,20 +138,13 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
         assert target
         assert context
 
-        target_morpheme_container_str = target.format()
-
-        if logger.isEnabledFor(logging.DEBUG):
-            if target_comes_after:
-                logger.debug(u"  Calculating oneway likelihood of {1}, {0}".format(formatter.format_morpheme_container_for_simple_parseset(target),
-                    [t[0].get_surface() if t else "<Unparsable>" for t in context]))
-            else:
-                logger.debug(u"  Calculating oneway likelihood of {0}, {1}".format(formatter.format_morpheme_container_for_simple_parseset(target),
-                    [t[0].get_surface() if t else "<Unparsable>" for t in context]))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_started', target=target, context=context, target_comes_after=target_comes_after)
 
         cartesian_products_of_context_parse_results = self._get_cartesian_products_of_context_parse_results(context)
-        logger.debug("  Going to check the usages with the following cartesian product of parse results: \n{}".format(
-            [[formatter.format_morpheme_container_for_simple_parseset_without_suffixes(mc) for mc in product_item] for product_item in
-                                                                                                                   cartesian_products_of_context_parse_results]))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'context_parse_result_products_found', products=cartesian_products_of_context_parse_results)
 
         if not cartesian_products_of_context_parse_results or not any(cartesian_products_of_context_parse_results):
             return 0.0
@@ -168,20 +160,11 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
             if calculation_context is not None:
                 word_calc_context = calculation_context['possibilities'][index] = {}
 
-            if logger.isEnabledFor(logging.DEBUG):
-                context_parse_result_str_list = [formatter.format_morpheme_container_for_simple_parseset_without_suffixes(t) for t in context_parse_results]
-                if target_comes_after:
-                    logger.debug(u"   Calculating oneway likelihood of {1}, {0}".format(target_morpheme_container_str, context_parse_result_str_list))
-                else:
-                    logger.debug(u"   Calculating oneway likelihood of {0}, {1}".format(target_morpheme_container_str, context_parse_result_str_list))
-
             context_counts = self._get_context_form_count_matrix(context_parse_results)
-            logger.debug("       Context form counts: \n{}".format(context_counts))
 
             smoothed_context_counts = self._smooth_context_cooccurrence_counts(context_counts, context_parse_results)
             if calculation_context is not None:
                 word_calc_context['smoothed_context_counts'] = smoothed_context_counts
-            logger.debug("       Smoothed context form counts: \n{}".format(smoothed_context_counts))
 
             if calculation_context is not None:
                 word_calc_context['context_words'] = {}
@@ -200,18 +183,14 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
                         context_appender)
                     target_form_given_context_counts[i][j] = target_form_given_count
 
-            logger.debug("       Target form counts given context forms: \n{}".format(target_form_given_context_counts))
-
             if calculation_context is not None:
                 word_calc_context['target_form_counts'] = target_form_given_context_counts
-            logger.debug("       Target form counts: \n{}".format(target_form_given_context_counts))
 
             smoothed_target_form_given_context_counts = self._smooth_target_context_cooccurrence_counts(target_form_given_context_counts, target,
                 context_parse_results, target_comes_after)
 
             if calculation_context is not None:
                 word_calc_context['smoothed_target_form_counts'] = smoothed_target_form_given_context_counts
-            logger.debug("       Smoothed target form counts: \n{}".format(smoothed_target_form_given_context_counts))
 
             target_form_probabilities = smoothed_target_form_given_context_counts / smoothed_context_counts
             target_form_probabilities[numpy.isinf(target_form_probabilities)] = 0.0
@@ -219,32 +198,31 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
 
             if calculation_context is not None:
                 word_calc_context['target_form_probabilities'] = target_form_probabilities
-            logger.debug("       Target form probabilities: \n{}".format(target_form_probabilities))
+            if tracer.enabled:
+                tracer.trace(logger.name, 'target_form_probabilities_calculated', target=target, context_parse_results=context_parse_results,
+                    context_counts=context_counts, smoothed_context_counts=smoothed_context_counts,
+                    target_form_counts=target_form_given_context_counts, smoothed_target_form_counts=smoothed_target_form_given_context_counts,
+                    target_form_probabilities=target_form_probabilities)
 
             target_form_probabilities = target_form_probabilities * self.COEFFICIENTS_TARGET_GIVEN_CONTEXT_FORM
             if calculation_context is not None:
                 word_calc_context['coefficients_target_given_context_form'] = self.COEFFICIENTS_TARGET_GIVEN_CONTEXT_FORM
                 word_calc_context['target_form_probabilities_with_context_form_weights'] = target_form_probabilities
-            logger.debug("       Target form probabilities with context form weights: \n{}".format(target_form_probabilities))
 
             target_form_probabilities = numpy.dot(target_form_probabilities, numpy.ones((3, 1), dtype=float))
             if calculation_context is not None:
                 word_calc_context['summed_target_form_probabilities'] = target_form_probabilities
-            logger.debug("       Summed target form probabilities: \n{}".format(target_form_probabilities))
 
             weight_summed_target_probability = numpy.dot(self.COEFFICIENTS_TARGET_FORM_GIVEN_CONTEXT, target_form_probabilities)
             assert numpy.shape(weight_summed_target_probability) == (1, 1)
             if calculation_context is not None:
                 word_calc_context['coefficients_target_form_given_context'] = self.COEFFICIENTS_TARGET_FORM_GIVEN_CONTEXT
                 word_calc_context['weight_summed_target_probability'] = weight_summed_target_probability
-            logger.debug("       Weight-summed target probability: \n{}".format(weight_summed_target_probability))
 
             item_likelihood = weight_summed_target_probability[0][0]
 
             target_likelihoods_for_context_parse_results.append(item_likelihood)
 
-            logger.debug("      Calculated oneway likelihood for target given context item is {}".format(item_likelihood))
-
             # say, target_comes_after=True, context={c1,c2} and target=t
             # until now, we looked at collocation of (c1, c2, t) and (c2,t)
             # now we look collocation of (c1,c2)
@@ -258,7 +236,9 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
 
             context_parse_results_likelihoods.append(context_likelihood)
 
-            logger.debug("      Context likelihood is {}".format(context_likelihood))
+            if tracer.enabled:
+                tracer.trace(logger.name, 'context_item_likelihood_calculated', target=target, context_parse_results=context_parse_results,
+                    summed_target_form_probabilities=target_form_probabilities, target_likelihood=item_likelihood, context_likelihood=context_likelihood)
 
         likelihood = 0.0
 
@@ -269,7 +249,6 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
             normalized_context_parse_results_weights = [context_parse_results_item_weight/total_context_parse_results_weights for context_parse_results_item_weight in context_parse_results_likelihoods]
         else:
             normalized_context_parse_results_weights = [0.0 for context_parse_results_item_weight in context_parse_results_likelihoods]
-        logger.debug("     Normalized context parse results weights are {}".format(normalized_context_parse_results_weights))
 
         for index, context_parse_results in enumerate(cartesian_products_of_context_parse_results):
             target_likelihood_for_context_parse_results_item = target_likelihoods_for_context_parse_results[index]
@@ -281,11 +260,11 @@ class ContextParsingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator)
                 word_calc_context['context_likelihood'] = context_parse_results_item_likelihood
                 word_calc_context['weighted_parse_result_possibility_likelihood'] = weighted_parse_result_possibility_likelihood
 
-            logger.debug("      Weighted context parse result likelihood is {} for context : {}".format(weighted_parse_result_possibility_likelihood, context_parse_results))
-
         if calculation_context is not None:
             calculation_context['sum_likelihood'] = likelihood
-        logger.debug("  Calculated oneway likelihood is {}".format(likelihood))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_calculated', target=target, normalized_context_weights=normalized_context_parse_results_weights,
+                target_likelihoods=target_likelihoods_for_context_parse_results, likelihood=likelihood)
 
         return likelihood
 
@@ -16,7 +16,7 @@ limitations under the License.
 import logging
 import math
 from trnltk.morphology.contextful.likelihoodmetrics.wordformcollocation.contextparsingcalculator import  BaseContextParsingLikelihoodCalculator
-from trnltk.morphology.model import formatter
+from trnltk.morphology.model.tracing import get_tracer
 
 logger = logging.getLogger('interpolatingCollocationLikelihoodCalculator')
 
@@ -33,13 +33,9 @@ class InterpolatingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator):
         self._wrapped_calculator.build_indexes()
 
     def calculate_oneway_likelihood(self, target, context, target_comes_after, calculation_context=None):
-        if logger.isEnabledFor(logging.DEBUG):
-            if target_comes_after:
-                logger.debug(u"  Calculating oneway likelihood of {1}, {0}".format(formatter.format_morpheme_container_for_simple_parseset(target),
-                    [t[0].get_surface() if t else "<Unparsable>" for t in context]))
-            else:
-                logger.debug(u"  Calculating oneway likelihood of {0}, {1}".format(formatter.format_morpheme_container_for_simple_parseset(target),
-                    [t[0].get_surface() if t else "<Unparsable>" for t in context]))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_started', target=target, context=context, target_comes_after=target_comes_after)
 
         context_len = len(context)
 
@@ -66,6 +62,8 @@ class InterpolatingLikelihoodCalculator(BaseContextParsingLikelihoodCalculator):
 
         if calculation_context is not None:
             calculation_context['sum_likelihood'] = total_likelihood
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_calculated', target=target, interpolation_weights=interpolation_weights, likelihood=total_likelihood)
 
         return total_likelihood
 
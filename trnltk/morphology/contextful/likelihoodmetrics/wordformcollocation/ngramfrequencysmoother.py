@@ -20,6 +20,7 @@ import operator
 import pprint
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.ngramtypefrequencyfinder import NgramTypeFrequencyFinder
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.simplegoodturing import SimpleGoodTuringSmoother
+from trnltk.morphology.model.tracing import get_tracer
 
 logger = logging.getLogger('ngramfrequencysmoother')
 
@@ -338,15 +339,18 @@ class SimpleGoodTuringNGramFrequencySmoother(NGramFrequencySmoother):
         return vocabulary_sizes_for_types
 
     def smooth(self, count, ngram_type):
-        logger.debug("Smoothing c value for c={}, ngram_type={}".format(count, str(ngram_type)))
-
         if len(ngram_type) == 1:
             # We cannot determine the vocabulary size and thus N_0. So, smoothing cannot be applied for unigrams.
-            logger.debug("Smoothing cannot be applied for unigrams, returning the count")
-            return count
+            smoothed_count = count
+        else:
+            type_key = '_'.join(ngram_type)       # something like "surface_surface_stem"
+            smoothed_count = self._smoothers_for_ngram_types[type_key].smooth(count)
+
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'count_smoothed', count=count, ngram_type=ngram_type, smoothed_count=smoothed_count)
 
-        type_key = '_'.join(ngram_type)       # something like "surface_surface_stem"
-        return self._smoothers_for_ngram_types[type_key].smooth(count)
+        return smoothed_count
 
     def _get_ngram_type_and_key(self, context_is_leading, context_type, target_type):
         context_ngram_type = (self._ngram_length - 1) * [context_type]
@@ -19,7 +19,7 @@ from trnltk.morphology.contextful.likelihoodmetrics.hidden.querykeyappender impo
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.database import DatabaseIndexBuilder
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.query import WordNGramQueryContainer, QueryExecutionContextBuilder, QueryExecutor, CachingQueryExecutionContext, CachingQueryExecutor
 from trnltk.morphology.contextful.likelihoodmetrics.hidden import query
-from trnltk.morphology.model import formatter
+from trnltk.morphology.model.tracing import get_tracer
 
 numpy.seterr(divide='ignore', invalid='ignore')
 
@@ -53,9 +53,9 @@ class NonContextParsingLikelihoodCalculator(object):
         index_builder.create_indexes(self.APPENDER_MATRIX)
 
     def calculate_likelihood(self, target, leading_context, following_context, calculation_context=None):
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug("Calculating likelihood of {1}, {0}, {2}".format(formatter.format_morpheme_container_for_simple_parseset(target), leading_context,
-                following_context))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'twoway_likelihood_started', target=target, leading_context=leading_context, following_context=following_context)
 
         calculation_context_leading = {} if calculation_context is not None else None
         calculation_context_following = {} if calculation_context is not None else None
@@ -69,7 +69,8 @@ class NonContextParsingLikelihoodCalculator(object):
             calculation_context['weight_leading_context'] = self.WEIGHT_LEADING_CONTEXT
             calculation_context['weight_following_context'] = self.WEIGHT_FOLLOWING_CONTEXT
 
-        logger.debug(" Calculated likelihood is {}".format(likelihood))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'twoway_likelihood_calculated', target=target, likelihood=likelihood)
 
         return likelihood
 
@@ -84,11 +85,9 @@ class NonContextParsingLikelihoodCalculator(object):
         assert target
         assert context
 
-        if logger.isEnabledFor(logging.DEBUG):
-            if target_comes_after:
-                logger.debug("  Calculating oneway likelihood of {1}, {0}".format(formatter.format_morpheme_container_for_simple_parseset(target), context))
-            else:
-                logger.debug("  Calculating oneway likelihood of {0}, {1}".format(formatter.format_morpheme_container_for_simple_parseset(target), context))
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_started', target=target, context=context, target_comes_after=target_comes_after)
 
         count_given_context = self._count_target_form_given_context(target, context, False, None, _context_word_appender)
 
@@ -108,8 +107,6 @@ class NonContextParsingLikelihoodCalculator(object):
             target_form_given_count = self._count_target_form_given_context(target, context, target_comes_after, target_appender, context_appender)
             target_form_given_context_counts[i] = target_form_given_count
 
-        logger.debug("    Target form counts given context forms: \n{}".format(target_form_given_context_counts))
-        logger.debug("    Found {} context occurrences".format(count_given_context))
 
         target_form_probabilities = target_form_given_context_counts / count_given_context
         target_form_probabilities[numpy.isinf(target_form_probabilities)] = 0.0
@@ -117,29 +114,29 @@ class NonContextParsingLikelihoodCalculator(object):
 
         if calculation_context is not None:
             calculation_context['target_form_probabilities'] = target_form_probabilities
-        logger.debug("    Target form probabilities: \n{}".format(target_form_probabilities))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'target_form_probabilities_calculated', target=target, context_count=count_given_context,
+                target_form_counts=target_form_given_context_counts, target_form_probabilities=target_form_probabilities)
 
         target_form_probabilities = target_form_probabilities * self.COEFFICIENTS_TARGET_GIVEN_CONTEXT_FORM
         if calculation_context is not None:
             calculation_context['coefficients_target_given_context_form'] = self.COEFFICIENTS_TARGET_GIVEN_CONTEXT_FORM
             calculation_context['target_form_probabilities_with_context_form_weights'] = target_form_probabilities
-        logger.debug("    Target form probabilities with context form weights: \n{}".format(target_form_probabilities))
 
         target_form_probabilities = numpy.dot(target_form_probabilities, numpy.ones((3, 1), dtype=float))
         if calculation_context is not None:
             calculation_context['summed_target_form_probabilities'] = target_form_probabilities
-        logger.debug("    Summed target form probabilities: \n{}".format(target_form_probabilities))
 
         weight_summed_target_probability = numpy.dot(self.COEFFICIENTS_TARGET_FORM_GIVEN_CONTEXT, target_form_probabilities)
         assert numpy.shape(weight_summed_target_probability) == (1, 1)
         if calculation_context is not None:
             calculation_context['coefficients_target_form_given_context'] = self.COEFFICIENTS_TARGET_FORM_GIVEN_CONTEXT
             calculation_context['weight_summed_target_probability'] = weight_summed_target_probability
-        logger.debug("    Weight-summed target probability: \n{}".format(weight_summed_target_probability))
 
         likelihood = weight_summed_target_probability[0][0]
 
-        logger.debug("  Calculated oneway likelihood is {}".format(likelihood))
+        if tracer.enabled:
+            tracer.trace(logger.name, 'oneway_likelihood_calculated', target=target, summed_target_form_probabilities=target_form_probabilities, likelihood=likelihood)
 
         return likelihood
 
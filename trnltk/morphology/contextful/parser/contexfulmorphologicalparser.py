@@ -13,6 +13,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import time
 from trnltk.morphology.contextful.likelihoodmetrics.contextlessdistribution.contextlessdistributioncalculator import ContextlessDistributionCalculator
 from trnltk.morphology.contextful.likelihoodmetrics.contextlessdistribution.contextlessdistributionsmoother import CachedContextlessDistributionSmoother
 from trnltk.morphology.contextful.likelihoodmetrics.hidden.database import DatabaseIndexBuilder
@@ -22,24 +23,20 @@ from trnltk.morphology.contextful.likelihoodmetrics.wordformcollocation.interpol
 from trnltk.morphology.contextful.likelihoodmetrics.wordformcollocation.ngramfrequencysmoother import CachedSimpleGoodTuringNGramFrequencySmoother
 from trnltk.morphology.contextful.parser.contextfullikelihoodcalculator import ContextfulLikelihoodCalculator
 from trnltk.morphology.contextful.parser.sequencelikelihoodcalculator import SequenceLikelihoodCalculator
-from trnltk.morphology.contextless.parser.parser import UpperCaseSupportingContextlessMorphologicalParser
-from trnltk.morphology.contextless.parser.rootfinder import WordRootFinder, DigitNumeralRootFinder, TextNumeralRootFinder, ProperNounFromApostropheRootFinder, ProperNounWithoutApostropheRootFinder
-from trnltk.morphology.lexicon.lexiconloader import LexiconLoader
-from trnltk.morphology.lexicon.rootgenerator import RootGenerator, RootMapGenerator
-from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
-from trnltk.morphology.morphotactics.copulasuffixgraph import CopulaSuffixGraph
-from trnltk.morphology.morphotactics.numeralsuffixgraph import NumeralSuffixGraph
-from trnltk.morphology.morphotactics.predefinedpaths import PredefinedPaths
-from trnltk.morphology.morphotactics.propernounsuffixgraph import ProperNounSuffixGraph
+from trnltk.morphology.contextless.parser.parserfactory import ContextlessMorphologicalParserFactory
+from trnltk.morphology.contextless.parser.parsermetrics import ParserMetrics
 
 class ContextfulMorphologicalParser(object):
-    def __init__(self, contextless_parser, contextful_likelihood_calculator):
+    def __init__(self, contextless_parser, contextful_likelihood_calculator, metrics=None):
         """
         @type contextless_parser: ContextlessMorphologicalParser
         @type contextful_likelihood_calculator: ContextfulLikelihoodCalculator
+        @param metrics: Metrics to record the scoring times into. None for not recording
+        @type metrics: ParserMetrics or None
         """
         self._contextless_parser = contextless_parser
         self._contextful_likelihood_calculator = contextful_likelihood_calculator
+        self.metrics = metrics
 
     def build_indexes(self):
         self._contextful_likelihood_calculator.build_indexes()
@@ -56,6 +53,9 @@ class ContextfulMorphologicalParser(object):
         if not target_parse_results:
             return None
         else:
+            if self.metrics is not None:
+                start = time.time()
+
             likelihoods = []
             for index, target_parse_result in enumerate(target_parse_results):
                 item_calculation_context = {} if calculation_context is not None else None
@@ -68,41 +68,24 @@ class ContextfulMorphologicalParser(object):
                 if item_calculation_context:
                     calculation_context[index] = item_calculation_context
 
+            if self.metrics is not None:
+                self.metrics.record_time(ParserMetrics.SCORING, time.time() - start)
+
             return likelihoods
 
 
 class ContextfulMorphologicalParserFactory(object):
     @classmethod
-    def create(cls, master_dictionary_path, ngram_collection_map):
+    def create(cls, master_dictionary_path, ngram_collection_map, metrics=None):
         """
         @type master_dictionary_path: str or unicode
         @param ngram_collection_map: list<Collection>
+        @param metrics: Metrics to collect the counters and timings of both contextless and contextful stages into.
+            None for not collecting
+        @type metrics: ParserMetrics or None
         @rtype ContextfulMorphologicalParser
         """
-        all_roots = []
-
-        lexemes = LexiconLoader.load_from_file(master_dictionary_path)
-        for di in lexemes:
-            all_roots.extend(RootGenerator.generate(di))
-
-        root_map_generator = RootMapGenerator()
-        root_map = root_map_generator.generate(all_roots)
-
-        suffix_graph = CopulaSuffixGraph(NumeralSuffixGraph(ProperNounSuffixGraph(BasicSuffixGraph())))
-        suffix_graph.initialize()
-
-        predefined_paths = PredefinedPaths(root_map, suffix_graph)
-        predefined_paths.create_predefined_paths()
-
-        word_root_finder = WordRootFinder(root_map)
-        digit_numeral_root_finder = DigitNumeralRootFinder()
-        text_numeral_root_finder = TextNumeralRootFinder(root_map)
-        proper_noun_from_apostrophe_root_finder = ProperNounFromApostropheRootFinder()
-        proper_noun_without_apostrophe_root_finder = ProperNounWithoutApostropheRootFinder()
-
-        contextless_parser = UpperCaseSupportingContextlessMorphologicalParser(suffix_graph, predefined_paths,
-            [word_root_finder, digit_numeral_root_finder, text_numeral_root_finder,
-             proper_noun_from_apostrophe_root_finder, proper_noun_without_apostrophe_root_finder])
+        contextless_parser = ContextlessMorphologicalParserFactory.create(master_dictionary_path, metrics=metrics)
 
         database_index_builder = DatabaseIndexBuilder(ngram_collection_map)
         target_form_given_context_counter = InMemoryCachingTargetFormGivenContextCounter(ngram_collection_map)
@@ -125,6 +108,6 @@ class ContextfulMorphologicalParserFactory(object):
         sequence_likelihood_calculator._contextful_likelihood_calculator = contextful_likelihood_calculator
 
         contextful_morphological_parser = ContextfulMorphologicalParser(contextless_parser,
-            contextful_likelihood_calculator)
+            contextful_likelihood_calculator, metrics)
 
         return contextful_morphological_parser
@@ -222,8 +222,6 @@ class BruteForceVerbRootFinder(RootFinder):
 
             generated_root.lexeme.attributes = {causative_attr} if causative_attr else set()
 
-            generated_root.lexeme.phonetic_attributes = Phonetics.calculate_phonetic_attributes(partial_input, generated_root.lexeme.attributes)
-
             causative_roots.add(generated_root)
 
         return causative_roots
@@ -255,8 +253,6 @@ class BruteForceVerbRootFinder(RootFinder):
 
             generated_root.lexeme.attributes = {passive_attr} if passive_attr else set()
 
-            generated_root.lexeme.phonetic_attributes = Phonetics.calculate_phonetic_attributes(partial_input, generated_root.lexeme.attributes)
-
             passive_roots.add(generated_root)
 
         return passive_roots
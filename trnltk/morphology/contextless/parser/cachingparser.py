@@ -0,0 +1,212 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import OrderedDict
+import logging
+import sys
+from trnltk.morphology.contextless.parser.parsebudget import ParseResults
+
+logger = logging.getLogger('cachingparser')
+
+class LRUCache(object):
+    """
+    Least recently used cache, bounded by entry count and by an estimated size of the entries.
+    """
+
+    def __init__(self, max_entries=None, max_size_in_bytes=None):
+        """
+        @param max_entries: Max number of entries to keep. None for no limit
+        @type max_entries: int or None
+        @param max_size_in_bytes: Max sum of estimated sizes of entries. None for no limit
+        @type max_size_in_bytes: int or None
+        """
+        self._max_entries = max_entries
+        self._max_size_in_bytes = max_size_in_bytes
+
+        self._entries = OrderedDict()       # key -> (value, size), least recently used first
+        self._size_in_bytes = 0
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+    def get(self, key):
+        """
+        Returns the value for the key and marks it as the most recently used one.
+        @return: Value, or None if key is not in the cache
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.miss_count += 1
+            return None
+
+        self._entries[key] = entry
+        self.hit_count += 1
+        return entry[0]
+
+    def put(self, key, value, size_in_bytes=0):
+        """
+        Puts a value into the cache and evicts the least recently used entries if the cache exceeds its bounds.
+        A value which is alone bigger than the max size is not put at all.
+        @type size_in_bytes: int
+        """
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self._size_in_bytes -= old_entry[1]
+
+        if self._max_size_in_bytes is not None and size_in_bytes > self._max_size_in_bytes:
+            return
+
+        self._entries[key] = (value, size_in_bytes)
+        self._size_in_bytes += size_in_bytes
+
+        while self._exceeds_bounds():
+            evicted_key, (evicted_value, evicted_size) = self._entries.popitem(last=False)
+            self._size_in_bytes -= evicted_size
+            self.eviction_count += 1
+            logger.debug('Evicted "%s" from cache', evicted_key)
+
+    def _exceeds_bounds(self):
+        if self._max_entries is not None and len(self._entries) > self._max_entries:
+            return True
+        if self._max_size_in_bytes is not None and self._size_in_bytes > self._max_size_in_bytes:
+            return True
+        return False
+
+    def clear(self):
+        self._entries.clear()
+        self._size_in_bytes = 0
+
+    def get_statistics(self):
+        """
+        @rtype: dict
+        """
+        return {
+            'entries': len(self._entries),
+            'size_in_bytes': self._size_in_bytes,
+            'hits': self.hit_count,
+            'misses': self.miss_count,
+            'evictions': self.eviction_count
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class CachingContextlessMorphologicalParser(object):
+    """
+    Wraps a contextless parser and caches the parse results by surface.
+
+    Cached morpheme containers are never returned to the callers; every call returns clones of them.
+    Thus callers are free to modify the results.
+    """
+
+    def __init__(self, parser, max_entries=None, max_size_in_bytes=None):
+        """
+        @type parser: ContextlessMorphologicalParser
+        @type max_entries: int or None
+        @type max_size_in_bytes: int or None
+        """
+        self._parser = parser
+        self._cache = LRUCache(max_entries, max_size_in_bytes)
+
+    def parse(self, input):
+        """
+        @type input: unicode
+        @rtype: ParseResults
+        """
+        results = self._cache.get(input)
+        if results is None:
+            results = self._parser.parse(input)
+            if getattr(results, 'truncated', False):
+                # parse is stopped because of the budget of the parser, so results might be incomplete
+                return ParseResults([result.clone() for result in results], truncated=True)
+            self._cache.put(input, results, _estimate_size_in_bytes(input, results))
+
+        return ParseResults([result.clone() for result in results])
+
+    def iter_parse(self, input, max_results=None):
+        """
+        Serves the results from the cache if the input is cached. Otherwise parses lazily with the wrapped parser,
+        without caching the results since they might be incomplete.
+        @type input: unicode
+        @type max_results: int or None
+        @rtype: generator of MorphemeContainer
+        """
+        results = self._cache.get(input)
+        if results is None:
+            for result in self._parser.iter_parse(input, max_results):
+                yield result
+        else:
+            for result in results[:max_results]:
+                yield result.clone()
+
+    def is_parsable(self, input):
+        """
+        @type input: unicode
+        @rtype: bool
+        """
+        results = self._cache.get(input)
+        if results is None:
+            return self._parser.is_parsable(input)
+        else:
+            return len(results) > 0
+
+    def parse_many(self, inputs):
+        """
+        Parses a stream of tokens lazily. Repeated tokens are already served from the cache.
+        @type inputs: iterable of unicode
+        @rtype: generator of list of MorphemeContainer
+        """
+        for input in inputs:
+            yield self.parse(input)
+
+    def get_statistics(self):
+        """
+        @return: Hit, miss and eviction counts and the current entry count and estimated size of the cache
+        @rtype: dict
+        """
+        return self._cache.get_statistics()
+
+    def clear_cache(self):
+        self._cache.clear()
+
+
+def _estimate_size_in_bytes(surface, morpheme_containers):
+    """
+    Estimates the memory used by the parse results of a surface.
+    Roots, states and suffixes are shared with the lexicon and the suffix graph, thus they are not counted.
+    """
+    size = sys.getsizeof(surface) + sys.getsizeof(morpheme_containers)
+    for morpheme_container in morpheme_containers:
+        size += _object_size(morpheme_container)
+        transitions = morpheme_container.get_transitions()
+        size += sys.getsizeof(transitions)
+        for transition in transitions:
+            suffix_form_application = transition.suffix_form_application
+            size += _object_size(transition) + _object_size(suffix_form_application)
+            size += sys.getsizeof(suffix_form_application.actual_suffix_form)
+            size += sys.getsizeof(suffix_form_application.fitting_suffix_form)
+
+    return size
+
+def _object_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
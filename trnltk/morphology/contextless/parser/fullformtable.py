@@ -0,0 +1,444 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import Counter
+import codecs
+import hashlib
+import logging
+import mmap
+import struct
+from trnltk.morphology.contextless.parser.parsebudget import ParseResults
+from trnltk.morphology.model.lexeme import Lexeme, LexemeAttributeFlags
+from trnltk.morphology.model.morpheme import SuffixForm, SuffixFormApplication
+from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.root import Root, NumeralRoot, AbbreviationRoot, ProperNounRoot
+from trnltk.morphology.phonetics.phonetics import PhoneticAttributeFlags
+
+logger = logging.getLogger('fullformtable')
+
+# file layout:
+#   header : magic, version, entry count, index offset, pool offset, pool length, start count, fingerprint of the
+#            suffix graph
+#   data   : for each entry, utf-8 surface and its analyses. An analysis is a start and the transitions, as ints
+#            (start index, transition count, transition indexes...) pointing into the pool
+#   pool   : distinct starts (root and root state) and distinct transitions, encoded as utf-8 text lines
+#   index  : for each entry, (data offset, surface length, analyses length), sorted by the utf-8 surface
+MAGIC = 'TRNLTKFF'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIIIIII20s')
+_INDEX_ENTRY = struct.Struct('<III')
+_INT_SIZE = struct.calcsize('<I')
+
+_FIELD_SEPARATOR = u'\t'
+_LINE_SEPARATOR = u'\n'
+
+# suffix forms created for the predefined paths are not in the graph, their forms are written instead of indexes
+_FORM_PREFIX = u'*'
+
+_LEXICON_ROOT = u'L'
+_ROOT_KINDS = {NumeralRoot: u'N', AbbreviationRoot: u'A', ProperNounRoot: u'P'}
+_ROOT_CLASSES = dict([(kind, root_class) for root_class, kind in _ROOT_KINDS.iteritems()])
+
+class FullFormTable(object):
+    """
+    Read-only table of surfaces and their parse results, built offline with C{FullFormTableBuilder}.
+
+    The file is memory mapped and the surfaces are found with a binary search on its sorted index, thus a lookup
+    doesn't depend on the size of the table. Only the pool of roots and transitions, which are shared by the
+    analyses, is read when the table is opened. Pool items are decoded once, when they are used first, with the
+    states and suffixes of the suffix graph; then each lookup creates new morpheme containers from them.
+    """
+
+    def __init__(self, file_path, suffix_graph):
+        """
+        @type file_path: str
+        @param suffix_graph: Suffix graph of the parser which the table is built with
+        @type suffix_graph: EmptySuffixGraph
+        """
+        self._suffix_graph = suffix_graph
+
+        with open(file_path, 'rb') as table_file:
+            self._mmap = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._entry_count, self._index_offset, pool_offset, pool_length, start_count, fingerprint =\
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic!=MAGIC or version!=VERSION:
+            self._mmap.close()
+            raise Exception('{} is not a full form table of version {}'.format(file_path, VERSION))
+        if fingerprint!=get_suffix_graph_fingerprint(suffix_graph):
+            self._mmap.close()
+            raise Exception('Full form table {} is built with a different suffix graph'.format(file_path))
+
+        pool = self._mmap[pool_offset:pool_offset + pool_length].decode('utf-8').split(_LINE_SEPARATOR) if pool_length else []
+        self._encoded_starts = pool[:start_count]
+        self._encoded_transitions = pool[start_count:]
+        self._starts = [None] * len(self._encoded_starts)                 # (root, root state), decoded when used
+        self._transitions = [None] * len(self._encoded_transitions)       # (suffix form application, to state)
+        self._suffix_forms = {}                                             # (suffix name, encoded suffix form) -> suffix form
+
+    def get(self, surface):
+        """
+        @type surface: unicode
+        @return: Parse results of the surface, None if the surface is not in the table
+        @rtype: list of MorphemeContainer or None
+        """
+        encoded_analyses = self._find(surface.encode('utf-8'))
+        if encoded_analyses is None:
+            return None
+
+        ints = struct.unpack('<{}I'.format(len(encoded_analyses) // _INT_SIZE), encoded_analyses)
+        results = []
+        i = 0
+        while i < len(ints):
+            start_index, transition_count = ints[i], ints[i + 1]
+            results.append(self._create_morpheme_container(start_index, ints[i + 2:i + 2 + transition_count]))
+            i += 2 + transition_count
+
+        return results
+
+    def _find(self, key):
+        data = self._mmap
+        low = 0
+        high = self._entry_count
+        while low < high:
+            middle = (low + high) // 2
+            offset, key_length, value_length = _INDEX_ENTRY.unpack_from(data, self._index_offset + middle * _INDEX_ENTRY.size)
+            middle_key = data[offset:offset + key_length]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return data[offset + key_length:offset + key_length + value_length]
+
+        return None
+
+    def _create_morpheme_container(self, start_index, transition_indexes):
+        start = self._starts[start_index]
+        if start is None:
+            start = self._decode_start(self._encoded_starts[start_index])
+            self._starts[start_index] = start
+
+        root, root_state = start
+        morpheme_container = MorphemeContainer(root, root_state, u'')
+        for transition_index in transition_indexes:
+            transition = self._transitions[transition_index]
+            if transition is None:
+                transition = self._decode_transition(self._encoded_transitions[transition_index])
+                self._transitions[transition_index] = transition
+
+            morpheme_container.add_transition(*transition)
+
+        return morpheme_container
+
+    def _decode_start(self, encoded_start):
+        fields = encoded_start.split(_FIELD_SEPARATOR)
+        return _decode_root(fields[:-1]), self._suffix_graph.get_state(fields[-1])
+
+    def _decode_transition(self, encoded_transition):
+        suffix_name, encoded_suffix_form, actual_suffix_form, fitting_suffix_form, to_state_name = encoded_transition.split(_FIELD_SEPARATOR)
+
+        suffix_form = self._suffix_forms.get((suffix_name, encoded_suffix_form))
+        if suffix_form is None:
+            suffix = self._suffix_graph.get_suffix(suffix_name)
+            if encoded_suffix_form.startswith(_FORM_PREFIX):
+                suffix_form = SuffixForm(encoded_suffix_form[len(_FORM_PREFIX):])
+                suffix_form.suffix = suffix
+            else:
+                suffix_form = suffix.suffix_forms[int(encoded_suffix_form)]
+            self._suffix_forms[(suffix_name, encoded_suffix_form)] = suffix_form
+
+        return SuffixFormApplication(suffix_form, actual_suffix_form, fitting_suffix_form), self._suffix_graph.get_state(to_state_name)
+
+    def __contains__(self, surface):
+        return self._find(surface.encode('utf-8')) is not None
+
+    def __len__(self):
+        return self._entry_count
+
+    def close(self):
+        self._mmap.close()
+
+
+class FullFormTableBuilder(object):
+    """
+    Parses the surfaces with a contextless parser and writes them with their parse results into a full form table.
+    Surfaces whose parses are truncated by the budget of the parser are skipped.
+    """
+
+    def __init__(self, parser, suffix_graph):
+        """
+        @param parser: Parser to find the results with
+        @type parser: ContextlessMorphologicalParser
+        @param suffix_graph: Suffix graph of the parser
+        @type suffix_graph: EmptySuffixGraph
+        """
+        self._parser = parser
+        self._suffix_graph = suffix_graph
+
+    def build(self, surfaces, file_path):
+        """
+        @type surfaces: iterable of unicode
+        @type file_path: str
+        @return: Number of surfaces written
+        @rtype: int
+        """
+        start_indexes = {}              # encoded start -> index in the pool
+        transition_indexes = {}         # encoded transition -> index among the transitions of the pool
+
+        entries = {}
+        for surface in surfaces:
+            key = surface.encode('utf-8')
+            if key in entries:
+                continue
+
+            results = self._parser.parse(surface)
+            if getattr(results, 'truncated', False):
+                logger.info(u'Parse of %s is truncated, not writing it', surface)
+                continue
+
+            ints = []
+            for result in results:
+                ints.append(_get_index(start_indexes, _encode_start(result)))
+                transitions = result.get_transitions()
+                ints.append(len(transitions))
+                ints.extend([_get_index(transition_indexes, _encode_transition(transition)) for transition in transitions])
+
+            entries[key] = struct.pack('<{}I'.format(len(ints)), *ints)
+
+        with open(file_path, 'wb') as table_file:
+            table_file.write('\0' * _HEADER.size)
+
+            index = []
+            offset = _HEADER.size
+            for key in sorted(entries.iterkeys()):
+                value = entries[key]
+                table_file.write(key)
+                table_file.write(value)
+                index.append(_INDEX_ENTRY.pack(offset, len(key), len(value)))
+                offset += len(key) + len(value)
+
+            pool_offset = offset
+            pool = _LINE_SEPARATOR.join(_sorted_by_index(start_indexes) + _sorted_by_index(transition_indexes)).encode('utf-8')
+            table_file.write(pool)
+
+            index_offset = pool_offset + len(pool)
+            table_file.write(''.join(index))
+
+            table_file.seek(0)
+            table_file.write(_HEADER.pack(MAGIC, VERSION, len(index), index_offset, pool_offset, len(pool), len(start_indexes),
+                get_suffix_graph_fingerprint(self._suffix_graph)))
+
+        return len(entries)
+
+
+class TableBackedParser(object):
+    """
+    Answers from a full form table and falls back to parsing for the surfaces which are not in the table.
+
+    Frequent surfaces, which cover most of the tokens of a text, are served without traversing the suffix graph.
+    """
+
+    def __init__(self, table, parser):
+        """
+        @type table: FullFormTable
+        @param parser: Parser for the surfaces which are not in the table
+        @type parser: ContextlessMorphologicalParser
+        """
+        self._table = table
+        self._parser = parser
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def parse(self, input):
+        """
+        @type input: unicode
+        @rtype: ParseResults
+        """
+        results = self._table.get(input)
+        if results is None:
+            self.miss_count += 1
+            return self._parser.parse(input)
+
+        self.hit_count += 1
+        return ParseResults(results)
+
+    def iter_parse(self, input, max_results=None):
+        """
+        @type input: unicode
+        @type max_results: int or None
+        @rtype: generator of MorphemeContainer
+        """
+        results = self._table.get(input)
+        if results is None:
+            self.miss_count += 1
+            for result in self._parser.iter_parse(input, max_results):
+                yield result
+        else:
+            self.hit_count += 1
+            for result in results[:max_results]:
+                yield result
+
+    def is_parsable(self, input):
+        """
+        @type input: unicode
+        @rtype: bool
+        """
+        results = self._table.get(input)
+        if results is None:
+            self.miss_count += 1
+            return self._parser.is_parsable(input)
+
+        self.hit_count += 1
+        return len(results) > 0
+
+    def parse_many(self, inputs):
+        """
+        @type inputs: iterable of unicode
+        @rtype: generator of list of MorphemeContainer
+        """
+        for input in inputs:
+            yield self.parse(input)
+
+    def get_statistics(self):
+        """
+        @return: Number of inputs answered from the table and parsed
+        @rtype: dict
+        """
+        return {
+            'entries': len(self._table),
+            'hits': self.hit_count,
+            'misses': self.miss_count
+        }
+
+
+def get_suffix_graph_fingerprint(suffix_graph):
+    """
+    @return: Digest of the states, suffixes and suffix forms of the graph, which the tables refer to by name and
+        index
+    @rtype: str
+    """
+    digest = hashlib.sha1()
+    for state in sorted(suffix_graph.get_all_states(), key=lambda state: state.name):
+        digest.update(state.name.encode('utf-8'))
+        digest.update('\0')
+    for suffix in sorted(suffix_graph.get_all_suffixes(), key=lambda suffix: suffix.name):
+        digest.update(suffix.name.encode('utf-8'))
+        for suffix_form in suffix.suffix_forms:
+            digest.update('\1')
+            digest.update(suffix_form.form.encode('utf-8'))
+        digest.update('\0')
+    return digest.digest()
+
+def find_frequent_surfaces(file_paths, max_surfaces=None):
+    """
+    Counts the surfaces in frequency lists and parse sets.
+    @param file_paths: Parse set xml files, or frequency lists with a surface and optionally its count on each line
+    @type file_paths: list of str
+    @param max_surfaces: Max number of surfaces to return. None for all
+    @type max_surfaces: int or None
+    @return: Most frequent surfaces first
+    @rtype: list of unicode
+    """
+    counts = Counter()
+    for file_path in file_paths:
+        if file_path.endswith('.xml'):
+            from xml.dom.minidom import parse
+            from trnltk.parseset.xmlbindings import ParseSetBinding
+
+            parse_set = ParseSetBinding.build(parse(file_path).getElementsByTagName("parseset")[0])
+            for sentence in parse_set.sentences:
+                for word in sentence.words:
+                    counts[word.str] += 1
+        else:
+            with codecs.open(file_path, mode='r', encoding='utf-8') as frequency_file:
+                for line in frequency_file:
+                    fields = line.split()
+                    if fields:
+                        counts[fields[0]] += int(fields[1]) if len(fields) > 1 else 1
+
+    return [surface for surface, count in counts.most_common(max_surfaces)]
+
+def _get_index(indexes, encoded):
+    index = indexes.get(encoded)
+    if index is None:
+        index = len(indexes)
+        indexes[encoded] = index
+    return index
+
+def _sorted_by_index(indexes):
+    return [encoded for encoded, index in sorted(indexes.iteritems(), key=lambda item: item[1])]
+
+def _encode_start(morpheme_container):
+    return _FIELD_SEPARATOR.join(_encode_root(morpheme_container.get_root()) + [morpheme_container.get_root_state().name])
+
+def _encode_transition(transition):
+    suffix_form_application = transition.suffix_form_application
+    suffix_form = suffix_form_application.suffix_form
+    return _FIELD_SEPARATOR.join([suffix_form.suffix.name, _encode_suffix_form(suffix_form), suffix_form_application.actual_suffix_form,
+                                  suffix_form_application.fitting_suffix_form, transition.to_state.name])
+
+def _encode_suffix_form(suffix_form):
+    for i, graph_suffix_form in enumerate(suffix_form.suffix.suffix_forms):
+        if graph_suffix_form is suffix_form:
+            return unicode(i)
+
+    return _FORM_PREFIX + suffix_form.form
+
+def _encode_root(root):
+    root_kind = _ROOT_KINDS.get(type(root))
+    if root_kind:
+        # dynamic roots are created from their strings, like the root finders do
+        return [root_kind, root.str]
+
+    lexeme = root.lexeme
+    return [_LEXICON_ROOT, root.str, lexeme.lemma, lexeme.root, lexeme.syntactic_category,
+            lexeme.secondary_syntactic_category or u'', unicode(LexemeAttributeFlags.to_flags(lexeme.attributes)),
+            u','.join(sorted(root.phonetic_expectations or [])), unicode(root.phonetic_attribute_flags)]
+
+def _decode_root(fields):
+    if fields[0]!=_LEXICON_ROOT:
+        return _ROOT_CLASSES[fields[0]](fields[1])
+
+    root_kind, root_str, lemma, lexeme_root, syntactic_category, secondary_syntactic_category, lexeme_attribute_flags,\
+        phonetic_expectations, phonetic_attribute_flags = fields
+
+    lexeme = Lexeme(lemma, lexeme_root, syntactic_category, secondary_syntactic_category or None,
+        set(LexemeAttributeFlags.to_attributes(int(lexeme_attribute_flags))))
+    return Root(root_str, lexeme, set(phonetic_expectations.split(u',')) if phonetic_expectations else None,
+        PhoneticAttributeFlags.to_attributes(int(phonetic_attribute_flags)))
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    from trnltk.morphology.contextless.parser.parserfactory import ContextlessMorphologicalParserFactory
+
+    argument_parser = argparse.ArgumentParser(description='Builds a full form table of the most frequent surfaces.')
+    argument_parser.add_argument('output', help='path of the table to write')
+    argument_parser.add_argument('inputs', nargs='+', help='parse set xml files or frequency lists')
+    argument_parser.add_argument('--max-surfaces', type=int, default=50000, help='number of most frequent surfaces to write')
+    argument_parser.add_argument('--dictionary', default=os.path.join(os.path.dirname(__file__), '../../../resources/master_dictionary.txt'),
+        help='path of the master dictionary')
+    arguments = argument_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = ContextlessMorphologicalParserFactory.create(arguments.dictionary)
+    surfaces = find_frequent_surfaces(arguments.inputs, arguments.max_surfaces)
+    count = FullFormTableBuilder(parser, parser._suffix_graph).build(surfaces, arguments.output)
+    logger.info('Wrote %d surfaces to %s', count, arguments.output)
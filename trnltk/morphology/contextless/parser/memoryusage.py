@@ -0,0 +1,121 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import sys
+import types
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.morpheme import Suffix, SuffixForm
+from trnltk.morphology.model.root import Root, DynamicRoot
+
+logger = logging.getLogger('memoryusage')
+
+_NOT_FOLLOWED_TYPES = (type, types.ClassType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.ModuleType)
+
+def estimate_size_in_bytes(objects, is_shared=None):
+    """
+    Estimates the memory used by the objects and everything they reference, each object is counted once.
+    @type objects: list
+    @param is_shared: Function which returns True for the objects that are owned by something else, like the lexicon
+        or the suffix graph. Neither they nor the objects they reference are counted. None for counting everything
+    @type is_shared: function or None
+    @rtype: int
+    """
+    size = 0
+    seen_ids = set()
+    objects_to_visit = list(objects)
+    while objects_to_visit:
+        obj = objects_to_visit.pop()
+        if id(obj) in seen_ids or isinstance(obj, _NOT_FOLLOWED_TYPES) or (is_shared and is_shared(obj)):
+            continue
+
+        seen_ids.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            objects_to_visit.extend(obj.iterkeys())
+            objects_to_visit.extend(obj.itervalues())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            objects_to_visit.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                objects_to_visit.append(obj.__dict__)
+            for slot in _get_slots(type(obj)):
+                if hasattr(obj, slot):
+                    objects_to_visit.append(getattr(obj, slot))
+
+    return size
+
+def _get_slots(cls):
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        for slot in (slots,) if isinstance(slots, basestring) else slots:
+            if slot not in ('__dict__', '__weakref__'):
+                yield slot
+
+def is_shared_with_lexicon_or_graph(obj):
+    """
+    @return: True for the roots of the lexicon and the states and suffixes of the suffix graph
+    @rtype: bool
+    """
+    return isinstance(obj, (State, Suffix, SuffixForm)) or (isinstance(obj, Root) and not isinstance(obj, DynamicRoot))
+
+def measure_bytes_per_root(roots):
+    """
+    @type roots: list of Root
+    @return: Average memory used by a root, including its lexeme, strings and sets
+    @rtype: float
+    """
+    return float(estimate_size_in_bytes(roots)) / len(roots)
+
+def measure_bytes_per_parse_result(parser, surfaces):
+    """
+    Parse results of a surface share the transitions they have in common, thus the results of all surfaces are
+    measured together. Roots of the lexicon and the suffix graph are not counted.
+    @type surfaces: list of unicode
+    @return: Average memory used by a parse result and the number of the results
+    @rtype: tuple (float, int)
+    """
+    results = []
+    for surface in surfaces:
+        results.extend(parser.parse(surface))
+
+    if not results:
+        return 0.0, 0
+
+    return float(estimate_size_in_bytes(results, is_shared_with_lexicon_or_graph)) / len(results), len(results)
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    from trnltk.morphology.contextless.parser.fullformtable import find_frequent_surfaces
+    from trnltk.morphology.contextless.parser.parserfactory import ContextlessMorphologicalParserFactory
+
+    argument_parser = argparse.ArgumentParser(description='Measures the memory used by the roots and the parse results.')
+    argument_parser.add_argument('inputs', nargs='+', help='parse set xml files or frequency lists')
+    argument_parser.add_argument('--max-surfaces', type=int, default=10000, help='number of most frequent surfaces to parse')
+    argument_parser.add_argument('--dictionary', default=os.path.join(os.path.dirname(__file__), '../../../resources/master_dictionary.txt'),
+        help='path of the master dictionary')
+    arguments = argument_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    roots = ContextlessMorphologicalParserFactory._generate_roots(arguments.dictionary)
+    print 'Roots: {}, bytes per root: {:.1f}'.format(len(roots), measure_bytes_per_root(roots))
+
+    parser = ContextlessMorphologicalParserFactory.create(arguments.dictionary)
+    bytes_per_result, result_count = measure_bytes_per_parse_result(parser, find_frequent_surfaces(arguments.inputs, arguments.max_surfaces))
+    print 'Parse results: {}, bytes per parse result: {:.1f}'.format(result_count, bytes_per_result)
@@ -0,0 +1,133 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from trnltk.morphology.model import formatter
+
+logger = logging.getLogger('parallelparser')
+
+# set in the parent process right before the workers are forked. workers inherit them, thus the lexicon,
+# the suffix graph and the predefined paths are shared copy-on-write instead of being pickled or rebuilt.
+_worker_parser = None
+_worker_result_formatter = None
+
+def _parse_chunk(chunk):
+    chunk_index, sentences = chunk
+
+    start_time = time.time()
+    token_count = 0
+    sentence_results = []
+    for sentence in sentences:
+        word_results = []
+        for word in sentence:
+            word_results.append([_worker_result_formatter(parse_result) for parse_result in _worker_parser.parse(word)])
+        token_count += len(sentence)
+        sentence_results.append(word_results)
+
+    return chunk_index, os.getpid(), token_count, time.time() - start_time, sentence_results
+
+
+class MultiProcessCorpusParser(object):
+    """
+    Parses a corpus with a pool of processes, using an already built contextless parser.
+
+    Parser is built once in the parent process, then the workers are forked. Workers get chunks of sentences
+    and the results come back in the order of the input.
+
+    Morpheme containers refer to the suffix graph, thus sending them between processes is costly.
+    Instead, the results are formatted in the workers and the formatted strings are returned.
+    """
+
+    def __init__(self, parser, process_count=None, chunk_size=50, result_formatter=None):
+        """
+        @param parser: A built parser, e.g. created by C{ContextlessMorphologicalParserFactory}
+        @type parser: ContextlessMorphologicalParser
+        @param process_count: Number of workers. Number of CPUs if None
+        @type process_count: int or None
+        @param chunk_size: Number of sentences sent to a worker at once
+        @type chunk_size: int
+        @param result_formatter: Function to format a morpheme container in the workers.
+            Default is formatting for parsesets
+        @type result_formatter: function
+        """
+        self._parser = parser
+        self._process_count = process_count or multiprocessing.cpu_count()
+        self._chunk_size = chunk_size
+        self._result_formatter = result_formatter or formatter.format_morpheme_container_for_parseset
+
+        self._worker_statistics = {}
+
+    def parse_sentences(self, sentences):
+        """
+        Parses the sentences in the worker processes.
+        @param sentences: Sentences, where each sentence is a list of words. A document can be given as a sentence too
+        @type sentences: iterable of list of unicode
+        @return: Formatted parse results of the words of each sentence, in the order of the input
+        @rtype: generator of list of list
+        """
+        global _worker_parser, _worker_result_formatter
+        _worker_parser = self._parser
+        _worker_result_formatter = self._result_formatter
+
+        pool = multiprocessing.Pool(self._process_count)
+        try:
+            for chunk_index, pid, token_count, seconds, sentence_results in pool.imap(_parse_chunk, self._create_chunks(sentences)):
+                self._record_chunk(pid, token_count, seconds)
+                logger.debug('Chunk %d is parsed by worker %d : %d tokens in %f seconds', chunk_index, pid, token_count, seconds)
+                for sentence_result in sentence_results:
+                    yield sentence_result
+        finally:
+            pool.terminate()
+            pool.join()
+            _worker_parser = None
+            _worker_result_formatter = None
+
+    def _create_chunks(self, sentences):
+        chunk = []
+        chunk_index = 0
+        for sentence in sentences:
+            chunk.append(sentence)
+            if len(chunk) >= self._chunk_size:
+                yield chunk_index, chunk
+                chunk = []
+                chunk_index += 1
+
+        if chunk:
+            yield chunk_index, chunk
+
+    def _record_chunk(self, pid, token_count, seconds):
+        if not self._worker_statistics.has_key(pid):
+            self._worker_statistics[pid] = {'chunks': 0, 'tokens': 0, 'seconds': 0.0}
+
+        worker_statistics = self._worker_statistics[pid]
+        worker_statistics['chunks'] += 1
+        worker_statistics['tokens'] += token_count
+        worker_statistics['seconds'] += seconds
+
+    def get_statistics(self):
+        """
+        @return: Map of worker process id to the number of chunks and tokens parsed, time spent parsing
+            and tokens parsed per second
+        @rtype: dict
+        """
+        statistics = {}
+        for pid, worker_statistics in self._worker_statistics.iteritems():
+            statistics[pid] = dict(worker_statistics)
+            statistics[pid]['tokens_per_second'] = worker_statistics['tokens'] / worker_statistics['seconds'] if worker_statistics['seconds'] else 0.0
+
+        return statistics
@@ -0,0 +1,151 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import time
+
+logger = logging.getLogger('parsebudget')
+
+class ParseBudget(object):
+    """
+    Limits the work done for parsing a single input.
+
+    Some inputs, like long capitalized tokens, have roots for almost every prefix and their traversal takes very
+    long. When the budget of a parse is exceeded, traversal is stopped and the results found so far are returned
+    as truncated.
+
+    The budget also counts the parses and the exceeded limits for all the parses it is used for.
+    """
+
+    CANDIDATES = 'candidates'
+    CLONES = 'clones'
+    TIME = 'time'
+
+    def __init__(self, max_candidates=None, max_clones=None, max_seconds=None):
+        """
+        @param max_candidates: Max number of morpheme containers to traverse. None for no limit
+        @type max_candidates: int or None
+        @param max_clones: Max number of morpheme containers created by applying suffixes. None for no limit
+        @type max_clones: int or None
+        @param max_seconds: Max wall time of a parse. None for no limit
+        @type max_seconds: float or None
+        """
+        self.max_candidates = max_candidates
+        self.max_clones = max_clones
+        self.max_seconds = max_seconds
+
+        self.parse_count = 0
+        self.truncated_parse_count = 0
+        self.exceeded_limit_counts = {self.CANDIDATES: 0, self.CLONES: 0, self.TIME: 0}
+
+    def start(self):
+        """
+        Starts tracking the work of a new parse.
+        @rtype: ParseBudgetUsage
+        """
+        self.parse_count += 1
+        return ParseBudgetUsage(self)
+
+    def _exceeded(self, limit):
+        self.truncated_parse_count += 1
+        self.exceeded_limit_counts[limit] += 1
+
+    def get_statistics(self):
+        """
+        @return: Number of parses, number of truncated parses and how many times each limit is exceeded
+        @rtype: dict
+        """
+        return {
+            'parses': self.parse_count,
+            'truncated_parses': self.truncated_parse_count,
+            'exceeded_candidates': self.exceeded_limit_counts[self.CANDIDATES],
+            'exceeded_clones': self.exceeded_limit_counts[self.CLONES],
+            'exceeded_time': self.exceeded_limit_counts[self.TIME]
+        }
+
+
+class ParseBudgetUsage(object):
+    """
+    Work done for a single parse, created by C{ParseBudget.start}.
+    """
+
+    def __init__(self, budget):
+        """
+        @type budget: ParseBudget
+        """
+        self._budget = budget
+        self._deadline = time.time() + budget.max_seconds if budget.max_seconds is not None else None
+
+        self.candidate_count = 0
+        self.clone_count = 0
+        self.exceeded_limit = None
+
+    @property
+    def truncated(self):
+        return self.exceeded_limit is not None
+
+    def use_candidate(self):
+        """
+        Counts a candidate to traverse, also checks the time limit.
+        @return: False if the budget is exceeded and the parse should stop
+        @rtype: bool
+        """
+        if self.exceeded_limit:
+            return False
+
+        self.candidate_count += 1
+        if self._budget.max_candidates is not None and self.candidate_count > self._budget.max_candidates:
+            return self._exceed(ParseBudget.CANDIDATES)
+
+        if self._deadline is not None and time.time() > self._deadline:
+            return self._exceed(ParseBudget.TIME)
+
+        return True
+
+    def use_clones(self, count):
+        """
+        @param count: Number of new morpheme containers
+        @type count: int
+        @return: False if the budget is exceeded and the parse should stop
+        @rtype: bool
+        """
+        if self.exceeded_limit:
+            return False
+
+        self.clone_count += count
+        if self._budget.max_clones is not None and self.clone_count > self._budget.max_clones:
+            return self._exceed(ParseBudget.CLONES)
+
+        return True
+
+    def _exceed(self, limit):
+        logger.debug('Parse budget is exceeded, limit : %s, candidates : %d, clones : %d', limit, self.candidate_count, self.clone_count)
+        self.exceeded_limit = limit
+        self._budget._exceeded(limit)
+        return False
+
+
+class ParseResults(list):
+    """
+    List of parse results, which also tells if the parse is truncated because of its budget.
+    """
+
+    def __init__(self, results=(), truncated=False):
+        """
+        @type results: iterable of MorphemeContainer
+        @type truncated: bool
+        """
+        super(ParseResults, self).__init__(results)
+        self.truncated = truncated
@@ -0,0 +1,122 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+class ParseForest(object):
+    """
+    Parse results of an input, packed as a graph of shared suffix subtrees instead of a list of morpheme
+    containers.
+
+    A tree is a tuple (morpheme container, subtree), where the morpheme container is a candidate of the input with
+    its root. A subtree is a tuple of branches and a branch is a tuple (transitions, subtree) where the subtree is
+    None if the transitions lead to a result. Candidates which end with the same suffixes share the same subtree
+    objects, thus the memory is not proportional to the number of results times their lengths, and the shared
+    parts can be examined only once, see C{count_results}.
+
+    Morpheme containers of the results are created only when the forest is iterated.
+    """
+
+    def __init__(self, trees, graft, truncated=False):
+        """
+        @param trees: Tuples (morpheme container, subtree)
+        @type trees: list of tuple
+        @param graft: Function (morpheme container, transitions) which returns a clone of the morpheme container
+            with the transitions applied
+        @type graft: function
+        @param truncated: True if the parse is stopped because of its budget
+        @type truncated: bool
+        """
+        self.trees = trees
+        self._graft = graft
+        self.truncated = truncated
+
+    def __iter__(self):
+        """
+        @return: Results, in the same order with the depth first traversal
+        @rtype: generator of MorphemeContainer
+        """
+        for morpheme_container, subtree in self.trees:
+            for result in graft_subtree(morpheme_container, subtree, self._graft):
+                yield result
+
+    def __len__(self):
+        return self.count_results()
+
+    def count_results(self):
+        """
+        Counts the results without creating them. Each shared subtree is counted once.
+        @rtype: int
+        """
+        counts_of_subtrees = {}
+        return sum([_count_results_of_subtree(subtree, counts_of_subtrees) for morpheme_container, subtree in self.trees])
+
+    def count_subtrees(self):
+        """
+        @return: Number of distinct subtrees of the forest
+        @rtype: int
+        """
+        subtree_ids = set()
+        subtrees_to_visit = [subtree for morpheme_container, subtree in self.trees]
+        while subtrees_to_visit:
+            subtree = subtrees_to_visit.pop()
+            if id(subtree) in subtree_ids:
+                continue
+
+            subtree_ids.add(id(subtree))
+            for transitions, child_subtree in subtree:
+                if child_subtree is not None:
+                    subtrees_to_visit.append(child_subtree)
+
+        return len(subtree_ids)
+
+
+def graft_subtree(morpheme_container, subtree, graft):
+    """
+    @type morpheme_container: MorphemeContainer
+    @param subtree: See C{ParseForest} for the subtree structure
+    @type subtree: tuple
+    @param graft: Function (morpheme container, transitions) which returns a clone of the morpheme container with
+        the transitions applied
+    @type graft: function
+    @return: Results created by applying the transitions of the subtree to the morpheme container. Transitions shared
+        by the results are applied only once
+    @rtype: generator of MorphemeContainer
+    """
+    branch_iterators = [(morpheme_container, iter(subtree))]
+    while branch_iterators:
+        morpheme_container, branches = branch_iterators[-1]
+        for transitions, child_subtree in branches:
+            grafted = graft(morpheme_container, transitions)
+            if child_subtree is None:
+                yield grafted
+            else:
+                branch_iterators.append((grafted, iter(child_subtree)))
+                break
+        else:
+            branch_iterators.pop()
+
+def _count_results_of_subtree(subtree, counts_of_subtrees):
+    # subtrees are shallow, as deep as the number of suffixes of a word, thus recursing is fine
+    count = counts_of_subtrees.get(id(subtree))
+    if count is None:
+        count = 0
+        for transitions, child_subtree in subtree:
+            if child_subtree is None:
+                count += 1
+            else:
+                count += _count_results_of_subtree(child_subtree, counts_of_subtrees)
+        counts_of_subtrees[id(subtree)] = count
+
+    return count
@@ -15,142 +15,315 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import logging
-from trnltk.morphology.model import formatter
+import time
 from trnltk.morphology.model.lexeme import  SyntacticCategory, LexemeAttribute
+from trnltk.morphology.contextless.parser.cachingparser import LRUCache
+from trnltk.morphology.contextless.parser.parsebudget import ParseResults
+from trnltk.morphology.contextless.parser.parseforest import ParseForest
+from trnltk.morphology.contextless.parser.parsermetrics import ParserMetrics
+from trnltk.morphology.contextless.parser.subtreecache import SubtreeCache
+from trnltk.morphology.contextless.parser.traversal import TraversalEngine
 from trnltk.morphology.contextless.parser.suffixapplier import *
 from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.tracing import get_tracer
+from trnltk.morphology.morphotactics.suffixgraphanalysis import SuffixGraphAnalysis
 from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
 
 logger = logging.getLogger('parser')
 
 class ContextlessMorphologicalParser(object):
-    def __init__(self, suffix_graph, predefined_paths, root_finders):
+    def __init__(self, suffix_graph, predefined_paths, root_finders, budget=None, traversal_mode=TraversalEngine.BREADTH_FIRST, metrics=None, subtree_cache=None):
+        """
+        @type suffix_graph: EmptySuffixGraph
+        @type predefined_paths: PredefinedPaths or None
+        @type root_finders: list
+        @param budget: Limits for the work done for a single parse. None for no limits
+        @type budget: ParseBudget or None
+        @param traversal_mode: Order to traverse the candidates. Order of the results is the same with the older
+            versions only with breadth first traversal
+        @type traversal_mode: str
+        @param metrics: Metrics to collect the counters and timings of the parses into. None for not collecting
+        @type metrics: ParserMetrics or None
+        @param subtree_cache: Cache to share the traversed suffix subtrees within a word and across words. Traversal
+            is depth first if given. None for not sharing
+        @type subtree_cache: SubtreeCache or None
+        """
         self._suffix_graph = suffix_graph
         self._predefined_paths = predefined_paths
         self._root_finders = root_finders
-
+        self._budget = budget
+        self.metrics = metrics
+        self._subtree_cache = subtree_cache
+        self._forest_subtree_cache = None
+        self._suffix_graph_analysis = SuffixGraphAnalysis(suffix_graph)
+        self._traversal_engine = TraversalEngine(self._traverse_candidate, self._can_be_parse_result, traversal_mode,
+            subtree_cache=subtree_cache)
 
     def parse(self, input):
-        logger.debug('\n\n-------------Parsing word "%s"', input)
+        """
+        @type input: unicode
+        @return: All parse results of the input, or the ones found until the budget is exceeded
+        @rtype: ParseResults
+        """
+        budget_usage = self._budget.start() if self._budget else None
+        results = ParseResults(self.iter_parse(input, budget_usage=budget_usage))
+        results.truncated = budget_usage is not None and budget_usage.truncated
+        return results
 
+    def iter_parse(self, input, max_results=None, budget_usage=None):
+        """
+        Parses the input lazily. Results are yielded as soon as they are found, in the same order with C{parse}.
+
+        Traversing stops when the generator is not consumed anymore, thus callers which need only a few results
+        don't pay for finding all of them.
+        @type input: unicode
+        @param max_results: Max number of results to find. None for all
+        @type max_results: int or None
+        @param budget_usage: Usage to track the work with. Started from the budget of the parser if None. Callers
+            can check its C{truncated} flag after the generator is exhausted
+        @type budget_usage: ParseBudgetUsage or None
+        @rtype: generator of MorphemeContainer
+        """
+        if max_results is not None and max_results <= 0:
+            return
+
+        if budget_usage is None and self._budget:
+            budget_usage = self._budget.start()
+
+        result_count = 0
+        for result in self._iter_parse(input, budget_usage):
+            yield result
+            result_count += 1
+            if max_results is not None and result_count >= max_results:
+                return
+
+    def is_parsable(self, input):
+        """
+        Checks if the input has at least one parse result. Traversing stops at the first result found.
+        @type input: unicode
+        @rtype: bool
+        """
+        for result in self.iter_parse(input, max_results=1):
+            return True
+        return False
+
+    def _iter_parse(self, input, budget_usage):
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'parse_started', input=input)
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.count_parse()
+            start = time.time()
+
+        candidates = self._find_candidates(input)
+
+        if metrics is not None:
+            metrics.record_time(ParserMetrics.ROOT_FINDING, time.time() - start)
+            return metrics.timed(ParserMetrics.TRAVERSAL, self._traverse_candidates(candidates, input, budget_usage))
+        else:
+            return self._traverse_candidates(candidates, input, budget_usage)
+
+    def parse_forest(self, input):
+        """
+        Parses the input into a forest, which shares the suffixes common to the results instead of creating a
+        morpheme container for each of them. Traversal is depth first.
+        @type input: unicode
+        @return: All parse results of the input, or the ones found until the budget is exceeded
+        @rtype: ParseForest
+        """
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'parse_started', input=input)
+
+        budget_usage = self._budget.start() if self._budget else None
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.count_parse()
+            start = time.time()
+
+        candidates = self._find_candidates_of_variants(input)
+
+        if metrics is not None:
+            metrics.record_time(ParserMetrics.ROOT_FINDING, time.time() - start)
+            start = time.time()
+
+        subtree_cache = self._subtree_cache
+        if subtree_cache is None:
+            # subtrees are shared only within the input
+            subtree_cache = self._get_forest_subtree_cache()
+            subtree_cache.clear()
+
+        if tracer.enabled:
+            tracer.trace(logger.name, 'traversal_started', candidates=candidates)
+
+        trees = self._traversal_engine.find_subtrees(candidates, input, subtree_cache, budget_usage)
+
+        if metrics is not None:
+            metrics.record_time(ParserMetrics.TRAVERSAL, time.time() - start)
+
+        return ParseForest(trees, subtree_cache.graft, budget_usage is not None and budget_usage.truncated)
+
+    def _get_forest_subtree_cache(self):
+        if self._forest_subtree_cache is None:
+            self._forest_subtree_cache = SubtreeCache(self._suffix_graph, max_remaining_surface_length=None)
+        return self._forest_subtree_cache
+
+    def parse_many(self, inputs, max_cached_types=None):
+        """
+        Parses a stream of tokens, parsing each distinct token only once.
+
+        Results are yielded lazily in the order of the inputs, thus inputs can be a generator.
+        Results of the repeated tokens are clones, so modifying the results of a token doesn't affect the others.
+        @type inputs: iterable of unicode
+        @param max_cached_types: Max number of distinct tokens whose results are remembered. None for no limit
+        @type max_cached_types: int or None
+        @rtype: generator of list of MorphemeContainer
+        """
+        type_cache = LRUCache(max_entries=max_cached_types)
+        for input in inputs:
+            results = type_cache.get(input)
+            if results is None:
+                results = self.parse(input)
+                type_cache.put(input, results)
+
+            yield [result.clone() for result in results]
+
+    def _find_candidates(self, input):
+        """
+        Finds the roots of the input and creates the morpheme containers to start the traversal with.
+        @type input: unicode
+        @rtype: list of MorphemeContainer
+        """
         candidates = self._find_initial_parse_morpheme_containers(input)
 
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('Found %d candidate morpheme containers :', len(candidates))
-            for c in candidates:
-                logger.debug('\t %s', c)
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'candidates_found', candidates=candidates)
 
-        logger.debug('Applying required _transitions to lexeme candidates')
-        candidates = self._apply_required_transitions_to_lexeme_candidates(candidates, input)
+        return self._apply_required_transitions_to_lexeme_candidates(candidates, input)
 
-        results = []
-        new_candidates = self._traverse_candidates(candidates, results, input)
-        if new_candidates:
-            raise Exception('There are still parse morpheme containers to traverse, but traversing is finished : {}'.format(new_candidates))
-        return results
+    def _find_candidates_of_variants(self, input):
+        """
+        @return: Candidates of all variants of the input which are parsed. Only the input itself by default
+        @rtype: list of MorphemeContainer
+        """
+        return self._find_candidates(input)
 
     def _find_initial_parse_morpheme_containers(self, input):
+        tracer = get_tracer()
         candidates = []
 
-        for i in range(1, len(input) + 1):
-            partial_input = input[:i]
-
-            roots_from_lexicon = self._find_roots_for_partial_input(partial_input, input)
-
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug('Found %d root candidates for partial input "%s":', len(roots_from_lexicon), partial_input)
-                for root in roots_from_lexicon:
-                    logger.debug('\t %s', root)
+        for partial_input, roots_from_lexicon in self._find_roots_for_prefixes(input):
+            if tracer.enabled:
+                tracer.trace(logger.name, 'roots_found', partial_input=partial_input, roots=roots_from_lexicon)
 
             for root in roots_from_lexicon:
                 if self._predefined_paths and self._predefined_paths.has_paths(root):
                     predefined_morpheme_containers = self._predefined_paths.get_paths(root)
-                    if logger.isEnabledFor(logging.DEBUG):
-                        logger.debug('Found predefined morpheme containers for root candidate "%s" : %s', root, predefined_morpheme_containers)
                     for predefined_morpheme_container in predefined_morpheme_containers:
-                        if input.startswith(predefined_morpheme_container.get_surface_so_far()):
-                            logger.debug('Predefined morpheme_container is applicable %s', predefined_morpheme_container)
+                        applicable = input.startswith(predefined_morpheme_container.get_surface_so_far())
+                        if tracer.enabled:
+                            tracer.trace(logger.name, 'predefined_path_checked', root=root, morpheme_container=predefined_morpheme_container, applicable=applicable)
+                        if self.metrics is not None:
+                            self.metrics.count_predefined_path(applicable)
+                            if applicable:
+                                self.metrics.count_clones(1)
+                        if applicable:
                             clone = predefined_morpheme_container.clone()
                             clone.set_remaining_surface(input[len(predefined_morpheme_container.get_surface_so_far()):])
                             candidates.append(clone)
-                        else:
-                            logger.debug('Predefined morpheme container is not applicable, skipping %s', predefined_morpheme_container)
                 else:
                     morpheme_container = MorphemeContainer(root, self._suffix_graph.get_default_root_state(root), input[len(root.str):])
                     candidates.append(morpheme_container)
 
         return candidates
 
-    def _find_roots_for_partial_input(self, partial_input, input):
-        roots = []
+    def _find_roots_for_prefixes(self, input):
+        """
+        Asks all root finders for the roots of all prefixes of the input, and merges the results.
+        @type input: unicode
+        @return: Tuples (partial input, roots) ordered by the length of partial input.
+            Roots of a partial input are ordered by the root finders.
+        @rtype: list of tuple
+        """
+        roots_for_prefix_lengths = {}
         for root_finder in self._root_finders:
-            roots.extend(root_finder.find_roots_for_partial_input(partial_input, input))
-        return roots
-
-    def _traverse_candidates(self, candidates, results, word):
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('Gonna traverse %d candidates:', len(candidates))
-            for c in candidates:
-                logger.debug('\t%s', c)
-
-        new_candidates = []
-        for morpheme_container in candidates:
-            logger.debug(' Traversing candidate: %s', morpheme_container)
-
-            morpheme_containers_for_candidate = self._traverse_candidate(morpheme_container, word)
-            for morpheme_container_for_candidate in morpheme_containers_for_candidate:
-                if morpheme_container_for_candidate.get_last_state().type==State.TERMINAL:
-                    if not morpheme_container_for_candidate.get_remaining_surface():
-                        results.append(morpheme_container_for_candidate)
-                        if logger.isEnabledFor(logging.DEBUG):
-                            logger.debug("Found a terminal result --------------------->")
-                            logger.debug(morpheme_container_for_candidate)
-                            logger.debug(formatter.format_morpheme_container_for_tests(morpheme_container_for_candidate))
-                    else:
-                        if logger.isEnabledFor(logging.DEBUG):
-                            logger.debug("Found a morpheme container with terminal state, but there is still something to parse. Remaining:%s MorphemeContainer:%s", morpheme_container_for_candidate.get_remaining_surface(), morpheme_container_for_candidate)
-                else:
-                    new_candidates.append(morpheme_container_for_candidate)
-
-        if new_candidates:
-            new_candidates = self._traverse_candidates(new_candidates, results, word)
-
-        return new_candidates
+            root_count = 0
+            for prefix_length, roots in root_finder.find_roots_for_prefixes(input):
+                if not roots_for_prefix_lengths.has_key(prefix_length):
+                    roots_for_prefix_lengths[prefix_length] = []
+                roots_for_prefix_lengths[prefix_length].extend(roots)
+                root_count += len(roots)
+
+            if self.metrics is not None:
+                self.metrics.count_root_candidates(root_finder, root_count)
+
+        return [(input[:prefix_length], roots_for_prefix_lengths[prefix_length]) for prefix_length in sorted(roots_for_prefix_lengths.keys())]
+
+    def _traverse_candidates(self, candidates, word, budget_usage=None):
+        """
+        Traverses the candidates with the traversal engine of the parser.
+        Candidates which can never reach a terminal state by consuming the remaining surface are dropped.
+        @rtype: generator of MorphemeContainer
+        """
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'traversal_started', candidates=candidates)
+
+        return self._traversal_engine.traverse(candidates, word, budget_usage, self.metrics)
+
+    def _can_be_parse_result(self, morpheme_container):
+        if self._suffix_graph_analysis.can_consume(morpheme_container.get_last_state(), len(morpheme_container.get_remaining_surface())):
+            return True
+        else:
+            tracer = get_tracer()
+            if tracer.enabled:
+                tracer.trace(logger.name, 'candidate_pruned', morpheme_container=morpheme_container)
+            return False
 
     def _traverse_candidate(self, morpheme_container, word):
         if morpheme_container.get_last_state().type==State.TERMINAL:
             return [morpheme_container]
 
+        tracer = get_tracer()
         new_candidates = []
 
         from_state = morpheme_container.get_last_state()
         state_applicable_suffixes = self.get_applicable_suffixes_of_state_for_morpheme_container(from_state, morpheme_container)
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('  Found applicable suffixes for morpheme_container from state %s: %s', from_state, state_applicable_suffixes)
 
+        remaining_surface_length = len(morpheme_container.get_remaining_surface())
         for (suffix, to_state) in state_applicable_suffixes:
-            logger.debug('   Going to try suffix %s to state %s', suffix, to_state)
+            if not self._suffix_graph_analysis.can_consume_after(suffix, to_state, remaining_surface_length):
+                if tracer.enabled:
+                    tracer.trace(logger.name, 'suffix_pruned', morpheme_container=morpheme_container, suffix=suffix, to_state=to_state)
+                continue
 
             new_morpheme_containers_for_suffix = try_suffix(morpheme_container, suffix, to_state, word)
             if new_morpheme_containers_for_suffix:
                 new_candidates.extend(new_morpheme_containers_for_suffix)
 
+            if self.metrics is not None and new_morpheme_containers_for_suffix is not None:
+                self.metrics.count_suffix_form_attempts(len(suffix.suffix_forms), len(new_morpheme_containers_for_suffix))
+
         return new_candidates
 
     def get_applicable_suffixes_of_state_for_morpheme_container(self, from_state, morpheme_container):
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('  Finding applicable suffixes for morpheme_container from state %s: %s', from_state, morpheme_container)
-            logger.debug('   Found outputs %s', from_state.outputs)
+        # only the outputs which can produce the start of the remaining surface
+        outputs = self._suffix_graph.get_outputs_for_surface(from_state, morpheme_container.get_remaining_surface())
 
         # filter out suffixes which are already added since last derivation
-        state_applicable_suffixes = filter(lambda t: t[0] not in morpheme_container.get_suffixes_since_derivation_suffix(), from_state.outputs)
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('   Filtered out the applied suffixes since last derivation %s : %s', morpheme_container.get_suffixes_since_derivation_suffix(),  state_applicable_suffixes)
+        state_applicable_suffixes = filter(lambda t: not morpheme_container.has_suffix_since_derivation_suffix(t[0]), outputs)
 
         # filter out suffixes if one of the suffixes of whose group is already added since last derivation
-        state_applicable_suffixes = filter(lambda t: True if not t[0].group else t[0].group not in morpheme_container.get_suffix_groups_since_last_derivation(), state_applicable_suffixes)
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('   Filtered out the suffixes that has one applied in their groups: %s', state_applicable_suffixes)
+        state_applicable_suffixes = filter(lambda t: True if not t[0].group else not morpheme_container.has_suffix_group_since_last_derivation(t[0].group), state_applicable_suffixes)
+
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'applicable_suffixes_found', morpheme_container=morpheme_container, from_state=from_state,
+                outputs=outputs, applicable_suffixes=state_applicable_suffixes)
 
         return state_applicable_suffixes
 
@@ -169,8 +342,9 @@ class ContextlessMorphologicalParser(object):
 
                     clone = try_suffix_form(candidate, Positive.get_suffix_form(u''), self._suffix_graph.get_state(u'VERB_WITH_POLARITY'), word)
                     if not clone:
-                        if logger.isEnabledFor(logging.DEBUG):
-                            logger.debug('There is a progressive vowel drop, but suffix form "{}" cannot be applied to {}'.format(Positive.suffix_forms[0], candidate))
+                        tracer = get_tracer()
+                        if tracer.enabled:
+                            tracer.trace(logger.name, 'progressive_vowel_drop_not_applicable', suffix_form=Positive.suffix_forms[0], morpheme_container=candidate)
                         continue
 
                     # apply Progressive 'Iyor'
@@ -179,8 +353,9 @@ class ContextlessMorphologicalParser(object):
 
                     clone = try_suffix_form(clone, Progressive.get_suffix_form(u'Iyor'), self._suffix_graph.get_state(u'VERB_WITH_TENSE'), word)
                     if not clone:
-                        if logger.isEnabledFor(logging.DEBUG):
-                            logger.debug('There is a progressive vowel drop, but suffix form "{}" cannot be applied to {}'.format(Progressive.suffix_forms[0], candidate))
+                        tracer = get_tracer()
+                        if tracer.enabled:
+                            tracer.trace(logger.name, 'progressive_vowel_drop_not_applicable', suffix_form=Progressive.suffix_forms[0], morpheme_container=candidate)
                         continue
 
                     new_candidates.append(clone)
@@ -192,12 +367,61 @@ class ContextlessMorphologicalParser(object):
         return new_candidates
 
 class UpperCaseSupportingContextlessMorphologicalParser(ContextlessMorphologicalParser):
-    def __init__(self, suffix_graph, predefined_paths, root_finders):
-        super(UpperCaseSupportingContextlessMorphologicalParser, self).__init__(suffix_graph, predefined_paths, root_finders)
+    def __init__(self, suffix_graph, predefined_paths, root_finders, budget=None, traversal_mode=TraversalEngine.BREADTH_FIRST, metrics=None, subtree_cache=None):
+        super(UpperCaseSupportingContextlessMorphologicalParser, self).__init__(suffix_graph, predefined_paths, root_finders, budget, traversal_mode, metrics, subtree_cache)
+
+    def _iter_parse(self, input, budget_usage):
+        if not input[0].isupper():
+            return super(UpperCaseSupportingContextlessMorphologicalParser, self)._iter_parse(input, budget_usage)
+
+        lower_case_input = TurkishAlphabet.lower(input[0]) + input[1:]
+
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'parse_started', input=input, lower_case_input=lower_case_input)
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.count_parse()
+            start = time.time()
+
+        # candidates of both variants are traversed in a single frontier, see _traverse_candidate
+        candidates = self._find_candidates_of_variants(input)
+
+        results = self._traverse_candidates(candidates, input, budget_usage)
+        if metrics is not None:
+            metrics.record_time(ParserMetrics.ROOT_FINDING, time.time() - start)
+            results = metrics.timed(ParserMetrics.TRAVERSAL, results)
+
+        return self._yield_input_results_first(results, input[0])
+
+    def _find_candidates_of_variants(self, input):
+        if not input[0].isupper():
+            return self._find_candidates(input)
+
+        lower_case_input = TurkishAlphabet.lower(input[0]) + input[1:]
+        return self._find_candidates(input) + self._find_candidates(lower_case_input)
+
+    def _yield_input_results_first(self, results, first_letter):
+        """
+        Keeps the order of the results same with parsing the variants one after another : results of the input
+        as it is, then the results of the lower case variant.
+        """
+        lower_case_results = []
+        for result in results:
+            if result.get_root().str[0]==first_letter:
+                yield result
+            else:
+                lower_case_results.append(result)
 
-    def parse(self, input):
-        parse_results = super(UpperCaseSupportingContextlessMorphologicalParser, self).parse(input)
-        if input[0].isupper():
-            parse_results += super(UpperCaseSupportingContextlessMorphologicalParser, self).parse(TurkishAlphabet.lower(input[0]) + input[1:])
+        for result in lower_case_results:
+            yield result
+
+    def _traverse_candidate(self, morpheme_container, word):
+        # roots are prefixes of the variant they are found for, so the first letter of the root tells which
+        # variant the morpheme container belongs to. variants differ only by the first letter
+        first_letter = morpheme_container.get_root().str[0]
+        if first_letter!=word[0]:
+            word = first_letter + word[1:]
 
-        return parse_results
+        return super(UpperCaseSupportingContextlessMorphologicalParser, self)._traverse_candidate(morpheme_container, word)
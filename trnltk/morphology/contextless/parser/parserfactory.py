@@ -0,0 +1,116 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from trnltk.morphology.contextless.parser.parser import UpperCaseSupportingContextlessMorphologicalParser
+from trnltk.morphology.contextless.parser.rootfinder import TrieWordRootFinder, DigitNumeralRootFinder, TrieTextNumeralRootFinder, ProperNounFromApostropheRootFinder, ProperNounWithoutApostropheRootFinder
+from trnltk.morphology.contextless.parser.subtreecache import SubtreeCache
+from trnltk.morphology.lexicon.lexiconloader import LexiconLoader
+from trnltk.morphology.lexicon.lexiconsnapshot import LexiconSnapshot, get_dictionary_digest
+from trnltk.morphology.lexicon.rootgenerator import RootGenerator, RootMapGenerator
+from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
+from trnltk.morphology.morphotactics.copulasuffixgraph import CopulaSuffixGraph
+from trnltk.morphology.morphotactics.numeralsuffixgraph import NumeralSuffixGraph
+from trnltk.morphology.morphotactics.predefinedpaths import PredefinedPaths
+from trnltk.morphology.morphotactics.propernounsuffixgraph import ProperNounSuffixGraph
+
+class ContextlessMorphologicalParserFactory(object):
+    WORD_ROOT_TRIE = 'word'
+    TEXT_NUMERAL_ROOT_TRIE = 'text_numeral'
+
+    @classmethod
+    def create(cls, master_dictionary_path, budget=None, metrics=None, subtree_cache_size=None, snapshot_path=None):
+        """
+        Creates a contextless parser with the lexicon, the full suffix graph and the predefined paths.
+
+        Roots are read from the snapshot if there is a valid one for the dictionary, see C{write_snapshot}.
+        Otherwise they are generated from the dictionary.
+        @type master_dictionary_path: str or unicode
+        @param budget: Limits for the work done for a single parse. None for no limits
+        @type budget: ParseBudget or None
+        @param metrics: Metrics to collect the counters and timings of the parses into. None for not collecting
+        @type metrics: ParserMetrics or None
+        @param subtree_cache_size: Max number of suffix subtrees to share within a word and across words. None for not
+            sharing
+        @type subtree_cache_size: int or None
+        @param snapshot_path: Path of the lexicon snapshot of the dictionary. None for not using a snapshot
+        @type snapshot_path: str or None
+        @rtype: UpperCaseSupportingContextlessMorphologicalParser
+        """
+        lexicon_snapshot = LexiconSnapshot.read(snapshot_path, get_dictionary_digest(master_dictionary_path)) if snapshot_path else None
+        if lexicon_snapshot is not None:
+            root_map, root_tries = lexicon_snapshot.root_map, lexicon_snapshot.root_tries
+        else:
+            root_map_generator = RootMapGenerator()
+            root_map, root_tries = root_map_generator.generate(cls._generate_roots(master_dictionary_path)), {}
+
+        suffix_graph = CopulaSuffixGraph(NumeralSuffixGraph(ProperNounSuffixGraph(BasicSuffixGraph())))
+        suffix_graph.initialize()
+        suffix_graph = suffix_graph.freeze()
+
+        predefined_paths = PredefinedPaths(root_map, suffix_graph)
+        predefined_paths.create_predefined_paths()
+
+        word_root_finder = TrieWordRootFinder(root_map, root_tries.get(cls.WORD_ROOT_TRIE))
+        digit_numeral_root_finder = DigitNumeralRootFinder()
+        text_numeral_root_finder = TrieTextNumeralRootFinder(root_map, root_tries.get(cls.TEXT_NUMERAL_ROOT_TRIE))
+        proper_noun_from_apostrophe_root_finder = ProperNounFromApostropheRootFinder()
+        proper_noun_without_apostrophe_root_finder = ProperNounWithoutApostropheRootFinder()
+
+        subtree_cache = SubtreeCache(suffix_graph, subtree_cache_size) if subtree_cache_size else None
+
+        return UpperCaseSupportingContextlessMorphologicalParser(suffix_graph, predefined_paths,
+            [word_root_finder, digit_numeral_root_finder, text_numeral_root_finder,
+             proper_noun_from_apostrophe_root_finder, proper_noun_without_apostrophe_root_finder], budget, metrics=metrics,
+            subtree_cache=subtree_cache)
+
+    @classmethod
+    def write_snapshot(cls, master_dictionary_path, snapshot_path):
+        """
+        Generates the roots of the dictionary and writes them with their tries to the snapshot, which is used by
+        C{create} until the dictionary changes.
+        @type master_dictionary_path: str or unicode
+        @type snapshot_path: str
+        """
+        all_roots = cls._generate_roots(master_dictionary_path)
+        root_map = RootMapGenerator().generate(all_roots)
+
+        root_tries = {
+            cls.WORD_ROOT_TRIE: TrieWordRootFinder(root_map).get_root_trie(),
+            cls.TEXT_NUMERAL_ROOT_TRIE: TrieTextNumeralRootFinder(root_map).get_root_trie()
+        }
+
+        LexiconSnapshot(get_dictionary_digest(master_dictionary_path), all_roots, root_map, root_tries).write(snapshot_path)
+
+    @classmethod
+    def _generate_roots(cls, master_dictionary_path):
+        all_roots = []
+
+        lexemes = LexiconLoader.load_from_file(master_dictionary_path)
+        for di in lexemes:
+            all_roots.extend(RootGenerator.generate(di))
+
+        return all_roots
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    dictionary_path = os.path.join(os.path.dirname(__file__), '../../../resources/master_dictionary.txt')
+    if len(sys.argv) not in (2, 3):
+        print 'Usage: {} snapshot_path [master_dictionary_path]'.format(sys.argv[0])
+        sys.exit(1)
+
+    ContextlessMorphologicalParserFactory.write_snapshot(sys.argv[2] if len(sys.argv) > 2 else dictionary_path, sys.argv[1])
@@ -0,0 +1,184 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import time
+
+class TimingHistogram(object):
+    """
+    Count, total and max of the measured durations, and their distribution over buckets growing 10 times each.
+    """
+
+    BUCKET_UPPER_BOUNDS = (0.0001, 0.001, 0.01, 0.1, 1.0, None)       # in seconds, None for no bound
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bucket_counts = [0] * len(self.BUCKET_UPPER_BOUNDS)
+
+    def add(self, seconds):
+        """
+        @type seconds: float
+        """
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+        for i, upper_bound in enumerate(self.BUCKET_UPPER_BOUNDS):
+            if upper_bound is None or seconds <= upper_bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def get_snapshot(self):
+        """
+        @return: Count, total and max durations and the histogram as a list of (upper bound, count) tuples
+        @rtype: dict
+        """
+        return {
+            'count': self.count,
+            'total_seconds': self.total_seconds,
+            'max_seconds': self.max_seconds,
+            'histogram': zip(self.BUCKET_UPPER_BOUNDS, self.bucket_counts)
+        }
+
+
+class ParserMetrics(object):
+    """
+    Collects the counters and the timings of the parser stages, aggregated over all the parses it is used for.
+
+    Metrics are opt-in; a parser without a metrics object doesn't count or measure anything.
+    """
+
+    ROOT_FINDING = 'root_finding'
+    TRAVERSAL = 'traversal'
+    SCORING = 'scoring'
+
+    STAGES = (ROOT_FINDING, TRAVERSAL, SCORING)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.parse_count = 0
+        self.root_candidate_counts = {}                 # root finder name -> number of roots found
+        self.predefined_path_checks = 0
+        self.predefined_path_hits = 0
+        self.suffix_form_attempts = 0
+        self.suffix_form_successes = 0
+        self.clone_count = 0
+        self.frontier_sizes_by_depth = {}               # depth -> [count, total size, max size]
+        self.timings = dict([(stage, TimingHistogram()) for stage in self.STAGES])
+
+    def count_parse(self):
+        self.parse_count += 1
+
+    def count_root_candidates(self, root_finder, count):
+        """
+        @param root_finder: Root finder which found the roots
+        @type count: int
+        """
+        name = root_finder.__class__.__name__
+        self.root_candidate_counts[name] = self.root_candidate_counts.get(name, 0) + count
+
+    def count_predefined_path(self, hit):
+        """
+        @param hit: True if the predefined path is applicable to the input
+        @type hit: bool
+        """
+        self.predefined_path_checks += 1
+        if hit:
+            self.predefined_path_hits += 1
+
+    def count_suffix_form_attempts(self, attempts, successes):
+        """
+        @param attempts: Number of suffix forms tried
+        @type attempts: int
+        @param successes: Number of suffix forms applied, each of them creates a new morpheme container
+        @type successes: int
+        """
+        self.suffix_form_attempts += attempts
+        self.suffix_form_successes += successes
+        self.clone_count += successes
+
+    def count_clones(self, count):
+        """
+        @param count: Number of morpheme containers cloned, other than the ones created by applying suffix forms
+        @type count: int
+        """
+        self.clone_count += count
+
+    def record_frontier_size(self, depth, size):
+        """
+        @param depth: Number of transitions of the morpheme container taken from the frontier
+        @type depth: int
+        @param size: Number of morpheme containers left in the frontier
+        @type size: int
+        """
+        frontier_sizes = self.frontier_sizes_by_depth.get(depth)
+        if frontier_sizes is None:
+            self.frontier_sizes_by_depth[depth] = [1, size, size]
+        else:
+            frontier_sizes[0] += 1
+            frontier_sizes[1] += size
+            if size > frontier_sizes[2]:
+                frontier_sizes[2] = size
+
+    def record_time(self, stage, seconds):
+        """
+        @param stage: One of ROOT_FINDING, TRAVERSAL and SCORING
+        @type stage: str
+        @type seconds: float
+        """
+        self.timings[stage].add(seconds)
+
+    def timed(self, stage, generator):
+        """
+        Measures the time spent in the generator, excluding the time the consumer spends between the items.
+        @type stage: str
+        @type generator: generator
+        @rtype: generator
+        """
+        seconds = 0.0
+        try:
+            while True:
+                start = time.time()
+                try:
+                    item = next(generator)
+                finally:
+                    seconds += time.time() - start
+                yield item
+        except StopIteration:
+            return
+        finally:
+            self.record_time(stage, seconds)
+
+    def get_snapshot(self):
+        """
+        @return: Copy of all metrics, which is not affected by the later parses
+        @rtype: dict
+        """
+        return {
+            'parses': self.parse_count,
+            'root_candidates': dict(self.root_candidate_counts),
+            'predefined_path_checks': self.predefined_path_checks,
+            'predefined_path_hits': self.predefined_path_hits,
+            'suffix_form_attempts': self.suffix_form_attempts,
+            'suffix_form_successes': self.suffix_form_successes,
+            'clones': self.clone_count,
+            'frontier_sizes_by_depth': dict([(depth, {'count': count, 'mean': float(total) / count, 'max': max_size})
+                                             for depth, (count, total, max_size) in self.frontier_sizes_by_depth.iteritems()]),
+            'timings': dict([(stage, histogram.get_snapshot()) for stage, histogram in self.timings.iteritems()])
+        }
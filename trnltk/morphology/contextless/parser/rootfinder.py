@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import re
+from trnltk.morphology.lexicon.roottrie import RootTrieGenerator
 from trnltk.morphology.model.lexeme import SyntacticCategory
 from trnltk.morphology.model.root import NumeralRoot, AbbreviationRoot, ProperNounRoot
 
@@ -26,6 +27,21 @@ class RootFinder(object):
         """
         raise NotImplementedError()
 
+    def find_roots_for_prefixes(self, whole_surface):
+        """
+        Finds the roots for all prefixes of the given surface.
+        @type whole_surface: unicode
+        @return: Tuples (prefix length, roots) ordered by prefix length. Prefixes without any roots are not included
+        @rtype: list of tuple
+        """
+        result = []
+        for i in range(1, len(whole_surface) + 1):
+            roots = self.find_roots_for_partial_input(whole_surface[:i], whole_surface)
+            if roots:
+                result.append((i, roots))
+
+        return result
+
 
 class WordRootFinder(RootFinder):
     def __init__(self, lexeme_map):
@@ -61,6 +77,60 @@ class TextNumeralRootFinder(RootFinder):
             return []
 
 
+class TrieRootFinder(RootFinder):
+    """
+    Finds roots using a C{RootTrie}, which returns the roots for all prefixes of a surface in one walk.
+
+    Contrary to the root finders with a root map, the trie is built once in the constructor; thus changes
+    to the root map after that are not reflected.
+    """
+
+    def __init__(self, root_map, root_trie=None):
+        """
+        @type root_map: dict
+        @param root_trie: Trie which is already built from the root map for the roots accepted by the finder, e.g.
+            one restored from a snapshot. None for building it
+        @type root_trie: RootTrie or None
+        """
+        if root_trie is None:
+            root_trie = RootTrieGenerator().generate(root_map, self._accepts_root)
+        self._root_trie = root_trie
+
+    def get_root_trie(self):
+        """
+        @rtype: RootTrie
+        """
+        return self._root_trie
+
+    def _accepts_root(self, root):
+        raise NotImplementedError()
+
+    def find_roots_for_partial_input(self, partial_input, whole_surface=None):
+        """
+        @type partial_input: unicode
+        @type whole_surface: unicode or None
+        @rtype: list of Root
+        """
+        return self._root_trie.find_roots(partial_input)
+
+    def find_roots_for_prefixes(self, whole_surface):
+        """
+        @type whole_surface: unicode
+        @rtype: list of tuple
+        """
+        return self._root_trie.find_prefix_roots(whole_surface)
+
+
+class TrieWordRootFinder(TrieRootFinder):
+    def _accepts_root(self, root):
+        return root.lexeme.syntactic_category != SyntacticCategory.NUMERAL
+
+
+class TrieTextNumeralRootFinder(TrieRootFinder):
+    def _accepts_root(self, root):
+        return root.lexeme.syntactic_category == SyntacticCategory.NUMERAL
+
+
 class DigitNumeralRootFinder(RootFinder):
     NUMBER_REGEXES = [re.compile(u'^[-+]?\d+(,\d)?\d*$'), re.compile(u'^[-+]?(\d{1,3}\.)+\d{3}(,\d)?\d*$')]
 
@@ -0,0 +1,176 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from trnltk.morphology.contextless.parser.cachingparser import LRUCache
+from trnltk.morphology.model.lexeme import LexemeAttributeFlags
+from trnltk.morphology.morphotactics.suffixconditions import AndSpecification, OrSpecification, NotSpecification, AppliesToRoot
+from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
+
+# long remaining surfaces are rarely seen again in other words, thus their subtrees are rarely reused
+DEFAULT_MAX_REMAINING_SURFACE_LENGTH = 6
+
+class SubtreeCache(object):
+    """
+    Remembers the transitions which lead a morpheme container to the parse results, for the completely traversed
+    subtrees. Used by the traversal engine within a word and across words.
+
+    Traversal of a morpheme container doesn't depend on which root it has, but on a few things, which make its
+    signature:
+        - last state and remaining surface
+        - last letter and last vowel of the surface so far, and where its phonetic attributes come from
+        - phonetic expectations
+        - suffix forms applied since the last derivation, the last derivation and the last non blank derivation
+        - lexeme attributes and secondary syntactic category of the root, as long as the conditions can see them
+        - root itself, only if a condition of the suffix graph checks it
+    Morpheme containers with the same signature reach the results with the same transitions. Thus the transitions
+    found for one of them are grafted onto the others, instead of traversing them again.
+
+    Entries are never invalid, since they only depend on the suffix graph. Cache is not thread safe.
+    """
+
+    def __init__(self, suffix_graph, max_entries=None, max_remaining_surface_length=DEFAULT_MAX_REMAINING_SURFACE_LENGTH):
+        """
+        @param suffix_graph: Suffix graph of the parser that the cache is used for
+        @type suffix_graph: EmptySuffixGraph
+        @param max_entries: Max number of subtrees to remember. None for no limit
+        @type max_entries: int or None
+        @param max_remaining_surface_length: Subtrees of the morpheme containers with longer remaining surfaces are
+            not remembered. None for no limit
+        @type max_remaining_surface_length: int or None
+        """
+        self._cache = LRUCache(max_entries=max_entries)
+        self._max_remaining_surface_length = max_remaining_surface_length
+        self._root_strs = frozenset(_find_root_strs(suffix_graph))
+
+    def get(self, signature):
+        """
+        @return: The subtree, None if the subtree is not known. See C{TraversalEngine._find_subtree} for
+            the subtree structure
+        @rtype: tuple or None
+        """
+        return self._cache.get(signature)
+
+    def put(self, signature, subtree):
+        """
+        @param subtree: Branches which lead the morpheme containers with the signature to the parse results. Empty
+            tuple for the subtrees without any results
+        @type subtree: tuple
+        """
+        self._cache.put(signature, subtree)
+
+    def get_signature(self, morpheme_container):
+        """
+        @type morpheme_container: MorphemeContainer
+        @return: A hashable, which is same for the morpheme containers that are traversed the same way. None if
+            the subtree of the morpheme container shouldn't be remembered
+        @rtype: tuple or None
+        """
+        remaining_surface = morpheme_container.get_remaining_surface()
+        if self._max_remaining_surface_length is not None and len(remaining_surface) > self._max_remaining_surface_length:
+            return None
+
+        root = morpheme_container.get_root()
+        surface_so_far = morpheme_container.get_surface_so_far()
+
+        suffix_so_far = surface_so_far[len(root.str):]
+        if not suffix_so_far:
+            # phonetic attributes of the root are used until a suffix adds a letter
+            phonetics_source = root.phonetic_attribute_flags
+        elif suffix_so_far.isspace() or not suffix_so_far.isalnum():
+            # phonetic attributes of the root are used from now on
+            phonetics_source = (root.phonetic_attribute_flags, )
+        else:
+            # phonetic attributes are calculated from the surface so far
+            phonetics_source = None
+
+        derivation_signature = morpheme_container.get_derivation_signature()
+        if derivation_signature[4]:
+            # conditions don't check the lexeme attributes after a suffix with an actual suffix form
+            root_lexeme_attribute_flags = None
+        else:
+            root_lexeme_attribute_flags = LexemeAttributeFlags.to_flags(root.lexeme.attributes)
+
+        # states and suffix forms live as long as the graph, their ids keep the signature cheap to hash
+        return (
+            id(morpheme_container.get_last_state()),
+            remaining_surface,
+            surface_so_far[-1],
+            _get_last_vowel(surface_so_far),
+            phonetics_source,
+            morpheme_container.get_lexeme_attribute_flags(),
+            tuple(morpheme_container.get_phonetic_expectations() or ()),
+            derivation_signature,
+            root_lexeme_attribute_flags,
+            root.lexeme.secondary_syntactic_category,
+            root.str if root.str in self._root_strs else None
+        )
+
+    def graft(self, morpheme_container, transitions):
+        """
+        @type morpheme_container: MorphemeContainer
+        @type transitions: tuple of Transition
+        @return: A clone of the morpheme container with the transitions applied
+        @rtype: MorphemeContainer
+        """
+        clone = morpheme_container.clone()
+        for transition in transitions:
+            clone.add_transition(transition.suffix_form_application, transition.to_state)
+        return clone
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_statistics(self):
+        """
+        @rtype: dict
+        """
+        return self._cache.get_statistics()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def _get_last_vowel(surface):
+    vowels_by_code_point = TurkishAlphabet.Vowels_By_Code_Point
+    table_size = len(vowels_by_code_point)
+
+    for i in xrange(len(surface) - 1, -1, -1):
+        code_point = ord(surface[i])
+        if code_point < table_size and vowels_by_code_point[code_point]:
+            return surface[i]
+
+    return None
+
+def _find_root_strs(suffix_graph):
+    """
+    @return: Root strings which are checked by the conditions of the suffix forms of the graph
+    @rtype: generator of unicode
+    """
+    for suffix in suffix_graph.get_all_suffixes():
+        for suffix_form in suffix.suffix_forms:
+            for condition in (suffix_form.precondition, suffix_form.postcondition, suffix_form.post_derivation_condition):
+                for root_str in _find_root_strs_of_condition(condition):
+                    yield root_str
+
+def _find_root_strs_of_condition(condition):
+    if isinstance(condition, AppliesToRoot):
+        yield condition._root_str
+    elif isinstance(condition, (AndSpecification, OrSpecification)):
+        for specification in condition._specifications:
+            for root_str in _find_root_strs_of_condition(specification):
+                yield root_str
+    elif isinstance(condition, NotSpecification):
+        for root_str in _find_root_strs_of_condition(condition._wrapped):
+            yield root_str
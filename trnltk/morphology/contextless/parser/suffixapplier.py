@@ -14,9 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import logging
-from trnltk.morphology.model import formatter
 from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import LexemeAttributeFlags
 from trnltk.morphology.model.morpheme import SuffixFormApplication
+from trnltk.morphology.model.tracing import get_tracer
 from trnltk.morphology.phonetics.phonetics import Phonetics
 
 logger = logging.getLogger('suffixapplier')
@@ -28,12 +29,7 @@ def try_suffix(morpheme_container, suffix, to_state, word):
 
     new_candidates = []
 
-    if logger.isEnabledFor(logging.DEBUG):
-        logger.debug('    Gonna try %d suffix forms : "%s"', len(suffix.suffix_forms), suffix.suffix_forms)
-
     for suffix_form in suffix.suffix_forms:
-        logger.debug('     Gonna try suffix form "%s".', suffix_form)
-
         new_morpheme_container = try_suffix_form(morpheme_container, suffix_form, to_state, word)
         if new_morpheme_container:
             new_candidates.append(new_morpheme_container)
@@ -41,14 +37,12 @@ def try_suffix(morpheme_container, suffix, to_state, word):
     return new_candidates
 
 def transition_allowed_for_suffix(morpheme_container, suffix):
-    if suffix.group and suffix.group in morpheme_container.get_suffix_groups_since_last_derivation():
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('    Another suffix is already added on the same group(%s) since last derivation, skipping suffix.', suffix.group)
-            logger.debug('    Groups since last derivation are : %s', morpheme_container.get_suffix_groups_since_last_derivation())
+    if suffix.group and morpheme_container.has_suffix_group_since_last_derivation(suffix.group):
+        _trace_suffix_skipped(morpheme_container, suffix, 'group_already_applied')
         return False
 
     if not suffix.allow_repetition and morpheme_container.get_last_derivation_suffix() and morpheme_container.get_last_derivation_suffix()==suffix:
-        logger.debug('    The last derivation suffix is same with the suffix, skipping.')
+        _trace_suffix_skipped(morpheme_container, suffix, 'repeated_derivation')
         return False
 
     return True
@@ -56,55 +50,86 @@ def transition_allowed_for_suffix(morpheme_container, suffix):
 def try_suffix_form(morpheme_container, suffix_form, to_state, word):
     state_before_suffix_form_application = morpheme_container.get_last_state()
 
-    if not transition_allowed_for_suffix_form(morpheme_container, suffix_form):
-        return None
-
     so_far = morpheme_container.get_surface_so_far()
-    morpheme_container_lexeme_attributes = morpheme_container.get_lexeme_attributes()
+    morpheme_container_phonetic_attribute_flags = morpheme_container.get_phonetic_attribute_flags()
+
+    # matching the realization of the suffix form is cheaper than checking the conditions, so it is done first
+    realizations = suffix_form.realizations
+    if realizations is None:
+        # suffix forms which are not in the suffix graph, e.g. ones created for the predefined paths
+        realizations = Phonetics.compile_suffix_form(suffix_form.form)
+    fitting_suffix_form, voicing_possible = realizations[Phonetics.get_phonetic_class(morpheme_container_phonetic_attribute_flags)]
+
+    modified_word = so_far
+    if voicing_possible:
+        no_voicing = bool(morpheme_container.get_lexeme_attribute_flags() & LexemeAttributeFlags.NoVoicing)
+        modified_word = Phonetics.voice_last_letter(so_far, morpheme_container_phonetic_attribute_flags, no_voicing)
+
+    voicing_allowed = to_state.name!='VERB_ROOT'
+    if modified_word is so_far and word.startswith(so_far):
+        # only the rest of the word needs to be checked
+        remaining_surface = word[len(so_far):]
+        matches = not fitting_suffix_form or Phonetics.application_matches(remaining_surface, fitting_suffix_form, voicing_allowed)
+    else:
+        matches = Phonetics.application_matches(word, modified_word + fitting_suffix_form, voicing_allowed)
 
-    morpheme_container_phonetic_attributes = morpheme_container.get_phonetic_attributes()
+    if not matches:
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.trace(logger.name, 'suffix_form_skipped', morpheme_container=morpheme_container, suffix=suffix_form.suffix,
+                suffix_form=suffix_form, reason='surface_mismatch', applied=modified_word + fitting_suffix_form)
+        return None
 
-    modified_word, fitting_suffix_form = Phonetics.apply(so_far, morpheme_container_phonetic_attributes, suffix_form.form, morpheme_container_lexeme_attributes)
-    applied_str =  modified_word + fitting_suffix_form
-    if Phonetics.application_matches(word, applied_str, to_state.name!='VERB_ROOT'):
-        actual_suffix_form_str = word[len(so_far):len(applied_str)]
-        logger.debug('      Word "%s" starts with applied str "%s" (%s), adding to current morpheme container', word, applied_str, actual_suffix_form_str)
-        clone = morpheme_container.clone()
-        clone.add_transition(SuffixFormApplication(suffix_form, actual_suffix_form_str, fitting_suffix_form), to_state)
+    if not transition_allowed_for_suffix_form(morpheme_container, suffix_form):
+        return None
+
+    actual_suffix_form_str = word[len(so_far):len(modified_word) + len(fitting_suffix_form)]
+    clone = morpheme_container.clone()
+    clone.add_transition(SuffixFormApplication(suffix_form, actual_suffix_form_str, fitting_suffix_form), to_state)
 
-        if morpheme_container.has_transitions() and morpheme_container.get_last_transition().suffix_form_application.suffix_form.postcondition and not morpheme_container.get_last_transition().suffix_form_application.suffix_form.postcondition.is_satisfied_by(clone):
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug('      Suffix does not satisfy the postcondition "%s" of last transition suffix form "%s", skipping.', morpheme_container.get_last_transition().suffix_form_application.suffix_form.postcondition, formatter.format_transition(clone.get_last_transition()))
+    if morpheme_container.has_transitions():
+        last_suffix_form = morpheme_container.get_last_transition().suffix_form_application.suffix_form
+        if last_suffix_form.postcondition_predicate and not last_suffix_form.postcondition_predicate(clone):
+            _trace_suffix_form_skipped(morpheme_container, suffix_form, 'postcondition', condition=last_suffix_form.postcondition)
             return None
 
-        if morpheme_container.has_transitions() and state_before_suffix_form_application.type==State.DERIVATIONAL:
-            logger.debug('      Suffix is derivative, checking the post derivation conditions of suffixes from previous derivation.')
-            for transition in morpheme_container.get_transitions_from_derivation_suffix():
-                application_suffix_form = transition.suffix_form_application.suffix_form
-                if application_suffix_form.post_derivation_condition:
-                    matches = application_suffix_form.post_derivation_condition.is_satisfied_by(clone)
-                    if not matches:
-                        logger.debug('      Post derivation condition "%s" of suffix "%s" is not satisfied, skipping.', application_suffix_form.post_derivation_condition, application_suffix_form.suffix)
-                        return None
+    if morpheme_container.has_transitions() and state_before_suffix_form_application.type==State.DERIVATIONAL:
+        for transition in morpheme_container.get_transitions_from_derivation_suffix():
+            application_suffix_form = transition.suffix_form_application.suffix_form
+            if application_suffix_form.post_derivation_condition_predicate:
+                matches = application_suffix_form.post_derivation_condition_predicate(clone)
+                if not matches:
+                    _trace_suffix_form_skipped(morpheme_container, suffix_form, 'post_derivation_condition', condition=application_suffix_form.post_derivation_condition)
+                    return None
 
-        return clone
+    tracer = get_tracer()
+    if tracer.enabled:
+        tracer.trace(logger.name, 'suffix_form_applied', morpheme_container=clone, suffix_form=suffix_form, actual_suffix_form=actual_suffix_form_str)
 
-    else:
-        logger.debug('      Word "%s" does not start with applied str "%s" (%s), skipping', word, applied_str, applied_str)
-        return None
+    return clone
 
 def transition_allowed_for_suffix_form(morpheme_container, suffix_form):
-    if suffix_form.precondition and not suffix_form.precondition.is_satisfied_by(morpheme_container):
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('      Precondition "%s" of suffix form "%s" is not satisfied with transitions %s, skipping.', suffix_form.form, suffix_form.precondition, morpheme_container)
+    if suffix_form.precondition_predicate and not suffix_form.precondition_predicate(morpheme_container):
+        _trace_suffix_form_skipped(morpheme_container, suffix_form, 'precondition', condition=suffix_form.precondition)
         return False
 
     if suffix_form.form and not Phonetics.expectations_satisfied(morpheme_container.get_phonetic_expectations(), suffix_form.form):
-        logger.debug('      Suffix form "%s" does not satisfy phonetic expectations %s, skipping.', suffix_form.form, morpheme_container.get_phonetic_expectations())
+        _trace_suffix_form_skipped(morpheme_container, suffix_form, 'phonetic_expectations', phonetic_expectations=morpheme_container.get_phonetic_expectations())
         return False
 
     if not Phonetics.is_suffix_form_applicable(morpheme_container.get_surface_so_far(), suffix_form.form):
-        logger.debug('      Suffix form "%s" is not phonetically applicable to "%s", skipping.', suffix_form.form, morpheme_container.get_surface_so_far())
+        _trace_suffix_form_skipped(morpheme_container, suffix_form, 'phonetically_not_applicable')
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+def _trace_suffix_skipped(morpheme_container, suffix, reason):
+    tracer = get_tracer()
+    if tracer.enabled:
+        tracer.trace(logger.name, 'suffix_skipped', morpheme_container=morpheme_container, suffix=suffix, reason=reason)
+
+def _trace_suffix_form_skipped(morpheme_container, suffix_form, reason, **fields):
+    tracer = get_tracer()
+    if tracer.enabled:
+        tracer.trace(logger.name, 'suffix_form_skipped', morpheme_container=morpheme_container, suffix=suffix_form.suffix,
+            suffix_form=suffix_form, reason=reason, **fields)
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from mock import Mock
+from trnltk.morphology.contextless.parser.cachingparser import LRUCache, CachingContextlessMorphologicalParser
+from trnltk.morphology.contextless.parser.parsebudget import ParseResults
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory
+from trnltk.morphology.model.morpheme import Suffix, SuffixFormApplication
+from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.root import Root
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_should_get_and_put(self):
+        cache = LRUCache()
+        assert_that(cache.get(u'a'), none())
+
+        cache.put(u'a', [1])
+        cache.put(u'b', [])
+        assert_that(cache.get(u'a'), equal_to([1]))
+        assert_that(cache.get(u'b'), equal_to([]))
+        assert_that(cache.get(u'c'), none())
+
+        assert_that(cache.get_statistics(), has_entries({'entries': 2, 'hits': 2, 'misses': 2, 'evictions': 0}))
+
+    def test_should_evict_least_recently_used_entries_when_max_entries_exceeded(self):
+        cache = LRUCache(max_entries=2)
+        cache.put(u'a', 1)
+        cache.put(u'b', 2)
+        cache.get(u'a')
+        cache.put(u'c', 3)
+
+        assert_that(u'a' in cache, equal_to(True))
+        assert_that(u'b' in cache, equal_to(False))
+        assert_that(u'c' in cache, equal_to(True))
+        assert_that(cache.get_statistics(), has_entries({'entries': 2, 'evictions': 1}))
+
+    def test_should_evict_least_recently_used_entries_when_max_size_exceeded(self):
+        cache = LRUCache(max_size_in_bytes=100)
+        cache.put(u'a', 1, 40)
+        cache.put(u'b', 2, 40)
+        cache.put(u'c', 3, 40)
+
+        assert_that(u'a' in cache, equal_to(False))
+        assert_that(cache.get_statistics(), has_entries({'entries': 2, 'size_in_bytes': 80, 'evictions': 1}))
+
+        cache.put(u'b', 2, 10)
+        assert_that(cache.get_statistics(), has_entries({'entries': 2, 'size_in_bytes': 50, 'evictions': 1}))
+
+        cache.put(u'd', 4, 101)
+        assert_that(u'd' in cache, equal_to(False))
+        assert_that(cache.get_statistics(), has_entries({'entries': 2, 'size_in_bytes': 50}))
+
+class CachingContextlessMorphologicalParserTest(unittest.TestCase):
+
+    def setUp(self):
+        root = Root(u'elma', Lexeme(u'elma', u'elma', SyntacticCategory.NOUN, None, None), None, None)
+        self.state = State(u'NOUN_ROOT', State.TRANSFER, SyntacticCategory.NOUN)
+        self.morpheme_container = MorphemeContainer(root, self.state, u'')
+
+        self.mock_parser = Mock()
+        self.mock_parser.parse.return_value = [self.morpheme_container]
+
+        self.parser = CachingContextlessMorphologicalParser(self.mock_parser, max_entries=10)
+
+    def test_should_parse_once_for_same_surface(self):
+        results_1 = self.parser.parse(u'elma')
+        results_2 = self.parser.parse(u'elma')
+
+        assert_that(self.mock_parser.parse.call_count, equal_to(1))
+        assert_that(results_1, has_length(1))
+        assert_that(results_2, has_length(1))
+        assert_that(results_2[0].get_root(), equal_to(self.morpheme_container.get_root()))
+        assert_that(self.parser.get_statistics(), has_entries({'entries': 1, 'hits': 1, 'misses': 1}))
+
+    def test_should_not_return_cached_morpheme_containers(self):
+        results = self.parser.parse(u'elma')
+        assert_that(results[0], is_not(same_instance(self.morpheme_container)))
+
+        suffix = Suffix(u'A3sg')
+        suffix.add_suffix_form(u'')
+        results[0].add_transition(SuffixFormApplication(suffix.suffix_forms[0], u'', u''), self.state)
+
+        assert_that(self.parser.parse(u'elma')[0].get_transitions(), has_length(0))
+        assert_that(self.morpheme_container.get_transitions(), has_length(0))
+
+    def test_should_not_share_transitions_of_cached_morpheme_containers(self):
+        suffix = Suffix(u'A3sg')
+        suffix.add_suffix_form(u'')
+        self.morpheme_container.add_transition(SuffixFormApplication(suffix.suffix_forms[0], u'', u''), self.state)
+
+        results = self.parser.parse(u'elma')
+        results[0].get_transitions().pop()
+
+        assert_that(self.parser.parse(u'elma')[0].get_transitions(), has_length(1))
+        assert_that(self.morpheme_container.get_transitions(), has_length(1))
+
+    def test_should_cache_unparsable_surfaces(self):
+        self.mock_parser.parse.return_value = []
+
+        assert_that(self.parser.parse(u'xyz'), equal_to([]))
+        assert_that(self.parser.parse(u'xyz'), equal_to([]))
+        assert_that(self.mock_parser.parse.call_count, equal_to(1))
+
+    def test_should_not_cache_truncated_results(self):
+        self.mock_parser.parse.return_value = ParseResults([self.morpheme_container], truncated=True)
+
+        assert_that(self.parser.parse(u'elma').truncated, equal_to(True))
+        assert_that(self.parser.parse(u'elma').truncated, equal_to(True))
+        assert_that(self.mock_parser.parse.call_count, equal_to(2))
+
+    def test_should_parse_many(self):
+        results = list(self.parser.parse_many(iter([u'elma', u'elma', u'elma'])))
+
+        assert_that(results, has_length(3))
+        assert_that(self.mock_parser.parse.call_count, equal_to(1))
+
+    def test_should_iter_parse_from_cache(self):
+        self.mock_parser.iter_parse.return_value = iter([self.morpheme_container])
+        self.mock_parser.is_parsable.return_value = True
+
+        assert_that(list(self.parser.iter_parse(u'elma', 1)), equal_to([self.morpheme_container]))
+        assert_that(self.parser.is_parsable(u'elma'), equal_to(True))
+        self.mock_parser.iter_parse.assert_called_once_with(u'elma', 1)
+        assert_that(self.mock_parser.parse.call_count, equal_to(0))
+
+        self.parser.parse(u'elma')
+
+        results = list(self.parser.iter_parse(u'elma', 1))
+        assert_that(results, has_length(1))
+        assert_that(results[0], is_not(same_instance(self.morpheme_container)))
+        assert_that(list(self.parser.iter_parse(u'elma', 0)), equal_to([]))
+        assert_that(self.parser.is_parsable(u'elma'), equal_to(True))
+        assert_that(self.mock_parser.iter_parse.call_count, equal_to(1))
+        assert_that(self.mock_parser.is_parsable.call_count, equal_to(1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+from hamcrest import *
+from trnltk.morphology.contextless.parser.fullformtable import FullFormTable, FullFormTableBuilder, TableBackedParser, find_frequent_surfaces
+from trnltk.morphology.contextless.parser.parsebudget import ParseBudget
+from trnltk.morphology.contextless.parser.parserfactory import ContextlessMorphologicalParserFactory
+from trnltk.morphology.model import formatter
+from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
+
+dictionary_path = os.path.join(os.path.dirname(__file__), '../../../../resources/master_dictionary.txt')
+
+SURFACES = [u'kitaplar', u'gelecekleri', u'benim', u'yedi', u"Ali'ye", u"3'ü", u'TBMM', u'Ankara', u'xqz']
+
+class FullFormTableTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(FullFormTableTest, cls).setUpClass()
+        cls.parser = ContextlessMorphologicalParserFactory.create(dictionary_path)
+        cls.suffix_graph = cls.parser._suffix_graph
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.table_path = os.path.join(self.directory, 'table')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_table(self, surfaces, parser=None):
+        count = FullFormTableBuilder(parser or self.parser, self.suffix_graph).build(surfaces, self.table_path)
+        return count, FullFormTable(self.table_path, self.suffix_graph)
+
+    def format(self, results):
+        return [formatter.format_morpheme_container_for_parseset(result) for result in results]
+
+    def test_should_find_same_results_in_table(self):
+        count, table = self.build_table(SURFACES + [u'kitaplar'])
+        try:
+            assert_that(count, equal_to(len(SURFACES)))
+            assert_that(len(table), equal_to(len(SURFACES)))
+
+            for surface in SURFACES:
+                expected_results = self.parser.parse(surface)
+                results = table.get(surface)
+                assert_that(self.format(results), equal_to(self.format(expected_results)))
+                assert_that([result.get_root() for result in results], equal_to([result.get_root() for result in expected_results]))
+                assert_that([result.get_stem() for result in results], equal_to([result.get_stem() for result in expected_results]))
+
+            assert_that(table.get(u'xqz'), equal_to([]))
+            assert_that(table.get(u'kitap'), none())
+            assert_that(u'xqz' in table, equal_to(True))
+            assert_that(u'kitap' in table, equal_to(False))
+        finally:
+            table.close()
+
+    def test_should_fall_back_to_parser(self):
+        count, table = self.build_table([u'kitaplar', u'xqz'])
+        try:
+            parser = TableBackedParser(table, self.parser)
+
+            assert_that(self.format(parser.parse(u'kitaplar')), equal_to(self.format(self.parser.parse(u'kitaplar'))))
+            assert_that(self.format(parser.parse(u'kitap')), equal_to(self.format(self.parser.parse(u'kitap'))))
+            assert_that(parser.is_parsable(u'xqz'), equal_to(False))
+            assert_that(list(parser.iter_parse(u'kitaplar', max_results=1)), has_length(1))
+            assert_that(list(parser.iter_parse(u'kitap', max_results=1)), has_length(1))
+
+            assert_that(parser.get_statistics(), equal_to({'entries': 2, 'hits': 3, 'misses': 2}))
+        finally:
+            table.close()
+
+    def test_should_not_write_truncated_parses(self):
+        parser = ContextlessMorphologicalParserFactory.create(dictionary_path, budget=ParseBudget(max_candidates=3))
+        count, table = self.build_table([u've', u'gelecekleri'], parser)
+        try:
+            assert_that(count, equal_to(1))
+            assert_that(table.get(u'gelecekleri'), none())
+        finally:
+            table.close()
+
+    def test_should_not_open_table_of_another_suffix_graph(self):
+        self.build_table([u'kitaplar'])[1].close()
+
+        suffix_graph = BasicSuffixGraph()
+        suffix_graph.initialize()
+        self.assertRaises(Exception, FullFormTable, self.table_path, suffix_graph)
+
+    def test_should_find_frequent_surfaces(self):
+        frequency_list_path = os.path.join(self.directory, 'frequencies.txt')
+        with codecs.open(frequency_list_path, mode='w', encoding='utf-8') as frequency_list:
+            frequency_list.write(u'kitap 5\ngözlük 9\nve\nkitap 5\n\n')
+
+        assert_that(find_frequent_surfaces([frequency_list_path]), equal_to([u'kitap', u'gözlük', u've']))
+        assert_that(find_frequent_surfaces([frequency_list_path], 2), equal_to([u'kitap', u'gözlük']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import sys
+import unittest
+from hamcrest import *
+from trnltk.morphology.contextless.parser.memoryusage import estimate_size_in_bytes, is_shared_with_lexicon_or_graph
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory
+from trnltk.morphology.model.morpheme import Suffix, SuffixFormApplication
+from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.root import Root
+
+class MemoryUsageTest(unittest.TestCase):
+
+    def test_should_count_referenced_objects_once(self):
+        string = u'kitap'
+        strings = [string, string]
+
+        assert_that(estimate_size_in_bytes([strings, strings]), equal_to(sys.getsizeof(strings) + sys.getsizeof(string)))
+
+    def test_should_count_slots(self):
+        lexeme = Lexeme(u'kitap', u'kitap', SyntacticCategory.NOUN, None, None)
+
+        expected_size = sys.getsizeof(lexeme) + sys.getsizeof(lexeme.lemma) + sys.getsizeof(SyntacticCategory.NOUN) +\
+                        sys.getsizeof(None) + sys.getsizeof(lexeme.attributes)
+        assert_that(estimate_size_in_bytes([lexeme]), equal_to(expected_size))
+
+    def test_should_not_count_objects_shared_with_lexicon_or_graph(self):
+        root = Root(u'kitap', Lexeme(u'kitap', u'kitap', SyntacticCategory.NOUN, None, None), None, None)
+        noun_root = State(u'NOUN_ROOT', State.TRANSFER, SyntacticCategory.NOUN)
+        noun_with_agreement = State(u'NOUN_WITH_AGREEMENT', State.TRANSFER, SyntacticCategory.NOUN)
+        A3pl = Suffix(u'A3pl')
+        A3pl.add_suffix_form(u'lAr')
+
+        morpheme_container = MorphemeContainer(root, noun_root, u'lar')
+        empty_size = estimate_size_in_bytes([morpheme_container], is_shared_with_lexicon_or_graph)
+
+        morpheme_container.add_transition(SuffixFormApplication(A3pl.suffix_forms[0], u'lar', u'lar'), noun_with_agreement)
+        size = estimate_size_in_bytes([morpheme_container], is_shared_with_lexicon_or_graph)
+
+        assert_that(size, greater_than(empty_size))
+        assert_that(size, less_than(estimate_size_in_bytes([morpheme_container])))
+
+if __name__ == '__main__':
+    unittest.main()
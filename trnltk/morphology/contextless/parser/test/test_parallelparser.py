@@ -0,0 +1,53 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+from hamcrest import *
+from trnltk.morphology.contextless.parser.parallelparser import MultiProcessCorpusParser
+from trnltk.morphology.contextless.parser.parserfactory import ContextlessMorphologicalParserFactory
+from trnltk.morphology.model import formatter
+
+class MultiProcessCorpusParserTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(MultiProcessCorpusParserTest, cls).setUpClass()
+        cls.parser = ContextlessMorphologicalParserFactory.create(os.path.join(os.path.dirname(__file__), '../../../../resources/master_dictionary.txt'))
+
+    def test_should_parse_sentences_in_order(self):
+        sentences = [
+            [u'elma', u'kitaplar', u'geldim'],
+            [u'Ali', u'kitabi'],
+            [],
+            [u'xyzq', u'evlerden', u'3\'te', u'gelecek', u'miyiz'],
+            [u'okudum']
+        ]
+
+        corpus_parser = MultiProcessCorpusParser(self.parser, process_count=2, chunk_size=2)
+        results = list(corpus_parser.parse_sentences(iter(sentences)))
+
+        expected_results = [[[formatter.format_morpheme_container_for_parseset(parse_result) for parse_result in self.parser.parse(word)]
+                             for word in sentence]
+                            for sentence in sentences]
+
+        assert_that(results, equal_to(expected_results))
+
+        statistics = corpus_parser.get_statistics()
+        assert_that(sum([worker_statistics['chunks'] for worker_statistics in statistics.values()]), equal_to(3))
+        assert_that(sum([worker_statistics['tokens'] for worker_statistics in statistics.values()]), equal_to(11))
+
+if __name__ == '__main__':
+    unittest.main()
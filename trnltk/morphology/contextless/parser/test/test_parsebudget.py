@@ -0,0 +1,84 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from mock import patch
+from trnltk.morphology.contextless.parser.parsebudget import ParseBudget, ParseResults
+
+class ParseBudgetTest(unittest.TestCase):
+
+    def test_should_not_limit_without_limits(self):
+        budget = ParseBudget()
+        usage = budget.start()
+
+        for i in range(1000):
+            assert_that(usage.use_candidate(), equal_to(True))
+            assert_that(usage.use_clones(10), equal_to(True))
+
+        assert_that(usage.truncated, equal_to(False))
+        assert_that(budget.get_statistics(), has_entries({'parses': 1, 'truncated_parses': 0}))
+
+    def test_should_limit_candidates(self):
+        budget = ParseBudget(max_candidates=2)
+        usage = budget.start()
+
+        assert_that(usage.use_candidate(), equal_to(True))
+        assert_that(usage.use_candidate(), equal_to(True))
+        assert_that(usage.truncated, equal_to(False))
+        assert_that(usage.use_candidate(), equal_to(False))
+        assert_that(usage.truncated, equal_to(True))
+        assert_that(usage.exceeded_limit, equal_to(ParseBudget.CANDIDATES))
+
+        # exceeded parse is counted once
+        assert_that(usage.use_candidate(), equal_to(False))
+        assert_that(usage.use_clones(1), equal_to(False))
+        assert_that(budget.get_statistics(), has_entries({'parses': 1, 'truncated_parses': 1, 'exceeded_candidates': 1, 'exceeded_clones': 0}))
+
+        # new parse has its own usage
+        assert_that(budget.start().use_candidate(), equal_to(True))
+        assert_that(budget.get_statistics(), has_entries({'parses': 2, 'truncated_parses': 1}))
+
+    def test_should_limit_clones(self):
+        budget = ParseBudget(max_clones=10)
+        usage = budget.start()
+
+        assert_that(usage.use_clones(6), equal_to(True))
+        assert_that(usage.use_clones(4), equal_to(True))
+        assert_that(usage.use_clones(1), equal_to(False))
+        assert_that(usage.exceeded_limit, equal_to(ParseBudget.CLONES))
+        assert_that(budget.get_statistics(), has_entries({'truncated_parses': 1, 'exceeded_clones': 1}))
+
+    @patch('trnltk.morphology.contextless.parser.parsebudget.time')
+    def test_should_limit_time(self, mock_time):
+        mock_time.time.return_value = 100.0
+        budget = ParseBudget(max_seconds=0.5)
+        usage = budget.start()
+
+        mock_time.time.return_value = 100.4
+        assert_that(usage.use_candidate(), equal_to(True))
+        mock_time.time.return_value = 100.6
+        assert_that(usage.use_candidate(), equal_to(False))
+        assert_that(usage.exceeded_limit, equal_to(ParseBudget.TIME))
+        assert_that(budget.get_statistics(), has_entries({'truncated_parses': 1, 'exceeded_time': 1}))
+
+    def test_should_create_parse_results(self):
+        results = ParseResults([1, 2], truncated=True)
+        assert_that(results, equal_to([1, 2]))
+        assert_that(results.truncated, equal_to(True))
+        assert_that(ParseResults().truncated, equal_to(False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from trnltk.morphology.contextless.parser.parseforest import ParseForest
+
+def graft(path, transitions):
+    # paths stand for the morpheme containers, transitions for the suffixes
+    return path + u''.join(transitions)
+
+class ParseForestTest(unittest.TestCase):
+
+    def setUp(self):
+        # "lAr" is reached with "Nom" or "Acc", both roots share the subtree
+        self.ending = (((u'+Nom',), None), ((u'+Acc',), None))
+        self.subtree = (((u'+lAr',), self.ending), ((u'+Zero', u'+Adj'), None))
+        self.forest = ParseForest([(u'ev', self.subtree), (u'kitap', self.subtree)], graft)
+
+    def test_should_iterate_results(self):
+        assert_that(list(self.forest), equal_to([u'ev+lAr+Nom', u'ev+lAr+Acc', u'ev+Zero+Adj',
+                                                 u'kitap+lAr+Nom', u'kitap+lAr+Acc', u'kitap+Zero+Adj']))
+
+    def test_should_count_results_without_creating_them(self):
+        grafted = []
+        def counting_graft(path, transitions):
+            grafted.append(path)
+            return graft(path, transitions)
+
+        forest = ParseForest(self.forest.trees, counting_graft)
+        assert_that(forest.count_results(), equal_to(6))
+        assert_that(len(forest), equal_to(6))
+        assert_that(grafted, equal_to([]))
+
+    def test_should_count_shared_subtrees_once(self):
+        assert_that(self.forest.count_subtrees(), equal_to(2))
+
+    def test_should_iterate_empty_forest(self):
+        forest = ParseForest([(u'ev', ())], graft, truncated=True)
+        assert_that(list(forest), equal_to([]))
+        assert_that(forest.count_results(), equal_to(0))
+        assert_that(forest.truncated, equal_to(True))
+
+if __name__ == '__main__':
+    unittest.main()
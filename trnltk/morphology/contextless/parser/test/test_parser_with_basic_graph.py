@@ -18,12 +18,19 @@ from copy import copy
 import logging
 import os
 import unittest
+from hamcrest import *
 from trnltk.morphology.contextless.parser.test.parser_test import ParserTest
+from trnltk.morphology.model import formatter
 from trnltk.morphology.model.lexeme import SyntacticCategory
+from trnltk.morphology.model.tracing import tracing, RecordingTracer
 from trnltk.morphology.lexicon.lexiconloader import LexiconLoader
 from trnltk.morphology.lexicon.rootgenerator import RootGenerator, RootMapGenerator
+from trnltk.morphology.contextless.parser.parsebudget import ParseBudget
+from trnltk.morphology.contextless.parser.parsermetrics import ParserMetrics
 from trnltk.morphology.contextless.parser.parser import ContextlessMorphologicalParser, logger as parser_logger
 from trnltk.morphology.contextless.parser.rootfinder import  WordRootFinder
+from trnltk.morphology.contextless.parser.subtreecache import SubtreeCache
+from trnltk.morphology.contextless.parser.traversal import TraversalEngine
 from trnltk.morphology.contextless.parser.suffixapplier import logger as suffix_applier_logger
 from trnltk.morphology.morphotactics.predefinedpaths import PredefinedPaths
 from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
@@ -1576,6 +1583,135 @@ class ParserTestWithBasicGraph(ParserTest):
 #        self.assert_parse_correct(u'berikini',              u'xxx')
 #        self.assert_parse_correct(u'berikisi',              u'xxx')
 #        self.assert_parse_correct(u'berikiyi',              u'xxx')
+    def test_should_parse_many(self):
+        words = [u'kitap', u've', u'kitap', u'kapıya', u'xyz', u've']
+
+        results = self.parser.parse_many(word for word in words)
+
+        result_list = list(results)
+        assert_that(result_list, has_length(len(words)))
+        for word, word_results in zip(words, result_list):
+            assert_that([formatter.format_morpheme_container_for_tests(r) for r in word_results], equal_to(self.parse_result(word)))
+
+        assert_that(result_list[0][0], is_not(same_instance(result_list[2][0])))
+
+    def test_should_iter_parse(self):
+        all_results = [formatter.format_morpheme_container_for_tests(r) for r in self.parser.parse(u'sokakları')]
+        assert_that(all_results, has_length(4))
+
+        results = self.parser.iter_parse(u'sokakları')
+        assert_that([formatter.format_morpheme_container_for_tests(r) for r in results], equal_to(all_results))
+
+        results = self.parser.iter_parse(u'sokakları', max_results=2)
+        assert_that([formatter.format_morpheme_container_for_tests(r) for r in results], equal_to(all_results[:2]))
+
+        assert_that(list(self.parser.iter_parse(u'sokakları', max_results=0)), equal_to([]))
+        assert_that(list(self.parser.iter_parse(u'xyz')), equal_to([]))
+
+        assert_that(self.parser.is_parsable(u'sokakları'), equal_to(True))
+        assert_that(self.parser.is_parsable(u'parçacıkcık'), equal_to(False))
+
+    def test_should_find_same_results_with_all_traversal_modes(self):
+        words = [u'sokakları', u'korucunun', u'kitapçığa', u'nerelerimizinkilerde']
+        breadth_first_results = [self.parse_result(word) for word in words]
+
+        for mode in [TraversalEngine.DEPTH_FIRST, TraversalEngine.PRIORITY]:
+            self.parser._traversal_engine.mode = mode
+            for word, expected_results in zip(words, breadth_first_results):
+                assert_that(sorted(self.parse_result(word)), equal_to(sorted(expected_results)))
+
+    def test_should_find_same_results_with_subtree_cache(self):
+        words = [u'sokakları', u'korucunun', u'kitapçığa', u'nerelerimizinkilerde', u'evlerinden', u'kedilerinden', u'yapmayacaklar', u'koşmayacaklar']
+        expected_results = [self.parse_result(word) for word in words]
+
+        subtree_cache = SubtreeCache(self.parser._suffix_graph, max_remaining_surface_length=None)
+        self.parser = ContextlessMorphologicalParser(self.parser._suffix_graph, self.parser._predefined_paths, self.parser._root_finders,
+            subtree_cache=subtree_cache)
+        for word, results in zip(words, expected_results):
+            assert_that(sorted(self.parse_result(word)), equal_to(sorted(results)))
+
+        # endings are shared across the words
+        assert_that(subtree_cache.get_statistics()['hits'], greater_than(0))
+
+        # nothing is traversed for the known subtrees
+        metrics = ParserMetrics()
+        self.parser.metrics = metrics
+        for word, results in zip(words, expected_results):
+            assert_that(sorted(self.parse_result(word)), equal_to(sorted(results)))
+        assert_that(metrics.get_snapshot()['suffix_form_attempts'], equal_to(0))
+
+    def test_should_parse_into_forest(self):
+        for word in [u'sokakları', u'nerelerimizinkilerde', u'kitapçığa', u'yapmayacaklar', u'dayının']:
+            forest = self.parser.parse_forest(word)
+            forest_results = [formatter.format_morpheme_container_for_tests(result) for result in forest]
+
+            assert_that(sorted(forest_results), equal_to(sorted(self.parse_result(word))))
+            assert_that(forest.count_results(), equal_to(len(forest_results)))
+            assert_that(forest.truncated, equal_to(False))
+
+        # results of "gelecekleri" share their suffixes, instead of having a copy of them each
+        forest = self.parser.parse_forest(u'gelecekleri')
+        transition_count = sum([result.get_transition_count() for result in forest])
+        assert_that(forest.count_results(), greater_than(10))
+        assert_that(forest.count_subtrees(), less_than(transition_count / 2))
+
+    def test_should_truncate_forest_when_budget_is_exceeded(self):
+        budget = ParseBudget(max_candidates=5)
+        self.parser._budget = budget
+
+        forest = self.parser.parse_forest(u'nerelerimizinkilerde')
+        assert_that(forest.truncated, equal_to(True))
+        assert_that(list(forest), equal_to([]))
+
+    def test_should_collect_metrics(self):
+        metrics = ParserMetrics()
+        self.parser.metrics = metrics
+        try:
+            results = self.parser.parse(u'sokakları')
+            self.parser.parse(u'kitapçığa')
+        finally:
+            self.parser.metrics = None
+
+        snapshot = metrics.get_snapshot()
+        assert_that(snapshot['parses'], equal_to(2))
+        assert_that(snapshot['root_candidates']['WordRootFinder'], greater_than(0))
+        assert_that(snapshot['suffix_form_successes'], greater_than_or_equal_to(len(results)))
+        assert_that(snapshot['suffix_form_attempts'], greater_than(snapshot['suffix_form_successes']))
+        assert_that(snapshot['clones'], greater_than_or_equal_to(snapshot['suffix_form_successes']))
+        assert_that(snapshot['frontier_sizes_by_depth'], has_key(0))
+        assert_that(snapshot['timings'][ParserMetrics.ROOT_FINDING]['count'], equal_to(2))
+        assert_that(snapshot['timings'][ParserMetrics.TRAVERSAL]['count'], equal_to(2))
+        assert_that(snapshot['timings'][ParserMetrics.SCORING]['count'], equal_to(0))
+
+    def test_should_trace_parse(self):
+        with tracing(RecordingTracer()) as tracer:
+            results = self.parser.parse(u'sokakları')
+
+        assert_that(tracer.get_events('parse_started')[0].fields['input'], equal_to(u'sokakları'))
+        assert_that([event.fields['morpheme_container'] for event in tracer.get_events('result_found')], equal_to(results))
+        assert_that(tracer.get_events('suffix_form_applied'), is_not(empty()))
+        assert_that(tracer.get_events('suffix_form_skipped'), is_not(empty()))
+
+        # nothing is traced after the block
+        self.parser.parse(u'sokakları')
+        assert_that(tracer.get_events('parse_started'), has_length(1))
+
+    def test_should_truncate_parse_when_budget_is_exceeded(self):
+        results = self.parser.parse(u'sokakları')
+        assert_that(results.truncated, equal_to(False))
+
+        budget = ParseBudget(max_candidates=3)
+        self.parser._budget = budget
+
+        truncated_results = self.parser.parse(u'sokakları')
+        assert_that(truncated_results.truncated, equal_to(True))
+        assert_that(len(truncated_results), less_than(len(results)))
+
+        not_truncated_results = self.parser.parse(u've')
+        assert_that(not_truncated_results.truncated, equal_to(False))
+        assert_that(not_truncated_results, is_not(empty()))
+
+        assert_that(budget.get_statistics(), has_entries({'parses': 2, 'truncated_parses': 1, 'exceeded_candidates': 1}))
 
 if __name__ == '__main__':
     unittest.main()
@@ -28,7 +28,8 @@ from trnltk.morphology.lexicon.rootgenerator import CircumflexConvertingRootGene
 from trnltk.morphology.model import formatter
 from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
 from trnltk.morphology.morphotactics.copulasuffixgraph import CopulaSuffixGraph
-from trnltk.morphology.contextless.parser.parser import  logger as parser_logger, UpperCaseSupportingContextlessMorphologicalParser
+from trnltk.morphology.contextless.parser.parser import  logger as parser_logger, UpperCaseSupportingContextlessMorphologicalParser, ContextlessMorphologicalParser
+from trnltk.morphology.contextless.parser.parsermetrics import ParserMetrics
 from trnltk.morphology.contextless.parser.rootfinder import WordRootFinder, DigitNumeralRootFinder, TextNumeralRootFinder, ProperNounFromApostropheRootFinder, ProperNounWithoutApostropheRootFinder
 from trnltk.morphology.contextless.parser.suffixapplier import logger as suffix_applier_logger
 from trnltk.morphology.morphotactics.numeralsuffixgraph import NumeralSuffixGraph
@@ -190,9 +191,12 @@ class ParserTestWithSimpleParseSets(ParserTest):
         proper_noun_from_apostrophe_root_finder = ProperNounFromApostropheRootFinder()
         proper_noun_without_apostrophe_root_finder = ProperNounWithoutApostropheRootFinder()
 
-        cls.parser = UpperCaseSupportingContextlessMorphologicalParser(suffix_graph, predefined_paths,
-            [word_root_finder, text_numeral_root_finder, digit_numeral_root_finder,
-             proper_noun_from_apostrophe_root_finder, proper_noun_without_apostrophe_root_finder])
+        cls.root_finders = [word_root_finder, text_numeral_root_finder, digit_numeral_root_finder,
+                            proper_noun_from_apostrophe_root_finder, proper_noun_without_apostrophe_root_finder]
+
+        cls.suffix_graph = suffix_graph
+        cls.predefined_paths = predefined_paths
+        cls.parser = UpperCaseSupportingContextlessMorphologicalParser(suffix_graph, predefined_paths, cls.root_finders)
 
     def setUp(self):
         logging.basicConfig(level=logging.INFO)
@@ -200,6 +204,23 @@ class ParserTestWithSimpleParseSets(ParserTest):
         suffix_applier_logger.setLevel(logging.INFO)
         logger.setLevel(logging.INFO)
 
+    def test_should_parse_both_variants_of_capitalized_word_in_one_pass(self):
+        lower_case_parser = ContextlessMorphologicalParser(self.suffix_graph, self.predefined_paths, self.root_finders)
+        for word in ['Kitaba', 'Sokakları', 'Ali\'ye', 'Ankara', 'Bir', 'Eski']:
+            # results of the word as it is, then the ones of its lower case variant
+            expected_results = lower_case_parser.parse(word) + lower_case_parser.parse(TurkishAlphabet.lower(word[0]) + word[1:])
+            assert_that(self.parse_result(word), equal_to([formatter.format_morpheme_container_for_simple_parseset(r) for r in expected_results]))
+
+        metrics = ParserMetrics()
+        self.parser.metrics = metrics
+        try:
+            self.parser.parse('Kitaba')
+        finally:
+            self.parser.metrics = None
+
+        assert_that(metrics.get_snapshot()['parses'], equal_to(1))
+        assert_that(metrics.get_snapshot()['timings'][ParserMetrics.TRAVERSAL]['count'], equal_to(1))
+
     def test_should_parse_simple_parse_set_001(self):
 #        parser_logger.setLevel(logging.DEBUG)
 #        suffix_applier_logger.setLevel(logging.DEBUG)
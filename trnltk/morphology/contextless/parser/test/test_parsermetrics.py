@@ -0,0 +1,108 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from mock import Mock, patch
+from trnltk.morphology.contextful.parser.contexfulmorphologicalparser import ContextfulMorphologicalParser
+from trnltk.morphology.contextless.parser.parsermetrics import ParserMetrics, TimingHistogram
+
+class TimingHistogramTest(unittest.TestCase):
+
+    def test_should_add_durations_to_buckets(self):
+        histogram = TimingHistogram()
+        for seconds in [0.00005, 0.0001, 0.005, 0.005, 2.0]:
+            histogram.add(seconds)
+
+        snapshot = histogram.get_snapshot()
+        assert_that(snapshot['count'], equal_to(5))
+        assert_that(snapshot['total_seconds'], close_to(2.01015, 0.000001))
+        assert_that(snapshot['max_seconds'], equal_to(2.0))
+        assert_that(snapshot['histogram'], equal_to([(0.0001, 2), (0.001, 0), (0.01, 2), (0.1, 0), (1.0, 0), (None, 1)]))
+
+class ParserMetricsTest(unittest.TestCase):
+
+    def test_should_aggregate_counters(self):
+        metrics = ParserMetrics()
+        root_finder = Mock()
+
+        metrics.count_parse()
+        metrics.count_parse()
+        metrics.count_root_candidates(root_finder, 3)
+        metrics.count_root_candidates(root_finder, 2)
+        metrics.count_predefined_path(True)
+        metrics.count_predefined_path(False)
+        metrics.count_clones(1)
+        metrics.count_suffix_form_attempts(4, 1)
+        metrics.count_suffix_form_attempts(2, 0)
+        metrics.record_frontier_size(1, 10)
+        metrics.record_frontier_size(1, 20)
+        metrics.record_frontier_size(2, 5)
+
+        snapshot = metrics.get_snapshot()
+        assert_that(snapshot, has_entries({
+            'parses': 2,
+            'root_candidates': {'Mock': 5},
+            'predefined_path_checks': 2,
+            'predefined_path_hits': 1,
+            'suffix_form_attempts': 6,
+            'suffix_form_successes': 1,
+            'clones': 2,
+            'frontier_sizes_by_depth': {1: {'count': 2, 'mean': 15.0, 'max': 20}, 2: {'count': 1, 'mean': 5.0, 'max': 5}}
+        }))
+
+        # snapshot is a copy
+        metrics.count_root_candidates(root_finder, 1)
+        assert_that(snapshot['root_candidates'], equal_to({'Mock': 5}))
+
+        metrics.reset()
+        assert_that(metrics.get_snapshot(), has_entries({'parses': 0, 'root_candidates': {}, 'clones': 0}))
+
+    @patch('trnltk.morphology.contextless.parser.parsermetrics.time')
+    def test_should_time_generator_without_consumer_time(self, mock_time):
+        mock_time.time.side_effect = [1.0, 1.5, 10.0, 10.25, 20.0, 20.25]
+        metrics = ParserMetrics()
+
+        items = list(metrics.timed(ParserMetrics.TRAVERSAL, iter([u'a', u'b'])))
+
+        assert_that(items, equal_to([u'a', u'b']))
+        timing = metrics.get_snapshot()['timings'][ParserMetrics.TRAVERSAL]
+        assert_that(timing['count'], equal_to(1))
+        assert_that(timing['total_seconds'], equal_to(1.0))
+
+    def test_should_record_time_of_abandoned_generator(self):
+        metrics = ParserMetrics()
+
+        generator = metrics.timed(ParserMetrics.TRAVERSAL, iter([u'a', u'b']))
+        next(generator)
+        generator.close()
+
+        assert_that(metrics.get_snapshot()['timings'][ParserMetrics.TRAVERSAL]['count'], equal_to(1))
+
+    def test_should_record_scoring_time_of_contextful_parser(self):
+        metrics = ParserMetrics()
+        contextless_parser = Mock()
+        contextless_parser.parse.return_value = [Mock(), Mock()]
+        contextful_likelihood_calculator = Mock()
+        contextful_likelihood_calculator.calculate_likelihood.return_value = 0.5
+
+        parser = ContextfulMorphologicalParser(contextless_parser, contextful_likelihood_calculator, metrics)
+        likelihoods = parser.parse_with_likelihoods(u'kitap', [], [])
+
+        assert_that(likelihoods, has_length(2))
+        assert_that(metrics.get_snapshot()['timings'][ParserMetrics.SCORING]['count'], equal_to(1))
+
+if __name__ == '__main__':
+    unittest.main()
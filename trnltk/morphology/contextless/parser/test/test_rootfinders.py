@@ -18,7 +18,7 @@ import unittest
 from hamcrest import *
 from mock import Mock
 from trnltk.morphology.model.lexeme import SecondarySyntacticCategory, SyntacticCategory
-from trnltk.morphology.contextless.parser.rootfinder import DigitNumeralRootFinder, ProperNounFromApostropheRootFinder, ProperNounWithoutApostropheRootFinder, WordRootFinder, TextNumeralRootFinder
+from trnltk.morphology.contextless.parser.rootfinder import DigitNumeralRootFinder, ProperNounFromApostropheRootFinder, ProperNounWithoutApostropheRootFinder, WordRootFinder, TextNumeralRootFinder, TrieWordRootFinder, TrieTextNumeralRootFinder
 
 class WordRootFinderTest(unittest.TestCase):
 
@@ -98,6 +98,94 @@ class TextNumeralRootFinderTest(unittest.TestCase):
         roots = self.root_finder.find_roots_for_partial_input(u"UNDEFINED")
         assert_that(roots, has_length(0))
 
+class TrieWordRootFinderTest(unittest.TestCase):
+
+    def setUp(self):
+        mock_lexeme_a = Mock()
+        mock_lexeme_ab = Mock()
+        mock_lexeme_abc_1 = Mock()
+        mock_lexeme_abc_2 = Mock()
+
+        mock_lexeme_a.syntactic_category = SyntacticCategory.NOUN
+        mock_lexeme_ab.syntactic_category = SyntacticCategory.VERB
+        mock_lexeme_abc_1.syntactic_category = SyntacticCategory.NOUN
+        mock_lexeme_abc_2.syntactic_category = SyntacticCategory.NUMERAL
+
+        self.mock_root_a = Mock()
+        self.mock_root_ab = Mock()
+        self.mock_root_abc_1 = Mock()
+        self.mock_root_abc_2 = Mock()
+
+        self.mock_root_a.lexeme = mock_lexeme_a
+        self.mock_root_ab.lexeme = mock_lexeme_ab
+        self.mock_root_abc_1.lexeme = mock_lexeme_abc_1
+        self.mock_root_abc_2.lexeme = mock_lexeme_abc_2
+
+        self.lexeme_map = {u'a' : [self.mock_root_a], u'ab': [self.mock_root_ab], u'abc': [self.mock_root_abc_1, self.mock_root_abc_2], u'x': []}
+
+        self.root_finder = TrieWordRootFinder(self.lexeme_map)
+
+    def test_should_find_roots(self):
+        roots = self.root_finder.find_roots_for_partial_input(u"abc")
+        assert_that(roots, has_length(1))
+        assert_that(roots, has_items(self.mock_root_abc_1))
+
+        roots = self.root_finder.find_roots_for_partial_input(u"ab")
+        assert_that(roots, has_length(1))
+        assert_that(roots, has_items(self.mock_root_ab))
+
+        roots = self.root_finder.find_roots_for_partial_input(u"x")
+        assert_that(roots, has_length(0))
+
+        roots = self.root_finder.find_roots_for_partial_input(u"abcd")
+        assert_that(roots, has_length(0))
+
+        roots = self.root_finder.find_roots_for_partial_input(u"UNDEFINED")
+        assert_that(roots, has_length(0))
+
+    def test_should_find_roots_for_prefixes(self):
+        assert_that(self.root_finder.find_roots_for_prefixes(u"abcdef"), equal_to([(1, [self.mock_root_a]), (2, [self.mock_root_ab]), (3, [self.mock_root_abc_1])]))
+        assert_that(self.root_finder.find_roots_for_prefixes(u"abx"), equal_to([(1, [self.mock_root_a]), (2, [self.mock_root_ab])]))
+        assert_that(self.root_finder.find_roots_for_prefixes(u"xyz"), equal_to([]))
+        assert_that(self.root_finder.find_roots_for_prefixes(u"UNDEFINED"), equal_to([]))
+
+    def test_should_find_same_roots_with_root_map_finder(self):
+        root_map_finder = WordRootFinder(self.lexeme_map)
+        for surface in [u"a", u"abc", u"abcdef", u"xa", u"ba"]:
+            assert_that(self.root_finder.find_roots_for_prefixes(surface), equal_to(root_map_finder.find_roots_for_prefixes(surface)))
+
+    def test_should_not_return_internal_lists(self):
+        self.root_finder.find_roots_for_partial_input(u"abc").append(self.mock_root_abc_2)
+        self.root_finder.find_roots_for_prefixes(u"abc")[2][1].append(self.mock_root_abc_2)
+
+        assert_that(self.root_finder.find_roots_for_partial_input(u"abc"), has_length(1))
+
+class TrieTextNumeralRootFinderTest(unittest.TestCase):
+
+    def setUp(self):
+        mock_lexeme1 = Mock()
+        mock_lexeme2 = Mock()
+
+        mock_lexeme1.syntactic_category = SyntacticCategory.NUMERAL
+        mock_lexeme2.syntactic_category = SyntacticCategory.NOUN
+
+        self.mock_root1 = Mock()
+        self.mock_root2 = Mock()
+
+        self.mock_root1.lexeme = mock_lexeme1
+        self.mock_root2.lexeme = mock_lexeme2
+
+        lexeme_map = {u'on' : [self.mock_root1, self.mock_root2]}
+
+        self.root_finder = TrieTextNumeralRootFinder(lexeme_map)
+
+    def test_should_find_roots(self):
+        roots = self.root_finder.find_roots_for_partial_input(u"on")
+        assert_that(roots, has_length(1))
+        assert_that(roots, has_items(self.mock_root1))
+
+        assert_that(self.root_finder.find_roots_for_prefixes(u"onbir"), equal_to([(2, [self.mock_root1])]))
+
 class DigitNumeralRootFinderTest(unittest.TestCase):
 
     def setUp(self):
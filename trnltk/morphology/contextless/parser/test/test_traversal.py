@@ -0,0 +1,170 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import sys
+import unittest
+from hamcrest import *
+from trnltk.morphology.contextless.parser.parsebudget import ParseBudget
+from trnltk.morphology.contextless.parser.traversal import TraversalEngine, logger as traversal_logger
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import SyntacticCategory
+
+TRANSFER = State(u'TRANSFER', State.TRANSFER, SyntacticCategory.NOUN)
+TERMINAL = State(u'TERMINAL', State.TERMINAL, SyntacticCategory.NOUN)
+
+class DummyMorphemeContainer(object):
+    """
+    Consumes the remaining surface one letter at a time. Words are the paths taken, letters "a" and "b" can be
+    consumed by two different suffixes.
+    """
+    def __init__(self, path, remaining_surface, state=TRANSFER, transitions=()):
+        self.path = path
+        self.remaining_surface = remaining_surface
+        self.state = state
+        self.transitions = transitions
+
+    def get_last_state(self):
+        return self.state
+
+    def get_remaining_surface(self):
+        return self.remaining_surface
+
+    def get_transition_count(self):
+        return len(self.transitions)
+
+    def get_last_transition(self):
+        return self.transitions[-1]
+
+    def get_transitions(self):
+        return list(self.transitions)
+
+    def __repr__(self):
+        return self.path
+
+def expand(morpheme_container, word):
+    new_morpheme_containers = []
+    if not morpheme_container.remaining_surface:
+        new_morpheme_containers.append(DummyMorphemeContainer(morpheme_container.path + u'.', u'', TERMINAL,
+            morpheme_container.transitions + ((u'.', TERMINAL),)))
+    else:
+        letter = morpheme_container.remaining_surface[0]
+        suffixes = [letter + u'1', letter + u'2'] if letter in u'ab' else [letter]
+        for suffix in suffixes:
+            new_morpheme_containers.append(DummyMorphemeContainer(morpheme_container.path + suffix, morpheme_container.remaining_surface[1:],
+                TRANSFER, morpheme_container.transitions + ((suffix, TRANSFER),)))
+    return new_morpheme_containers
+
+class DummySubtreeCache(object):
+    """
+    Traversal of a dummy morpheme container only depends on its remaining surface.
+    """
+    def __init__(self):
+        self.subtrees = {}
+
+    def get(self, signature):
+        return self.subtrees.get(signature)
+
+    def put(self, signature, subtree):
+        self.subtrees[signature] = subtree
+
+    def get_signature(self, morpheme_container):
+        return morpheme_container.remaining_surface
+
+    def graft(self, morpheme_container, transitions):
+        path = morpheme_container.path + u''.join([suffix for suffix, state in transitions])
+        state = transitions[-1][1] if transitions else morpheme_container.state
+        return DummyMorphemeContainer(path, u'', state, morpheme_container.transitions + transitions)
+
+class TraversalEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        traversal_logger.setLevel(logging.INFO)
+
+    def traverse(self, mode, word, prune=None, budget_usage=None, priority_key=None, subtree_cache=None, expand=expand):
+        engine = TraversalEngine(expand, prune, mode, priority_key, subtree_cache)
+        candidates = [DummyMorphemeContainer(u'x', word), DummyMorphemeContainer(u'y', word[1:])]
+        return [morpheme_container.path for morpheme_container in engine.traverse(candidates, word, budget_usage)]
+
+    def test_should_find_same_results_in_all_modes(self):
+        breadth_first_results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab')
+        depth_first_results = self.traverse(TraversalEngine.DEPTH_FIRST, u'ab')
+        priority_results = self.traverse(TraversalEngine.PRIORITY, u'ab')
+
+        assert_that(breadth_first_results, equal_to([u'yb1.', u'yb2.', u'xa1b1.', u'xa1b2.', u'xa2b1.', u'xa2b2.']))
+        assert_that(depth_first_results, equal_to([u'xa1b1.', u'xa1b2.', u'xa2b1.', u'xa2b2.', u'yb1.', u'yb2.']))
+        assert_that(sorted(priority_results), equal_to(sorted(breadth_first_results)))
+
+    def test_should_traverse_by_priority(self):
+        results = self.traverse(TraversalEngine.PRIORITY, u'ab', priority_key=lambda m: m.path[0] != u'x')
+        assert_that(results, equal_to([u'xa1b1.', u'xa1b2.', u'xa2b1.', u'xa2b2.', u'yb1.', u'yb2.']))
+
+    def test_should_prune(self):
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab', prune=lambda m: not m.path.startswith(u'xa2'))
+        assert_that(results, equal_to([u'yb1.', u'yb2.', u'xa1b1.', u'xa1b2.']))
+
+    def test_should_stop_when_budget_is_exceeded(self):
+        budget_usage = ParseBudget(max_candidates=3).start()
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab', budget_usage=budget_usage)
+
+        assert_that(results, equal_to([]))
+        assert_that(budget_usage.truncated, equal_to(True))
+
+    def test_should_graft_cached_subtrees(self):
+        expanded = []
+        def counting_expand(morpheme_container, word):
+            expanded.append(morpheme_container.path)
+            return expand(morpheme_container, word)
+
+        subtree_cache = DummySubtreeCache()
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab', subtree_cache=subtree_cache, expand=counting_expand)
+
+        # depth first order, subtrees of "xa2" and "y" are same with the subtree of "xa1"
+        assert_that(results, equal_to([u'xa1b1.', u'xa1b2.', u'xa2b1.', u'xa2b2.', u'yb1.', u'yb2.']))
+        assert_that(expanded, equal_to([u'x', u'xa1', u'xa1b1']))
+        terminal_branch = (((u'.', TERMINAL),), None)
+        assert_that(subtree_cache.subtrees[u''], equal_to((terminal_branch,)))
+        assert_that(subtree_cache.subtrees[u'ab'], has_length(2))
+
+        # subtrees are shared across traversals
+        del expanded[:]
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab', subtree_cache=subtree_cache, expand=counting_expand)
+        assert_that(results, equal_to([u'xa1b1.', u'xa1b2.', u'xa2b1.', u'xa2b2.', u'yb1.', u'yb2.']))
+        assert_that(expanded, equal_to([]))
+
+    def test_should_not_cache_subtrees_when_budget_is_exceeded(self):
+        subtree_cache = DummySubtreeCache()
+        budget_usage = ParseBudget(max_candidates=2).start()
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, u'ab', budget_usage=budget_usage, subtree_cache=subtree_cache)
+
+        assert_that(results, equal_to([]))
+        assert_that(budget_usage.truncated, equal_to(True))
+        assert_that(subtree_cache.subtrees, is_not(has_key(u'ab')))
+        assert_that(subtree_cache.subtrees, is_not(has_key(u'b')))
+
+    def test_should_traverse_deeper_than_recursion_limit(self):
+        word = u'c' * (sys.getrecursionlimit() + 100)
+        for mode in [TraversalEngine.BREADTH_FIRST, TraversalEngine.DEPTH_FIRST, TraversalEngine.PRIORITY]:
+            results = self.traverse(mode, word)
+            assert_that(results, has_length(2))
+
+        results = self.traverse(TraversalEngine.BREADTH_FIRST, word, subtree_cache=DummySubtreeCache())
+        assert_that(results, has_length(2))
+
+    def test_should_not_accept_unknown_mode(self):
+        self.assertRaises(Exception, TraversalEngine, expand, None, u'unknown')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import deque
+import heapq
+import itertools
+import logging
+from trnltk.morphology.contextless.parser.parseforest import graft_subtree
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.tracing import get_tracer
+
+logger = logging.getLogger('parser')
+
+class _BreadthFirstFrontier(deque):
+    push_all = deque.extend
+    pop = deque.popleft
+
+
+class _DepthFirstFrontier(list):
+    def push_all(self, morpheme_containers):
+        # first one is popped first
+        self.extend(reversed(morpheme_containers))
+
+
+class _PriorityFrontier(list):
+    def __init__(self, priority_key):
+        super(_PriorityFrontier, self).__init__()
+        self._priority_key = priority_key
+        self._counter = itertools.count()
+
+    def push_all(self, morpheme_containers):
+        # counter keeps the insertion order for the same priorities and avoids comparing the morpheme containers
+        for morpheme_container in morpheme_containers:
+            heapq.heappush(self, (self._priority_key(morpheme_container), next(self._counter), morpheme_container))
+
+    def pop(self):
+        return heapq.heappop(self)[2]
+
+
+def remaining_surface_length(morpheme_container):
+    return len(morpheme_container.get_remaining_surface())
+
+
+class _SubtreeFrame(object):
+    """
+    A morpheme container whose subtree is being traversed, with the branches of its subtree which lead to the
+    results found so far.
+    """
+
+    def __init__(self, morpheme_container, signature):
+        self.morpheme_container = morpheme_container
+        self.signature = signature
+        self.children = None            # containers to traverse, set when the container is expanded
+        self.next_child_index = 0
+        self.branches = []
+
+    def add_result(self, result):
+        self.branches.append((_get_added_transitions(self.morpheme_container, result), None))
+
+    def add_subtree(self, child, child_subtree):
+        if child_subtree:
+            self.branches.append((_get_added_transitions(self.morpheme_container, child), child_subtree))
+
+
+def _get_added_transitions(morpheme_container, descendant):
+    added_transition_count = descendant.get_transition_count() - morpheme_container.get_transition_count()
+    if not added_transition_count:
+        return ()
+    elif added_transition_count==1:
+        return descendant.get_last_transition(),
+    else:
+        return tuple(descendant.get_transitions()[-added_transition_count:])
+
+
+class TraversalEngine(object):
+    """
+    Traverses the morpheme containers with a work queue, instead of recursing once per suffix.
+
+    The order of traversal is determined by the mode:
+        - breadth first : Containers with less transitions are traversed first. Results are found in the same order
+          with the level by level traversal.
+        - depth first : Children of a container are traversed before its siblings. Finds the first results with a
+          small frontier.
+        - priority : Container with the lowest priority key is traversed first. By default, the one with the
+          shortest remaining surface.
+
+    All modes find the same results, but in different orders.
+
+    If a subtree cache is given, the traversal is depth first whatever the mode is, since a subtree has to be
+    traversed completely before it is remembered. A subtree which is already in the cache is not traversed, but
+    its transitions are grafted onto the morpheme container.
+    """
+
+    BREADTH_FIRST = 'breadth_first'
+    DEPTH_FIRST = 'depth_first'
+    PRIORITY = 'priority'
+
+    def __init__(self, expand, prune=None, mode=BREADTH_FIRST, priority_key=None, subtree_cache=None):
+        """
+        @param expand: Function (morpheme container, word) which returns the new morpheme containers created by
+            applying the suffixes to the morpheme container
+        @type expand: function
+        @param prune: Function (morpheme container) which returns False if the morpheme container can never be a
+            result. None for not pruning
+        @type prune: function or None
+        @param mode: Order of traversal, one of BREADTH_FIRST, DEPTH_FIRST and PRIORITY
+        @type mode: str
+        @param priority_key: Function (morpheme container) to get the priority of a morpheme container in PRIORITY
+            mode. Remaining surface length if None
+        @type priority_key: function or None
+        @param subtree_cache: Cache to remember the traversed subtrees in. None for not remembering
+        @type subtree_cache: SubtreeCache or None
+        """
+        if mode not in (self.BREADTH_FIRST, self.DEPTH_FIRST, self.PRIORITY):
+            raise Exception(u'Unknown traversal mode {}'.format(mode))
+
+        self._expand = expand
+        self._prune = prune
+        self.mode = mode
+        self._priority_key = priority_key or remaining_surface_length
+        self._subtree_cache = subtree_cache
+
+    def _create_frontier(self):
+        if self.mode == self.BREADTH_FIRST:
+            return _BreadthFirstFrontier()
+        elif self.mode == self.DEPTH_FIRST:
+            return _DepthFirstFrontier()
+        else:
+            return _PriorityFrontier(self._priority_key)
+
+    def traverse(self, candidates, word, budget_usage=None, metrics=None):
+        """
+        Traverses the candidates until there is nothing left to traverse or the budget is exceeded.
+        @type candidates: list of MorphemeContainer
+        @type word: unicode
+        @type budget_usage: ParseBudgetUsage or None
+        @param metrics: Metrics to record the frontier sizes into. None for not recording
+        @type metrics: ParserMetrics or None
+        @return: Morpheme containers at terminal states, which don't have any remaining surface
+        @rtype: generator of MorphemeContainer
+        """
+        if self._subtree_cache is not None:
+            return self._traverse_with_subtree_cache(candidates, word, budget_usage)
+        else:
+            return self._traverse_frontier(candidates, word, budget_usage, metrics)
+
+    def _traverse_frontier(self, candidates, word, budget_usage, metrics):
+        tracer = get_tracer()
+        frontier = self._create_frontier()
+        frontier.push_all(candidates)
+
+        expand = self._expand
+        prune = self._prune
+        push_all = frontier.push_all
+        pop = frontier.pop
+
+        while frontier:
+            morpheme_container = pop()
+            if prune and not prune(morpheme_container):
+                continue
+
+            if tracer.enabled:
+                tracer.trace(logger.name, 'candidate_traversed', morpheme_container=morpheme_container, frontier_size=len(frontier))
+            if metrics is not None:
+                metrics.record_frontier_size(morpheme_container.get_transition_count(), len(frontier))
+            if budget_usage and not budget_usage.use_candidate():
+                return
+
+            new_morpheme_containers = expand(morpheme_container, word)
+            if budget_usage and not budget_usage.use_clones(len(new_morpheme_containers)):
+                return
+
+            morpheme_containers_to_traverse = []
+            for new_morpheme_container in new_morpheme_containers:
+                if new_morpheme_container.get_last_state().type==State.TERMINAL:
+                    if not new_morpheme_container.get_remaining_surface():
+                        if tracer.enabled:
+                            tracer.trace(logger.name, 'result_found', morpheme_container=new_morpheme_container)
+                        yield new_morpheme_container
+                    elif tracer.enabled:
+                        tracer.trace(logger.name, 'terminal_with_remaining_surface', morpheme_container=new_morpheme_container,
+                            remaining_surface=new_morpheme_container.get_remaining_surface())
+                else:
+                    morpheme_containers_to_traverse.append(new_morpheme_container)
+
+            if morpheme_containers_to_traverse:
+                push_all(morpheme_containers_to_traverse)
+
+    def find_subtrees(self, candidates, word, subtree_cache, budget_usage=None):
+        """
+        Traverses the candidates depth first, without creating the morpheme containers of the results.
+        @type candidates: list of MorphemeContainer
+        @type word: unicode
+        @param subtree_cache: Cache to look up and remember the subtrees in
+        @type subtree_cache: SubtreeCache
+        @type budget_usage: ParseBudgetUsage or None
+        @return: Tuples (candidate, subtree) of the candidates which are traversed before the budget is exceeded.
+            See C{ParseForest} for the subtree structure
+        @rtype: list of tuple
+        """
+        tracer = get_tracer()
+        trees = []
+        for candidate in candidates:
+            subtree = self._find_subtree(candidate, word, budget_usage, tracer, subtree_cache)
+            if subtree is None:
+                break
+            trees.append((candidate, subtree))
+
+        return trees
+
+    def _traverse_with_subtree_cache(self, candidates, word, budget_usage):
+        tracer = get_tracer()
+        subtree_cache = self._subtree_cache
+
+        for candidate in candidates:
+            subtree = self._find_subtree(candidate, word, budget_usage, tracer, subtree_cache)
+            if subtree is None:
+                return
+
+            for result in graft_subtree(candidate, subtree, subtree_cache.graft):
+                if budget_usage and not budget_usage.use_clones(1):
+                    return
+                if tracer.enabled:
+                    tracer.trace(logger.name, 'result_found', morpheme_container=result)
+                yield result
+
+    def _find_subtree(self, morpheme_container, word, budget_usage, tracer, subtree_cache):
+        """
+        Traverses the subtree of the morpheme container depth first, unless it is in the cache. Subtrees of the
+        descendants are looked up in the cache too and all of the traversed subtrees are put into the cache.
+
+        See C{ParseForest} for the subtree structure.
+        @return: Subtree of the morpheme container, None if the budget is exceeded
+        @rtype: tuple or None
+        """
+        expand = self._expand
+        prune = self._prune
+
+        signature = subtree_cache.get_signature(morpheme_container)
+        subtree = subtree_cache.get(signature) if signature is not None else None
+        if subtree is not None:
+            if tracer.enabled:
+                tracer.trace(logger.name, 'subtree_cache_hit', morpheme_container=morpheme_container)
+            return subtree
+
+        frames = [_SubtreeFrame(morpheme_container, signature)]
+        while True:
+            frame = frames[-1]
+
+            if frame.children is None:
+                frame.children = []
+                morpheme_container = frame.morpheme_container
+                if not prune or prune(morpheme_container):
+                    if tracer.enabled:
+                        tracer.trace(logger.name, 'candidate_traversed', morpheme_container=morpheme_container, frontier_size=len(frames) - 1)
+                    if budget_usage and not budget_usage.use_candidate():
+                        return None
+
+                    new_morpheme_containers = expand(morpheme_container, word)
+                    if budget_usage and not budget_usage.use_clones(len(new_morpheme_containers)):
+                        return None
+
+                    for new_morpheme_container in new_morpheme_containers:
+                        if new_morpheme_container.get_last_state().type==State.TERMINAL:
+                            if not new_morpheme_container.get_remaining_surface():
+                                frame.add_result(new_morpheme_container)
+                            elif tracer.enabled:
+                                tracer.trace(logger.name, 'terminal_with_remaining_surface', morpheme_container=new_morpheme_container,
+                                    remaining_surface=new_morpheme_container.get_remaining_surface())
+                        else:
+                            frame.children.append(new_morpheme_container)
+
+            if frame.next_child_index < len(frame.children):
+                child = frame.children[frame.next_child_index]
+                frame.next_child_index += 1
+
+                child_signature = subtree_cache.get_signature(child)
+                child_subtree = subtree_cache.get(child_signature) if child_signature is not None else None
+                if child_subtree is None:
+                    frames.append(_SubtreeFrame(child, child_signature))
+                else:
+                    if tracer.enabled:
+                        tracer.trace(logger.name, 'subtree_cache_hit', morpheme_container=child)
+                    frame.add_subtree(child, child_subtree)
+                continue
+
+            # subtree is traversed completely
+            frames.pop()
+            subtree = tuple(frame.branches)
+            if frame.signature is not None:
+                subtree_cache.put(frame.signature, subtree)
+            if not frames:
+                return subtree
+
+            frames[-1].add_subtree(frame.morpheme_container, subtree)
@@ -15,7 +15,7 @@ limitations under the License.
 """
 import codecs
 from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
-from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory, SecondarySyntacticCategory, LexemeAttribute
+from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory, SecondarySyntacticCategory, LexemeAttribute, StringInterner
 
 class LexiconLoader(object):
 
@@ -31,6 +31,7 @@ class LexiconLoader(object):
     @classmethod
     def load_from_lines(cls, lines):
         lexemes = set()
+        string_interner = StringInterner()
 
         for line in lines:
             line = line.strip()
@@ -41,8 +42,7 @@ class LexiconLoader(object):
                 lexeme = cls._crate_lexeme_from_line(line)
                 cls._set_category_and_lemma(lexeme)
                 cls._infer_morphemic_attributes(lexeme)
-                if lexeme.attributes:
-                    lexeme.attributes = set(lexeme.attributes)
+                string_interner.intern_lexeme(lexeme)
             except:
                 print 'Error in line: ', line
                 raise
@@ -166,9 +166,4 @@ class LexiconLoader(object):
 
     @classmethod
     def _vowel_count(cls, seq):
-        vowel_count = 0
-        for c in seq:
-            if TurkishAlphabet.get_letter_for_char(c).vowel:
-                vowel_count += 1
-
-        return vowel_count
+        return TurkishAlphabet.count_vowels(seq)
@@ -0,0 +1,148 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import gc
+import hashlib
+import logging
+import marshal
+import os
+from trnltk.morphology.lexicon.rootgenerator import RootMapGenerator
+from trnltk.morphology.lexicon.roottrie import RootTrie
+from trnltk.morphology.model.lexeme import Lexeme, LexemeAttributeFlags, StringInterner
+from trnltk.morphology.model.root import Root
+from trnltk.morphology.phonetics.phonetics import PhoneticAttributeFlags
+
+logger = logging.getLogger('lexiconsnapshot')
+
+MAGIC = 'TRNLTKLS'
+VERSION = 1
+
+class LexiconSnapshot(object):
+    """
+    Roots generated from a dictionary, their root map and the root tries built from them, which can be written to
+    a file and read back much faster than loading the dictionary and generating the roots again.
+
+    Snapshot is valid only for the dictionary it is created from, which is checked with the digest of the
+    dictionary content. Snapshot files are written with marshal, thus they can only be read by the same Python
+    version.
+    """
+
+    def __init__(self, dictionary_digest, roots, root_map, root_tries):
+        """
+        @param dictionary_digest: Digest of the dictionary the roots are generated from, see C{get_dictionary_digest}
+        @type dictionary_digest: str
+        @param roots: Roots in the order they are generated
+        @type roots: list of Root
+        @param root_map: Root map of the roots, created by C{RootMapGenerator}
+        @type root_map: dict
+        @param root_tries: Tries of the roots by their names
+        @type root_tries: dict
+        """
+        self.dictionary_digest = dictionary_digest
+        self.roots = roots
+        self.root_map = root_map
+        self.root_tries = root_tries
+
+    def write(self, file_path):
+        """
+        @type file_path: str
+        """
+        lexemes = []
+        lexeme_indexes = {}                 # id of lexeme -> index
+        encoded_roots = []
+        for root in self.roots:
+            lexeme = root.lexeme
+            lexeme_index = lexeme_indexes.get(id(lexeme))
+            if lexeme_index is None:
+                lexeme_index = len(lexemes)
+                lexeme_indexes[id(lexeme)] = lexeme_index
+                lexemes.append((lexeme.lemma, lexeme.root, lexeme.syntactic_category, lexeme.secondary_syntactic_category,
+                                LexemeAttributeFlags.to_flags(lexeme.attributes)))
+
+            phonetic_expectations = tuple(sorted(root.phonetic_expectations)) if root.phonetic_expectations is not None else None
+            encoded_roots.append((root.str, lexeme_index, phonetic_expectations, root.phonetic_attribute_flags))
+
+        root_indexes = dict([(id(root), i) for i, root in enumerate(self.roots)])
+        get_root_index = lambda root: root_indexes[id(root)]
+        flat_root_tries = dict([(name, root_trie.to_flat_nodes(get_root_index)) for name, root_trie in self.root_tries.iteritems()])
+
+        with open(file_path, 'wb') as snapshot_file:
+            marshal.dump((MAGIC, VERSION, self.dictionary_digest), snapshot_file)
+            marshal.dump((lexemes, encoded_roots, flat_root_tries), snapshot_file)
+
+    @classmethod
+    def read(cls, file_path, dictionary_digest):
+        """
+        @type file_path: str
+        @param dictionary_digest: Digest of the current content of the dictionary
+        @type dictionary_digest: str
+        @return: The snapshot, None if there is no snapshot file or if it is not valid for the dictionary anymore
+        @rtype: LexiconSnapshot or None
+        """
+        if not os.path.exists(file_path):
+            logger.info('No lexicon snapshot at %s', file_path)
+            return None
+
+        with open(file_path, 'rb') as snapshot_file:
+            try:
+                header = marshal.load(snapshot_file)
+            except (EOFError, ValueError, TypeError):
+                header = None
+
+            if header!=(MAGIC, VERSION, dictionary_digest):
+                logger.info('Lexicon snapshot at %s is not valid for the dictionary', file_path)
+                return None
+
+            # lots of objects are created at once, while none of them can be garbage
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                lexemes, encoded_roots, flat_root_tries = marshal.load(snapshot_file)
+                return cls._restore(dictionary_digest, lexemes, encoded_roots, flat_root_tries)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+
+    @classmethod
+    def _restore(cls, dictionary_digest, encoded_lexemes, encoded_roots, flat_root_tries):
+        # marshal creates a copy of a unicode string for each time it is seen
+        intern = StringInterner().intern
+        lexemes = [Lexeme(intern(lemma), intern(lexeme_root), intern(syntactic_category), intern(secondary_syntactic_category),
+                          set(LexemeAttributeFlags.to_attributes(attribute_flags)))
+                   for lemma, lexeme_root, syntactic_category, secondary_syntactic_category, attribute_flags in encoded_lexemes]
+
+        roots = []
+        for root_str, lexeme_index, phonetic_expectations, phonetic_attribute_flags in encoded_roots:
+            roots.append(Root(intern(root_str), lexemes[lexeme_index], set(phonetic_expectations) if phonetic_expectations is not None else None,
+                PhoneticAttributeFlags.to_attributes(phonetic_attribute_flags)))
+
+        # root map is not written, since it is created from the roots in the same order
+        root_map = RootMapGenerator().generate(roots)
+        root_tries = dict([(name, RootTrie.from_flat_nodes(flat_nodes, roots)) for name, flat_nodes in flat_root_tries.iteritems()])
+
+        return LexiconSnapshot(dictionary_digest, roots, root_map, root_tries)
+
+
+def get_dictionary_digest(file_path):
+    """
+    @type file_path: str
+    @return: Hex digest of the content of the dictionary file
+    @rtype: str
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as dictionary_file:
+        for block in iter(lambda: dictionary_file.read(1 << 16), ''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -16,7 +16,7 @@ limitations under the License.
 """
 from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
 from trnltk.morphology.model.lexeme import LexemeAttribute, SyntacticCategory
-from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticExpectation, PhoneticAttributes
+from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticExpectation, PhoneticAttributeFlags
 from trnltk.morphology.model.root import Root
 
 class RootGenerator(object):
@@ -39,8 +39,8 @@ class RootGenerator(object):
                 print u'Error generating roots for lexeme : {}'.format(lexeme)
                 raise
         else:
-            phonetic_attributes = Phonetics.calculate_phonetic_attributes_of_plain_sequence(lexeme.root)
-            root = Root(lexeme.root, lexeme, None, phonetic_attributes)
+            phonetic_attribute_flags = Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(lexeme.root)
+            root = Root(lexeme.root, lexeme, None, PhoneticAttributeFlags.to_attributes(phonetic_attribute_flags))
             return [root]
 
     @classmethod
@@ -52,8 +52,8 @@ class RootGenerator(object):
 
         modified_seq = lexeme.root
 
-        original_attributes = Phonetics.calculate_phonetic_attributes_of_plain_sequence(lexeme.root)
-        modified_attributes = Phonetics.calculate_phonetic_attributes_of_plain_sequence(lexeme.root)
+        original_attribute_flags = Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(lexeme.root)
+        modified_attribute_flags = original_attribute_flags
         original_phonetic_expectations = set()
         modified_phonetic_expectations = set()
 
@@ -64,16 +64,13 @@ class RootGenerator(object):
             if lexeme.lemma.endswith(u"nk"):
                 modified_letter = TurkishAlphabet.L_g
             modified_seq = modified_seq[:-1] + modified_letter.char_value
-            if PhoneticAttributes.LastLetterVoicelessStop in modified_attributes:
-                modified_attributes.remove(PhoneticAttributes.LastLetterVoicelessStop)
+            modified_attribute_flags &= ~PhoneticAttributeFlags.LastLetterVoicelessStop
             if modified_letter.continuant:
-                if PhoneticAttributes.LastLetterNotContinuant in modified_attributes :
-                    modified_attributes.remove(PhoneticAttributes.LastLetterNotContinuant)
-                modified_attributes.add(PhoneticAttributes.LastLetterContinuant)
+                modified_attribute_flags &= ~PhoneticAttributeFlags.LastLetterNotContinuant
+                modified_attribute_flags |= PhoneticAttributeFlags.LastLetterContinuant
             else:
-                if PhoneticAttributes.LastLetterContinuant in modified_attributes:
-                    modified_attributes.remove(PhoneticAttributes.LastLetterContinuant)
-                modified_attributes.add(PhoneticAttributes.LastLetterNotContinuant)
+                modified_attribute_flags &= ~PhoneticAttributeFlags.LastLetterContinuant
+                modified_attribute_flags |= PhoneticAttributeFlags.LastLetterNotContinuant
             if LexemeAttribute.VoicingOpt not in lexeme.attributes:
                 original_phonetic_expectations.add(PhoneticExpectation.ConsonantStart)
             modified_phonetic_expectations.add(PhoneticExpectation.VowelStart)
@@ -90,25 +87,21 @@ class RootGenerator(object):
             modified_phonetic_expectations.add(PhoneticExpectation.VowelStart)
 
         if LexemeAttribute.InverseHarmony in lexeme.attributes:
-            original_attributes.add(PhoneticAttributes.LastVowelFrontal)
-            if PhoneticAttributes.LastVowelBack in original_attributes:
-                original_attributes.remove(PhoneticAttributes.LastVowelBack)
-            modified_attributes.add(PhoneticAttributes.LastVowelFrontal)
-            if PhoneticAttributes.LastVowelBack in modified_attributes:
-                modified_attributes.remove(PhoneticAttributes.LastVowelBack)
+            original_attribute_flags = original_attribute_flags & ~PhoneticAttributeFlags.LastVowelBack | PhoneticAttributeFlags.LastVowelFrontal
+            modified_attribute_flags = modified_attribute_flags & ~PhoneticAttributeFlags.LastVowelBack | PhoneticAttributeFlags.LastVowelFrontal
 
         if LexemeAttribute.ProgressiveVowelDrop in lexeme.attributes:
             modified_seq = modified_seq[:-1]
             if RootGenerator._has_vowel(modified_seq):
-                modified_attributes = Phonetics.calculate_phonetic_attributes_of_plain_sequence(modified_seq)
+                modified_attribute_flags = Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(modified_seq)
             modified_phonetic_expectations.add(PhoneticExpectation.VowelStart)
 
 
         original_phonetic_expectations = original_phonetic_expectations or None
         modified_phonetic_expectations = modified_phonetic_expectations or None
 
-        original = Root(lexeme.root, lexeme, original_phonetic_expectations, original_attributes)
-        modified = Root(modified_seq, lexeme, modified_phonetic_expectations, modified_attributes)
+        original = Root(lexeme.root, lexeme, original_phonetic_expectations, PhoneticAttributeFlags.to_attributes(original_attribute_flags))
+        modified = Root(modified_seq, lexeme, modified_phonetic_expectations, PhoneticAttributeFlags.to_attributes(modified_attribute_flags))
 
         if original==modified:
             return [original]
@@ -177,7 +170,7 @@ class RootGenerator(object):
     @classmethod
     def _has_vowel(cls, seq):
         for s in seq:
-            if TurkishAlphabet.get_letter_for_char(s).vowel:
+            if TurkishAlphabet.is_vowel(s):
                 return True
 
         return False
@@ -0,0 +1,160 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+class RootTrieNode(object):
+    def __init__(self):
+        self.children = {}
+        self.roots = None
+
+
+class RootTrie(object):
+    """
+    Character trie of root strings.
+
+    Unlike a root map, which needs a lookup for every prefix of a surface, the trie finds all roots which are
+    prefixes of a surface in one left to right walk and stops as soon as there is no branch for the next character.
+    """
+
+    def __init__(self):
+        self._root_node = RootTrieNode()
+        self._root_count = 0
+
+    def add_roots(self, root_str, roots):
+        """
+        @type root_str: unicode
+        @type roots: list of Root
+        """
+        if not roots:
+            return
+
+        node = self._root_node
+        for c in root_str:
+            child = node.children.get(c)
+            if child is None:
+                child = RootTrieNode()
+                node.children[c] = child
+            node = child
+
+        if node.roots is None:
+            node.roots = []
+        node.roots.extend(roots)
+        self._root_count += len(roots)
+
+    def find_roots(self, root_str):
+        """
+        Finds the roots whose string is exactly the given string.
+        @type root_str: unicode
+        @rtype: list of Root
+        """
+        node = self._root_node
+        for c in root_str:
+            node = node.children.get(c)
+            if node is None:
+                return []
+
+        return node.roots[:] if node.roots else []
+
+    def find_prefix_roots(self, surface):
+        """
+        Finds the roots which are prefixes of the given surface.
+        @type surface: unicode
+        @return: Tuples (prefix length, roots) ordered by prefix length
+        @rtype: list of tuple
+        """
+        result = []
+        node = self._root_node
+        for i in range(len(surface)):
+            node = node.children.get(surface[i])
+            if node is None:
+                break
+            if node.roots:
+                result.append((i + 1, node.roots[:]))
+
+        return result
+
+    def __len__(self):
+        return self._root_count
+
+    def to_flat_nodes(self, get_root_index):
+        """
+        @param get_root_index: Function (root) which returns the index of the root in a list of roots
+        @type get_root_index: function
+        @return: Nodes in depth first order, as (character, child count, root indexes or None) triples flattened into
+            a list of builtin types
+        @rtype: list
+        """
+        flat_nodes = []
+        nodes = [(u'', self._root_node)]
+        while nodes:
+            c, node = nodes.pop()
+            flat_nodes.append(c)
+            flat_nodes.append(len(node.children))
+            flat_nodes.append(tuple([get_root_index(root) for root in node.roots]) if node.roots else None)
+            nodes.extend(node.children.iteritems())
+
+        return flat_nodes
+
+    @classmethod
+    def from_flat_nodes(cls, flat_nodes, roots):
+        """
+        Restores a trie written by C{to_flat_nodes}, without walking the root strings.
+        @type flat_nodes: list
+        @param roots: Roots which the root indexes of the nodes point to
+        @type roots: list of Root
+        @rtype: RootTrie
+        """
+        root_trie = cls()
+        parents = []                    # [node, number of children not restored yet]
+        for i in xrange(0, len(flat_nodes), 3):
+            child_count = flat_nodes[i + 1]
+            root_indexes = flat_nodes[i + 2]
+
+            node = RootTrieNode()
+            if root_indexes is not None:
+                node.roots = [roots[root_index] for root_index in root_indexes]
+                root_trie._root_count += len(root_indexes)
+
+            if parents:
+                parent = parents[-1]
+                parent[0].children[flat_nodes[i]] = node
+                parent[1] -= 1
+                if not parent[1]:
+                    parents.pop()
+            else:
+                root_trie._root_node = node
+
+            if child_count:
+                parents.append([node, child_count])
+
+        return root_trie
+
+
+class RootTrieGenerator(object):
+    def generate(self, root_map, root_filter=None):
+        """
+        Builds a trie out of a root map which is created by C{RootMapGenerator}.
+        @type root_map: dict
+        @param root_filter: If given, only the roots which the filter returns True for are added to trie
+        @type root_filter: function
+        @rtype: RootTrie
+        """
+        root_trie = RootTrie()
+        for root_str, roots in root_map.iteritems():
+            if root_filter:
+                roots = filter(root_filter, roots)
+            root_trie.add_roots(root_str, roots)
+
+        return root_trie
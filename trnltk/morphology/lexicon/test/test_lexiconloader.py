@@ -258,6 +258,19 @@ class LexiconLoaderTest(unittest.TestCase):
         assert_that(lexemes, has_item(Lexeme(u'yemek', u'ye', SyntacticCategory.VERB, None, {LexemeAttribute.Aorist_A, LexemeAttribute.Causative_dIr, LexemeAttribute.NoVoicing, LexemeAttribute.Passive_In, LexemeAttribute.ProgressiveVowelDrop})))
         assert_that(lexemes, has_item(Lexeme(u'ürkmek', u'ürk', SyntacticCategory.VERB, None, {LexemeAttribute.Aorist_A, LexemeAttribute.Causative_It, LexemeAttribute.NoVoicing})))
 
+    def test_should_share_strings_of_lexemes(self):
+        dictionary_lines = [u'abes [P:Adj; A:NoVoicing]', u'abes [P:Adv; A:NoVoicing]']
+
+        lexemes = sorted(LexiconLoader.load_from_lines(dictionary_lines), key=lambda lexeme: lexeme.syntactic_category)
+
+        assert_that(lexemes, has_length(2))
+        assert_that(lexemes[0].syntactic_category, same_instance(SyntacticCategory.ADJECTIVE))
+        assert_that(lexemes[1].syntactic_category, same_instance(SyntacticCategory.ADVERB))
+        assert_that(lexemes[0].lemma, same_instance(lexemes[1].lemma))
+        assert_that(lexemes[0].root, same_instance(lexemes[1].root))
+        assert_that(list(lexemes[0].attributes)[0], same_instance(LexemeAttribute.NoVoicing))
+        assert_that(list(lexemes[1].attributes)[0], same_instance(LexemeAttribute.NoVoicing))
+
 
     def test_should_validate_master_dict(self):
         path = os.path.join(os.path.dirname(__file__), '../../../resources/master_dictionary.txt')
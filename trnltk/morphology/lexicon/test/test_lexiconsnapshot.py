@@ -0,0 +1,92 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+from hamcrest import *
+from trnltk.morphology.lexicon.lexiconloader import LexiconLoader
+from trnltk.morphology.lexicon.lexiconsnapshot import LexiconSnapshot, get_dictionary_digest
+from trnltk.morphology.lexicon.rootgenerator import RootGenerator, RootMapGenerator
+from trnltk.morphology.lexicon.roottrie import RootTrieGenerator
+
+DICTIONARY_LINES = [u'kitap', u'kitapçık', u'ağaç', u'git [P:Verb; A:Voicing, Aorist_A]', u'ben [P:Pron,Pers]', u'on [P:Num,Card]', u'hak [A:Doubling]']
+
+class LexiconSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dictionary_path = os.path.join(self.directory, 'dictionary.txt')
+        self.snapshot_path = os.path.join(self.directory, 'snapshot')
+
+        with codecs.open(self.dictionary_path, mode='w', encoding='utf-8') as dictionary_file:
+            dictionary_file.write(u'\n'.join(DICTIONARY_LINES))
+
+        self.roots = []
+        for lexeme in LexiconLoader.load_from_file(self.dictionary_path):
+            self.roots.extend(RootGenerator.generate(lexeme))
+
+        self.root_map = RootMapGenerator().generate(self.roots)
+        self.root_tries = {'all': RootTrieGenerator().generate(self.root_map)}
+        self.digest = get_dictionary_digest(self.dictionary_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_should_restore_roots_and_tries(self):
+        LexiconSnapshot(self.digest, self.roots, self.root_map, self.root_tries).write(self.snapshot_path)
+
+        snapshot = LexiconSnapshot.read(self.snapshot_path, self.digest)
+
+        assert_that(snapshot.roots, equal_to(self.roots))
+        for restored_root, root in zip(snapshot.roots, self.roots):
+            assert_that(restored_root.lexeme, equal_to(root.lexeme))
+            assert_that(restored_root.phonetic_expectations, equal_to(root.phonetic_expectations))
+            assert_that(restored_root.phonetic_attributes, equal_to(root.phonetic_attributes))
+
+        assert_that(snapshot.root_map, equal_to(self.root_map))
+
+        restored_trie = snapshot.root_tries['all']
+        assert_that(len(restored_trie), equal_to(len(self.root_tries['all'])))
+        for surface in [u'kitapçığa', u'ağacı', u'gidiyor', u'hakkı', u'bende', u'onlar', u'yok']:
+            assert_that(restored_trie.find_prefix_roots(surface), equal_to(self.root_tries['all'].find_prefix_roots(surface)))
+
+        # roots of the tries are the roots of the snapshot, not copies of them
+        kitap_root = restored_trie.find_roots(u'kitap')[0]
+        assert_that(any([kitap_root is root for root in snapshot.roots]), equal_to(True))
+        assert_that(snapshot.root_map[u'kitap'][0], same_instance(kitap_root))
+
+    def test_should_not_read_snapshot_of_another_dictionary(self):
+        LexiconSnapshot(self.digest, self.roots, self.root_map, self.root_tries).write(self.snapshot_path)
+
+        with codecs.open(self.dictionary_path, mode='a', encoding='utf-8') as dictionary_file:
+            dictionary_file.write(u'\nelma')
+
+        new_digest = get_dictionary_digest(self.dictionary_path)
+        assert_that(new_digest, is_not(equal_to(self.digest)))
+        assert_that(LexiconSnapshot.read(self.snapshot_path, new_digest), none())
+
+    def test_should_not_read_missing_or_invalid_snapshot(self):
+        assert_that(LexiconSnapshot.read(self.snapshot_path, self.digest), none())
+
+        with open(self.snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write('not a snapshot')
+        assert_that(LexiconSnapshot.read(self.snapshot_path, self.digest), none())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,10 +24,24 @@ class State(object):
         self.syntactic_category = syntactic_category
         self.outputs = [] #(suffix, out_state) tuples
         self.type = type
+        self.id = None
 
     def add_out_suffix(self, suffix, to_state):
+        if self.is_frozen():
+            raise Exception(u'State {} is frozen, unable to add out suffix {}'.format(self.name, suffix))
         self.outputs.append((suffix, to_state))
 
+    def freeze(self, id):
+        """
+        Assigns the id of the state in a frozen graph and makes the outputs immutable.
+        @type id: int
+        """
+        self.id = id
+        self.outputs = tuple(self.outputs)
+
+    def is_frozen(self):
+        return self.id is not None
+
     def __str__(self):
         return self.name
 
@@ -92,8 +92,68 @@ class LexemeAttribute(object):
     })
 
 
+class LexemeAttributeFlags(object):
+    """
+    Int flag representation of lexeme attributes. Checking a flag is cheaper than checking a string in a set.
+    """
+    Voicing = 1 << 0
+    VoicingOpt = 1 << 1
+    NoVoicing = 1 << 2
+    InverseHarmony = 1 << 3
+    LastVowelDrop = 1 << 4
+    Doubling = 1 << 5
+    RootChange = 1 << 6
+    Plural = 1 << 7
+    NoSuffix = 1 << 8
+
+    CompoundP3sg = 1 << 9
+
+    ProgressiveVowelDrop = 1 << 10
+    Aorist_I = 1 << 11
+    Aorist_A = 1 << 12
+    Causative_t = 1 << 13
+    Causative_Ir = 1 << 14
+    Causative_It = 1 << 15
+    Causative_Ar = 1 << 16
+    Causative_dIr = 1 << 17
+    Passive_Il = 1 << 18
+    Passive_In = 1 << 19
+    Passive_InIl = 1 << 20
+
+    _attributes_of_flags = {}
+
+    @classmethod
+    def to_flags(cls, attributes):
+        """
+        @type attributes: set of unicode or None
+        @rtype: int
+        """
+        flags = 0
+        if attributes:
+            for attribute in attributes:
+                flags |= cls._flags_of_attributes[attribute]
+        return flags
+
+    @classmethod
+    def to_attributes(cls, flags):
+        """
+        @type flags: int
+        @return: Attributes for the flags. Same set is returned for same flags, so it shouldn't be modified
+        @rtype: frozenset of unicode
+        """
+        attributes = cls._attributes_of_flags.get(flags)
+        if attributes is None:
+            attributes = frozenset([attribute for attribute, flag in cls._flags_of_attributes.iteritems() if flags & flag])
+            cls._attributes_of_flags[flags] = attributes
+        return attributes
+
+LexemeAttributeFlags._flags_of_attributes = dict((attribute, getattr(LexemeAttributeFlags, attribute)) for attribute in LexemeAttribute.ALL)
+
+
 class Lexeme(object):
     #TODO: make this and similar classes immutable
+    __slots__ = ('lemma', 'root', 'syntactic_category', 'secondary_syntactic_category', 'attributes')
+
     def __init__(self, lemma, root, syntactic_category, secondary_syntactic_category, attributes):
         """
         @type lemma: unicode
@@ -135,5 +195,41 @@ class Lexeme(object):
 
 
 class DynamicLexeme(Lexeme):
+    __slots__ = ()
+
     def __init__(self, lemma, root, syntactic_category, secondary_syntactic_category, attributes):
-        Lexeme.__init__(self, lemma, root, syntactic_category, secondary_syntactic_category, attributes)
\ No newline at end of file
+        Lexeme.__init__(self, lemma, root, syntactic_category, secondary_syntactic_category, attributes)
+
+
+class StringInterner(object):
+    """
+    Makes the lexemes of a lexicon share the equal strings, instead of keeping a copy each. Builtin C{intern} only
+    works for C{str}, not for C{unicode}.
+
+    Category and attribute names are mapped to the constants of this module.
+    """
+
+    def __init__(self):
+        constants = SyntacticCategory.ALL + SecondarySyntacticCategory.ALL + [SecondarySyntacticCategory.DIGITS] + LexemeAttribute.ALL
+        self._strings = dict([(constant, constant) for constant in constants])
+
+    def intern(self, string):
+        """
+        @type string: unicode or None
+        @return: The string that is equal to the given one and is shared
+        @rtype: unicode or None
+        """
+        if string is None:
+            return None
+        return self._strings.setdefault(string, string)
+
+    def intern_lexeme(self, lexeme):
+        """
+        Replaces the strings of the lexeme with the shared ones.
+        @type lexeme: Lexeme
+        """
+        lexeme.lemma = self.intern(lexeme.lemma)
+        lexeme.root = self.intern(lexeme.root)
+        lexeme.syntactic_category = self.intern(lexeme.syntactic_category)
+        lexeme.secondary_syntactic_category = self.intern(lexeme.secondary_syntactic_category)
+        lexeme.attributes = set([self.intern(attribute) for attribute in lexeme.attributes])
\ No newline at end of file
@@ -29,6 +29,7 @@ class Suffix(object):
         self.group = None
         self.pretty_name = pretty_name or name
         self.allow_repetition = allow_repetition
+        self.id = None
 
         if group:
             self.group = group
@@ -99,6 +100,20 @@ class SuffixForm(object):
         self.precondition = precondition
         self.postcondition = postcondition
         self.post_derivation_condition = post_derivation_condition
+        self.realizations = None        # phonetic class -> (fitting form, voicing possible), set when the graph is initialized
+
+        # functions checking the conditions, replaced with the compiled ones when the graph is initialized
+        self.precondition_predicate = precondition.is_satisfied_by if precondition else None
+        self.postcondition_predicate = postcondition.is_satisfied_by if postcondition else None
+        self.post_derivation_condition_predicate = post_derivation_condition.is_satisfied_by if post_derivation_condition else None
+
+    def compile_conditions(self):
+        """
+        Compiles the conditions of the suffix form into predicates, which give the same results with the conditions.
+        """
+        self.precondition_predicate = self.precondition.compile() if self.precondition else None
+        self.postcondition_predicate = self.postcondition.compile() if self.postcondition else None
+        self.post_derivation_condition_predicate = self.post_derivation_condition.compile() if self.post_derivation_condition else None
 
     def __str__(self):
         return self.form
@@ -108,6 +123,8 @@ class SuffixForm(object):
 
 
 class SuffixFormApplication(object):
+    __slots__ = ('suffix_form', 'actual_suffix_form', 'fitting_suffix_form')
+
     def __init__(self, suffix_form, actual_suffix_form, fitting_suffix_form):
         """
         @type suffix_form: SuffixForm
@@ -119,6 +136,8 @@ class SuffixFormApplication(object):
         self.fitting_suffix_form = fitting_suffix_form
 
 class Transition(object):
+    __slots__ = ('from_state', 'suffix_form_application', 'to_state')
+
     def __init__(self, from_state, suffix_form_application, to_state):
         """
         @type from_state: State
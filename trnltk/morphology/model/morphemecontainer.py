@@ -17,12 +17,122 @@ from exceptions import Exception
 from trnltk.morphology.model import formatter
 import trnltk.morphology.model.formatter
 from trnltk.morphology.model.graphmodel import State
-from trnltk.morphology.model.lexeme import SyntacticCategory, LexemeAttribute
-from trnltk.morphology.model.morpheme import Transition
+from trnltk.morphology.model.lexeme import SyntacticCategory, LexemeAttributeFlags
+from trnltk.morphology.model.morpheme import Transition, FreeTransitionSuffix, ZeroTransitionSuffix
 from trnltk.morphology.model.root import NumeralRoot
-from trnltk.morphology.phonetics.phonetics import Phonetics
+from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticAttributeFlags
+
+class TransitionNode(object):
+    """
+    An element of the persistent transition chain of morpheme containers.
+
+    A node is never modified after it is created. A container points to the node of its last transition, thus
+    a clone shares all of the transitions with the original container and adding a transition to one of them
+    doesn't affect the other.
+
+    The derivation bookkeeping of the chain is calculated from the previous node when a node is created, so that
+    it is not calculated by scanning the transitions again and again during the traversal.
+    Sequences ending with the derivation are ordered starting from the last transition.
+    """
+    __slots__ = ('transition', 'previous', 'length', '_derivation_signature',
+                 'last_derivation_transition', 'last_non_blank_transition', 'last_non_blank_derivation',
+                 'has_actual_suffix_form', 'has_actual_suffix_form_of_non_transition_suffix',
+                 'suffixes_since_derivation', 'transitions_since_derivation', 'transitions_from_derivation',
+                 'suffix_names_since_derivation', 'suffix_groups_since_derivation')
+
+    def __init__(self, transition, previous):
+        """
+        @type transition: Transition
+        @type previous: TransitionNode or None
+        """
+        self.transition = transition
+        self.previous = previous
+        self._derivation_signature = None
+
+        suffix_form = transition.suffix_form_application.suffix_form
+        suffix = suffix_form.suffix
+
+        if previous:
+            self.length = previous.length + 1
+            self.last_derivation_transition = previous.last_derivation_transition
+            self.last_non_blank_transition = previous.last_non_blank_transition
+            self.last_non_blank_derivation = previous.last_non_blank_derivation
+            self.has_actual_suffix_form = previous.has_actual_suffix_form
+            self.has_actual_suffix_form_of_non_transition_suffix = previous.has_actual_suffix_form_of_non_transition_suffix
+        else:
+            self.length = 1
+            self.last_derivation_transition = None
+            self.last_non_blank_transition = None
+            self.last_non_blank_derivation = None
+            self.has_actual_suffix_form = False
+            self.has_actual_suffix_form_of_non_transition_suffix = False
+
+        if transition.suffix_form_application.actual_suffix_form:
+            self.has_actual_suffix_form = True
+            if not isinstance(suffix, FreeTransitionSuffix) and not isinstance(suffix, ZeroTransitionSuffix):
+                self.has_actual_suffix_form_of_non_transition_suffix = True
+
+        if suffix_form.form:
+            self.last_non_blank_transition = transition
+
+        if transition.is_derivational():
+            self.last_derivation_transition = transition
+            if suffix_form.form:
+                self.last_non_blank_derivation = transition
+
+            self.suffixes_since_derivation = ()
+            self.transitions_since_derivation = ()
+            self.transitions_from_derivation = (transition,)
+            self.suffix_names_since_derivation = frozenset()
+            self.suffix_groups_since_derivation = frozenset()
+        elif previous:
+            self.suffixes_since_derivation = (suffix,) + previous.suffixes_since_derivation
+            self.transitions_since_derivation = (transition,) + previous.transitions_since_derivation
+            self.transitions_from_derivation = (transition,) + previous.transitions_from_derivation
+            self.suffix_names_since_derivation = previous.suffix_names_since_derivation | {suffix.name}
+            self.suffix_groups_since_derivation = previous.suffix_groups_since_derivation | {suffix.group} if suffix.group else previous.suffix_groups_since_derivation
+        else:
+            self.suffixes_since_derivation = (suffix,)
+            self.transitions_since_derivation = (transition,)
+            self.transitions_from_derivation = (transition,)
+            self.suffix_names_since_derivation = frozenset([suffix.name])
+            self.suffix_groups_since_derivation = frozenset([suffix.group]) if suffix.group else frozenset()
+
+    def get_derivation_signature(self):
+        """
+        @return: Suffix forms applied since the last derivation, including the derivation, and the bookkeeping of
+            the chain that the conditions check. Calculated once, when it is asked first
+        @rtype: tuple
+        """
+        if self._derivation_signature is None:
+            self._derivation_signature = (
+                tuple([id(transition.suffix_form_application.suffix_form) for transition in self.transitions_from_derivation]),
+                self.last_derivation_transition is not None,
+                id(self.last_non_blank_derivation.suffix_form_application.suffix_form) if self.last_non_blank_derivation else None,
+                self.has_actual_suffix_form,
+                self.has_actual_suffix_form_of_non_transition_suffix
+            )
+        return self._derivation_signature
+
+    def to_list(self):
+        """
+        @rtype: list of Transition
+        """
+        transitions = [None] * self.length
+        node = self
+        for i in range(self.length - 1, -1, -1):
+            transitions[i] = node.transition
+            node = node.previous
+        return transitions
+
+
+_EMPTY_DERIVATION_SIGNATURE = ((), False, None, False, False)
+
 
 class MorphemeContainer(object):
+    __slots__ = ('_root', '_root_state', '_surface_so_far', '_remaining_surface', '_last_transition_node', '_transitions',
+                 '_phonetic_expectations')
+
     def __init__(self, root, root_state, remaining_surface):
         """
         @type root: Root
@@ -33,13 +143,14 @@ class MorphemeContainer(object):
         self._root_state = root_state
         self._surface_so_far = root.str
         self._remaining_surface = remaining_surface
-        self._transitions = []
+        self._last_transition_node = None
+        self._transitions = None        # list of transitions, built when asked. Never shared with the clones
         self._phonetic_expectations = root.phonetic_expectations
 
     def __str__(self):
         returnValue = '{}+{}'.format(self._root, self._root_state)
-        if self._transitions:
-            returnValue = returnValue + "+" + str(self._transitions)
+        if self._last_transition_node:
+            returnValue = returnValue + "+" + str(self.get_transitions())
 
         return returnValue
 
@@ -49,14 +160,13 @@ class MorphemeContainer(object):
     def clone(self):
         clone = MorphemeContainer(self._root, self._root_state, self._remaining_surface)
         clone._surface_so_far = self._surface_so_far
-        clone._transitions = []
-        clone._transitions.extend(self._transitions)
+        clone._last_transition_node = self._last_transition_node
         clone._phonetic_expectations = self._phonetic_expectations
         return clone
 
     def get_last_state(self):
-        if self._transitions:
-            return self._transitions[-1].to_state
+        if self._last_transition_node:
+            return self._last_transition_node.transition.to_state
         else:
             return self._root_state
 
@@ -87,35 +197,38 @@ class MorphemeContainer(object):
             return u"{}+{}".format(surface, syntactic_category)
 
     def get_stem(self):
-        if not self._transitions:
+        if not self._last_transition_node:
             return self._root.lexeme.root
 
-        indexes_of_derivational_suffixes = [i for i in range(len(self._transitions)) if self._transitions[i].is_derivational()]
+        transitions = self.get_transitions()
+        indexes_of_derivational_suffixes = [i for i in range(len(transitions)) if transitions[i].is_derivational()]
         if indexes_of_derivational_suffixes:
             index_of_last_derivational_suffix = indexes_of_derivational_suffixes[-1]
             stem_so_far = self._root.str
             for i in range(0, index_of_last_derivational_suffix + 1):
-                stem_so_far += self._transitions[i].suffix_form_application.fitting_suffix_form
+                stem_so_far += transitions[i].suffix_form_application.fitting_suffix_form
             return stem_so_far
         else:
             return self._root.lexeme.root
 
     def get_stem_syntactic_category(self):
-        if not self._transitions:
+        if not self._last_transition_node:
             return self._root.lexeme.syntactic_category
 
-        indexes_of_derivational_suffixes = [i for i in range(len(self._transitions)) if self._transitions[i].is_derivational()]
+        transitions = self.get_transitions()
+        indexes_of_derivational_suffixes = [i for i in range(len(transitions)) if transitions[i].is_derivational()]
         if indexes_of_derivational_suffixes:
             index_of_last_derivational_suffix = indexes_of_derivational_suffixes[-1]
-            return self._transitions[index_of_last_derivational_suffix].to_state.syntactic_category
+            return transitions[index_of_last_derivational_suffix].to_state.syntactic_category
         else:
             return self._root.lexeme.syntactic_category
 
     def get_stem_secondary_syntactic_category(self):
-        if not self._transitions:
+        if not self._last_transition_node:
             return self._root.lexeme.secondary_syntactic_category
 
-        indexes_of_derivational_suffixes = [i for i in range(len(self._transitions)) if self._transitions[i].is_derivational()]
+        transitions = self.get_transitions()
+        indexes_of_derivational_suffixes = [i for i in range(len(transitions)) if transitions[i].is_derivational()]
         if indexes_of_derivational_suffixes:
             return None
         else:
@@ -151,11 +264,10 @@ class MorphemeContainer(object):
             return u"{}+{}".format(lemma_root, syntactic_category)
 
     def get_last_derivation_transition(self):
-        for transition in reversed(self._transitions):
-            if transition.is_derivational():
-                return transition
-
-        return None
+        if self._last_transition_node:
+            return self._last_transition_node.last_derivation_transition
+        else:
+            return None
 
     def get_last_derivation_suffix(self):
         transition = self.get_last_derivation_transition()
@@ -165,82 +277,152 @@ class MorphemeContainer(object):
             return None
 
     def get_suffixes_since_derivation_suffix(self):
-        result = []
-        for transition in reversed(self._transitions):
-            if transition.is_derivational():
-                break
-            else:
-                result.append(transition.suffix_form_application.suffix_form.suffix)
+        if self._last_transition_node:
+            return list(self._last_transition_node.suffixes_since_derivation)
+        else:
+            return []
 
-        return result
+    def has_suffix_since_derivation_suffix(self, suffix):
+        """
+        Same as checking if the suffix is in C{get_suffixes_since_derivation_suffix}, but in constant time.
+        @type suffix: Suffix
+        @rtype: bool
+        """
+        return self._last_transition_node is not None and suffix.name in self._last_transition_node.suffix_names_since_derivation
 
     def get_transitions_since_derivation_suffix(self):
-        result = []
-        for transition in reversed(self._transitions):
-            if transition.is_derivational():
-                break
-            else:
-                result.append(transition)
+        if self._last_transition_node:
+            return list(self._last_transition_node.transitions_since_derivation)
+        else:
+            return []
 
-        return result
+    def has_any_suffix_since_derivation_suffix(self, suffix_names):
+        """
+        Same as checking if any of the suffixes with the names is in C{get_suffixes_since_derivation_suffix}, but
+        with a single set operation.
+        @type suffix_names: frozenset of str or unicode
+        @rtype: bool
+        """
+        return self._last_transition_node is not None and not self._last_transition_node.suffix_names_since_derivation.isdisjoint(suffix_names)
 
-    def get_transitions_from_derivation_suffix(self):
-        result = []
-        for transition in reversed(self._transitions):
-            if transition.is_derivational():
-                result.append(transition)
-                break
-            else:
-                result.append(transition)
+    def has_suffix_form_since_derivation_suffix(self, suffix, form_str):
+        """
+        Same as checking if any of C{get_transitions_since_derivation_suffix} is a transition with the suffix form,
+        but without creating a list.
+        @type suffix: Suffix
+        @type form_str: str or unicode
+        @rtype: bool
+        """
+        if not self.has_suffix_since_derivation_suffix(suffix):
+            return False
+
+        for transition in self._last_transition_node.transitions_since_derivation:
+            suffix_form = transition.suffix_form_application.suffix_form
+            if suffix_form.suffix==suffix and suffix_form.form==form_str:
+                return True
 
-        return result
+        return False
+
+    def get_transitions_from_derivation_suffix(self):
+        if self._last_transition_node:
+            return list(self._last_transition_node.transitions_from_derivation)
+        else:
+            return []
 
     def get_suffix_groups_since_last_derivation(self):
         return [s.group for s in self.get_suffixes_since_derivation_suffix()]
 
+    def has_suffix_group_since_last_derivation(self, suffix_group):
+        """
+        Same as checking if the group is in C{get_suffix_groups_since_last_derivation}, but in constant time.
+        @type suffix_group: SuffixGroup
+        @rtype: bool
+        """
+        return self._last_transition_node is not None and suffix_group in self._last_transition_node.suffix_groups_since_derivation
+
     def get_last_non_blank_transition(self):
-        if not self._transitions:
+        if self._last_transition_node:
+            return self._last_transition_node.last_non_blank_transition
+        else:
             return None
-        for transition in reversed(self._transitions):
-            if transition.suffix_form_application.suffix_form.form:
-                return transition
-
-        return None
 
     def get_last_non_blank_derivation(self):
-        if not self._transitions:
+        if self._last_transition_node:
+            return self._last_transition_node.last_non_blank_derivation
+        else:
             return None
-        for transition in reversed(self._transitions):
-            if transition.is_derivational() and transition.suffix_form_application.suffix_form.form:
-                return transition
 
-        return None
+    def has_actual_suffix_form_of_non_transition_suffix(self):
+        """
+        @return: True if a suffix, which is not a free or zero transition suffix, is applied with a non-empty actual
+            suffix form
+        @rtype: bool
+        """
+        return self._last_transition_node is not None and self._last_transition_node.has_actual_suffix_form_of_non_transition_suffix
+
+    def get_derivation_signature(self):
+        """
+        @return: The parts of the transitions which affect the suffixes that can be applied next, see
+            C{TransitionNode.get_derivation_signature}
+        @rtype: tuple
+        """
+        if self._last_transition_node:
+            return self._last_transition_node.get_derivation_signature()
+        else:
+            return _EMPTY_DERIVATION_SIGNATURE
 
     def get_lexeme_attributes(self):
-        if self._transitions and any(t.suffix_form_application.actual_suffix_form for t in self._transitions):
+        """
+        Same as C{get_lexeme_attribute_flags}, but returns the attributes.
+        @return: Attributes of the lexeme of the root until a suffix is applied with an actual suffix form, None if
+            there are no attributes after that
+        @rtype: set of unicode or None
+        """
+        if self._last_transition_node and self._last_transition_node.has_actual_suffix_form:
+            lexeme_attribute_flags = self.get_lexeme_attribute_flags()
+            return set(LexemeAttributeFlags.to_attributes(lexeme_attribute_flags)) if lexeme_attribute_flags else None
+        else:
+            return self._root.lexeme.attributes
+
+    def get_lexeme_attribute_flags(self):
+        """
+        @rtype: int
+        """
+        if self._last_transition_node and self._last_transition_node.has_actual_suffix_form:
             #TODO:!!!!  necessary for the case yurutemeyecekmisim !-> yurudemeyecekmisim
             if self.get_last_state().syntactic_category == SyntacticCategory.VERB and (
                 self.get_last_state().type == State.DERIVATIONAL or not self.get_last_transition().suffix_form_application.actual_suffix_form):
-                return {LexemeAttribute.NoVoicing}
+                return LexemeAttributeFlags.NoVoicing
             else:
-                return None
+                return 0
         else:
-            return self._root.lexeme.attributes
+            return LexemeAttributeFlags.to_flags(self._root.lexeme.attributes)
 
     def get_phonetic_attributes(self):
+        """
+        Same as C{get_phonetic_attribute_flags}, but returns the attributes.
+        @rtype: set of str
+        """
+        return set(PhoneticAttributeFlags.to_attributes(self.get_phonetic_attribute_flags()))
+
+    def get_phonetic_attribute_flags(self):
+        """
+        @rtype: int
+        """
         if self.has_transitions():
             suffix_so_far = self.get_surface_so_far()[len(self._root.str):]
             if not suffix_so_far or suffix_so_far.isspace() or not suffix_so_far.isalnum():
-                return self._root.phonetic_attributes
+                return self._root.phonetic_attribute_flags
             else:
-                return Phonetics.calculate_phonetic_attributes(self.get_surface_so_far(), self.get_lexeme_attributes())
+                return Phonetics.calculate_phonetic_attribute_flags(self.get_surface_so_far(), self.get_lexeme_attribute_flags())
         else:
-            return self._root.phonetic_attributes
+            return self._root.phonetic_attribute_flags
 
 
     def add_transition(self, suffix_form_application, to_state):
         last_state = self.get_last_state()
-        self._transitions.append(Transition(last_state, suffix_form_application, to_state))
+        self._last_transition_node = TransitionNode(Transition(last_state, suffix_form_application, to_state), self._last_transition_node)
+        self._transitions = None
         self._surface_so_far += suffix_form_application.actual_suffix_form
         self._remaining_surface = self._remaining_surface[len(suffix_form_application.actual_suffix_form):]
 
@@ -248,10 +430,13 @@ class MorphemeContainer(object):
             self._phonetic_expectations = []
 
     def has_transitions(self):
-        return self._transitions and True
+        return self._last_transition_node is not None
+
+    def get_transition_count(self):
+        return self._last_transition_node.length if self._last_transition_node else 0
 
     def get_last_transition(self):
-        return self._transitions[-1]
+        return self._last_transition_node.transition
 
     def get_root(self):
         return self._root
@@ -269,6 +454,8 @@ class MorphemeContainer(object):
         return self._remaining_surface
 
     def get_transitions(self):
+        if self._transitions is None:
+            self._transitions = self._last_transition_node.to_list() if self._last_transition_node else []
         return self._transitions
 
     def set_remaining_surface(self, remaining):
@@ -279,6 +466,8 @@ class MorphemeContainer(object):
 
 
 class NumeralMorphemeContainer(MorphemeContainer):
+    __slots__ = ()
+
     def __init__(self, root, root_state, remaining_surface):
         if not isinstance(root, NumeralRoot):
             raise Exception("NumeralMorphemeContainer can be initialized with a NumeralRoot. " + root)
@@ -16,10 +16,13 @@ limitations under the License.
 import copy
 from trnltk.morphology.numbers.digitconverter import DigitsToNumberConverter
 from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
-from trnltk.morphology.phonetics.phonetics import Phonetics
+from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticAttributeFlags
 from trnltk.morphology.model.lexeme import DynamicLexeme, SyntacticCategory, SecondarySyntacticCategory
 
 class Root(object):
+    # there are lots of roots in a lexicon, slots keep them small
+    __slots__ = ('str', 'lexeme', 'phonetic_expectations', 'phonetic_attribute_flags', '_hash')
+
     def __init__(self, root, lexeme, phonetic_expectations, phonetic_attributes):
         """
         @type root: unicode
@@ -30,18 +33,35 @@ class Root(object):
         self.str = root
         self.lexeme = lexeme
         self.phonetic_expectations = phonetic_expectations if phonetic_attributes else []
-        self.phonetic_attributes = phonetic_attributes if phonetic_attributes else []
+        self.phonetic_attributes = phonetic_attributes
+
+    def _get_phonetic_attributes(self):
+        if self.phonetic_attribute_flags:
+            return PhoneticAttributeFlags.to_attributes(self.phonetic_attribute_flags)
+        else:
+            return []
+
+    def _set_phonetic_attributes(self, phonetic_attributes):
+        self.phonetic_attribute_flags = PhoneticAttributeFlags.to_flags(phonetic_attributes)
+        self._hash = None
+
+    # only the flags are kept, the set of attributes is shared between the roots with the same flags
+    phonetic_attributes = property(_get_phonetic_attributes, _set_phonetic_attributes)
 
     def __eq__(self, other):
         return self.str==other.str and self.lexeme==other.lexeme\
                and self.phonetic_expectations==other.phonetic_expectations\
-        and self.phonetic_attributes==other.phonetic_attributes
+        and self.phonetic_attribute_flags==other.phonetic_attribute_flags
 
     def __hash__(self):
-        return hash((self.str,
-                     tuple(sorted(self.phonetic_expectations or [])),
-                     tuple(sorted(self.phonetic_attributes or []))
-            ))
+        # calculated once, roots are not modified after they are put into sets and maps. Phonetic attributes are the
+        # exception, setting them resets the hash
+        if self._hash is None:
+            self._hash = hash((self.str,
+                               tuple(sorted(self.phonetic_expectations or [])),
+                               tuple(sorted(self.phonetic_attributes or []))
+                ))
+        return self._hash
 
     def __str__(self):
         return u'{}({}) PH_ATTR:{} PH_EXPC:{}'.format(repr(self.str), self.lexeme, self.phonetic_attributes, self.phonetic_expectations)
@@ -57,6 +77,8 @@ class Root(object):
             copy.copy(self.phonetic_attributes) if self.phonetic_attributes else None)
 
 class DynamicRoot(Root):
+    __slots__ = ()
+
     def __init__(self, root, lexeme, phonetic_expectations, phonetic_attributes):
         """
         @type root: unicode
@@ -74,6 +96,8 @@ class DynamicRoot(Root):
             copy.copy(self.phonetic_attributes) if self.phonetic_attributes else None)
 
 class NumeralRoot(DynamicRoot):
+    __slots__ = ()
+
     def __init__(self, numeral):
         root = numeral
         lexeme = DynamicLexeme(numeral, numeral, SyntacticCategory.NUMERAL, SecondarySyntacticCategory.DIGITS, None)
@@ -85,6 +109,8 @@ class NumeralRoot(DynamicRoot):
         return NumeralRoot(self.str)
 
 class AbbreviationRoot(DynamicRoot):
+    __slots__ = ()
+
     def __init__(self, abbr):
         root = abbr
         lexeme = DynamicLexeme(abbr, abbr, SyntacticCategory.NOUN, SecondarySyntacticCategory.ABBREVIATION, None)
@@ -103,6 +129,8 @@ class AbbreviationRoot(DynamicRoot):
         return AbbreviationRoot(self.str)
 
 class ProperNounRoot(DynamicRoot):
+    __slots__ = ()
+
     def __init__(self, noun):
         root = noun
         lexeme = DynamicLexeme(noun, noun, SyntacticCategory.NOUN, SecondarySyntacticCategory.PROPER_NOUN, None)
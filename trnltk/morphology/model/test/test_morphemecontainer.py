@@ -0,0 +1,160 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory, LexemeAttribute, LexemeAttributeFlags
+from trnltk.morphology.model.morpheme import Suffix, SuffixFormApplication, SuffixGroup
+from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.root import Root
+from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticAttributeFlags
+
+class MorphemeContainerTest(unittest.TestCase):
+
+    def setUp(self):
+        root = Root(u'kitap', Lexeme(u'kitap', u'kitap', SyntacticCategory.NOUN, None, None), None, None)
+
+        self.noun_root = State(u'NOUN_ROOT', State.TRANSFER, SyntacticCategory.NOUN)
+        self.noun_with_agreement = State(u'NOUN_WITH_AGREEMENT', State.TRANSFER, SyntacticCategory.NOUN)
+        self.noun_with_possession = State(u'NOUN_WITH_POSSESSION', State.TRANSFER, SyntacticCategory.NOUN)
+        self.noun_with_case = State(u'NOUN_WITH_CASE', State.TERMINAL, SyntacticCategory.NOUN)
+
+        self.A3pl = Suffix(u'A3pl')
+        self.A3pl.add_suffix_form(u'lAr')
+        self.Pnon = Suffix(u'Pnon')
+        self.Pnon.add_suffix_form(u'')
+        self.Abl = Suffix(u'Abl')
+        self.Abl.add_suffix_form(u'dAn')
+        self.Nom = Suffix(u'Nom')
+        self.Nom.add_suffix_form(u'')
+
+        self.morpheme_container = MorphemeContainer(root, self.noun_root, u'larından')
+
+    def test_should_keep_derivation_bookkeeping(self):
+        noun_deriv = State(u'NOUN_DERIV', State.DERIVATIONAL, SyntacticCategory.NOUN)
+        adjective_root = State(u'ADJECTIVE_ROOT', State.TRANSFER, SyntacticCategory.ADJECTIVE)
+
+        agreement_group = SuffixGroup(u'Agreement')
+        A3sg = Suffix(u'A3sg', agreement_group)
+        A3sg.add_suffix_form(u'')
+        A3pl = Suffix(u'A3pl', agreement_group)
+        A3pl.add_suffix_form(u'lAr')
+        With = Suffix(u'With')
+        With.add_suffix_form(u'lI')
+
+        assert_that(self.morpheme_container.get_suffixes_since_derivation_suffix(), equal_to([]))
+        assert_that(self.morpheme_container.get_last_derivation_transition(), none())
+        assert_that(self.morpheme_container.has_suffix_since_derivation_suffix(A3pl), equal_to(False))
+
+        self.morpheme_container.add_transition(SuffixFormApplication(A3sg.suffix_forms[0], u'', u''), self.noun_with_agreement)
+        self.morpheme_container.add_transition(SuffixFormApplication(self.Pnon.suffix_forms[0], u'', u''), noun_deriv)
+
+        assert_that(self.morpheme_container.get_suffixes_since_derivation_suffix(), equal_to([self.Pnon, A3sg]))
+        assert_that(self.morpheme_container.get_suffix_groups_since_last_derivation(), equal_to([None, agreement_group]))
+        assert_that(self.morpheme_container.has_suffix_group_since_last_derivation(agreement_group), equal_to(True))
+        assert_that(self.morpheme_container.has_suffix_since_derivation_suffix(A3sg), equal_to(True))
+        assert_that(self.morpheme_container.has_suffix_since_derivation_suffix(A3pl), equal_to(False))
+        assert_that(self.morpheme_container.get_lexeme_attributes(), equal_to(self.morpheme_container.get_root().lexeme.attributes))
+
+        self.morpheme_container.add_transition(SuffixFormApplication(With.suffix_forms[0], u'lı', u'lı'), adjective_root)
+
+        with_transition = self.morpheme_container.get_last_transition()
+        assert_that(self.morpheme_container.get_suffixes_since_derivation_suffix(), equal_to([]))
+        assert_that(self.morpheme_container.get_transitions_since_derivation_suffix(), equal_to([]))
+        assert_that(self.morpheme_container.get_transitions_from_derivation_suffix(), equal_to([with_transition]))
+        assert_that(self.morpheme_container.get_last_derivation_transition(), same_instance(with_transition))
+        assert_that(self.morpheme_container.get_last_derivation_suffix(), same_instance(With))
+        assert_that(self.morpheme_container.get_last_non_blank_derivation(), same_instance(with_transition))
+        assert_that(self.morpheme_container.has_suffix_group_since_last_derivation(agreement_group), equal_to(False))
+        assert_that(self.morpheme_container.get_lexeme_attributes(), none())
+
+        self.morpheme_container.add_transition(SuffixFormApplication(A3sg.suffix_forms[0], u'', u''), self.noun_with_agreement)
+
+        assert_that(self.morpheme_container.get_suffixes_since_derivation_suffix(), equal_to([A3sg]))
+        assert_that(self.morpheme_container.get_transitions_from_derivation_suffix(), equal_to([self.morpheme_container.get_last_transition(), with_transition]))
+        assert_that(self.morpheme_container.get_last_derivation_transition(), same_instance(with_transition))
+        assert_that(self.morpheme_container.get_last_non_blank_transition(), same_instance(with_transition))
+
+    def test_should_return_attributes_of_flags(self):
+        verb_root = State(u'VERB_ROOT', State.TRANSFER, SyntacticCategory.VERB)
+        verb_deriv = State(u'VERB_DERIV', State.DERIVATIONAL, SyntacticCategory.VERB)
+        Neg = Suffix(u'Neg')
+        Neg.add_suffix_form(u'mA')
+
+        root = Root(u'yürü', Lexeme(u'yürümek', u'yürü', SyntacticCategory.VERB, None, {LexemeAttribute.Aorist_I}), None, None)
+        morpheme_container = MorphemeContainer(root, verb_root, u'me')
+        assert_that(morpheme_container.get_lexeme_attributes(), same_instance(root.lexeme.attributes))
+        assert_that(morpheme_container.get_lexeme_attribute_flags(), equal_to(LexemeAttributeFlags.Aorist_I))
+
+        morpheme_container.add_transition(SuffixFormApplication(Neg.suffix_forms[0], u'me', u'me'), verb_deriv)
+        assert_that(morpheme_container.get_lexeme_attributes(), equal_to({LexemeAttribute.NoVoicing}))
+        assert_that(morpheme_container.get_lexeme_attribute_flags(), equal_to(LexemeAttributeFlags.NoVoicing))
+        assert_that(morpheme_container.get_phonetic_attributes(), equal_to(Phonetics.calculate_phonetic_attributes(u'yürüme', {LexemeAttribute.NoVoicing})))
+        assert_that(morpheme_container.get_phonetic_attributes(),
+            equal_to(set(PhoneticAttributeFlags.to_attributes(morpheme_container.get_phonetic_attribute_flags()))))
+
+    def test_should_add_transitions(self):
+        assert_that(self.morpheme_container.has_transitions(), equal_to(False))
+        assert_that(self.morpheme_container.get_transitions(), equal_to([]))
+        assert_that(self.morpheme_container.get_last_state(), same_instance(self.noun_root))
+
+        self.morpheme_container.add_transition(SuffixFormApplication(self.A3pl.suffix_forms[0], u'lar', u'lar'), self.noun_with_agreement)
+        self.morpheme_container.add_transition(SuffixFormApplication(self.Pnon.suffix_forms[0], u'', u''), self.noun_with_possession)
+
+        assert_that(self.morpheme_container.has_transitions(), equal_to(True))
+        assert_that([t.to_state for t in self.morpheme_container.get_transitions()], equal_to([self.noun_with_agreement, self.noun_with_possession]))
+        assert_that(self.morpheme_container.get_transitions()[1].from_state, same_instance(self.noun_with_agreement))
+        assert_that(self.morpheme_container.get_last_transition().to_state, same_instance(self.noun_with_possession))
+        assert_that(self.morpheme_container.get_last_non_blank_transition().to_state, same_instance(self.noun_with_agreement))
+        assert_that(self.morpheme_container.get_surface_so_far(), equal_to(u'kitaplar'))
+        assert_that(self.morpheme_container.get_remaining_surface(), equal_to(u'ından'))
+
+    def test_should_share_transitions_with_clones(self):
+        self.morpheme_container.add_transition(SuffixFormApplication(self.A3pl.suffix_forms[0], u'lar', u'lar'), self.noun_with_agreement)
+
+        clone_1 = self.morpheme_container.clone()
+        clone_2 = self.morpheme_container.clone()
+        clone_1.add_transition(SuffixFormApplication(self.Pnon.suffix_forms[0], u'', u''), self.noun_with_possession)
+        clone_1.add_transition(SuffixFormApplication(self.Abl.suffix_forms[0], u'dan', u'dan'), self.noun_with_case)
+        clone_2.add_transition(SuffixFormApplication(self.Nom.suffix_forms[0], u'', u''), self.noun_with_case)
+
+        assert_that(self.morpheme_container.get_transitions(), has_length(1))
+        assert_that(clone_1.get_transitions(), has_length(3))
+        assert_that(clone_2.get_transitions(), has_length(2))
+
+        assert_that(clone_1.get_transitions()[0], same_instance(self.morpheme_container.get_transitions()[0]))
+        assert_that(clone_2.get_transitions()[0], same_instance(self.morpheme_container.get_transitions()[0]))
+
+        assert_that(self.morpheme_container.get_surface_so_far(), equal_to(u'kitaplar'))
+        assert_that(clone_1.get_surface_so_far(), equal_to(u'kitaplardan'))
+        assert_that(clone_2.get_last_state(), same_instance(self.noun_with_case))
+        assert_that(clone_1.get_suffixes_since_derivation_suffix(), equal_to([self.Abl, self.Pnon, self.A3pl]))
+
+    def test_should_not_share_transition_list_with_clones(self):
+        self.morpheme_container.add_transition(SuffixFormApplication(self.A3pl.suffix_forms[0], u'lar', u'lar'), self.noun_with_agreement)
+        self.morpheme_container.add_transition(SuffixFormApplication(self.Pnon.suffix_forms[0], u'', u''), self.noun_with_possession)
+        assert_that(self.morpheme_container.get_transitions(), has_length(2))
+
+        clone = self.morpheme_container.clone()
+        clone.get_transitions().pop()
+
+        assert_that(clone.get_transitions(), has_length(1))
+        assert_that(self.morpheme_container.get_transitions(), has_length(2))
+        assert_that(self.morpheme_container.clone().get_transitions(), has_length(2))
+
+if __name__ == '__main__':
+    unittest.main()
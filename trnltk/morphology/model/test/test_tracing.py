@@ -0,0 +1,81 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import unittest
+from hamcrest import *
+from mock import patch
+from trnltk.morphology.model.tracing import get_tracer, set_tracer, tracing, NO_OP_TRACER, RecordingTracer, LoggingTracer, TraceEvent
+
+class TracingTest(unittest.TestCase):
+
+    def tearDown(self):
+        set_tracer(None)
+
+    def test_should_use_no_op_tracer_by_default(self):
+        assert_that(get_tracer(), same_instance(NO_OP_TRACER))
+        assert_that(get_tracer().enabled, equal_to(False))
+
+        get_tracer().trace('parser', 'something')
+
+    def test_should_use_tracer_in_block(self):
+        with tracing(RecordingTracer()) as tracer:
+            assert_that(get_tracer(), same_instance(tracer))
+            get_tracer().trace('parser', 'parse_started', input=u'kitap')
+
+            with tracing(RecordingTracer()) as inner_tracer:
+                assert_that(get_tracer(), same_instance(inner_tracer))
+            assert_that(get_tracer(), same_instance(tracer))
+
+        assert_that(get_tracer(), same_instance(NO_OP_TRACER))
+
+        assert_that(tracer.events, has_length(1))
+        assert_that(tracer.events[0].source, equal_to('parser'))
+        assert_that(tracer.events[0].name, equal_to('parse_started'))
+        assert_that(tracer.events[0].fields, equal_to({'input': u'kitap'}))
+
+    def test_should_record_events_of_sources(self):
+        tracer = RecordingTracer(sources=['parser'])
+        tracer.trace('parser', 'parse_started', input=u'kitap')
+        tracer.trace('suffixapplier', 'suffix_form_applied')
+        tracer.trace('parser', 'result_found')
+
+        assert_that([event.name for event in tracer.get_events()], equal_to(['parse_started', 'result_found']))
+        assert_that(tracer.get_events('result_found'), has_length(1))
+
+        tracer.clear()
+        assert_that(tracer.get_events(), equal_to([]))
+
+    def test_should_format_event(self):
+        event = TraceEvent('parser', 'roots_found', {'partial_input': u'kitabı', 'roots': [1, u'ç']})
+        assert_that(unicode(event), equal_to(u'parser.roots_found(partial_input=kitabı, roots=[1, ç])'))
+
+    @patch('trnltk.morphology.model.tracing.logging')
+    def test_should_log_events_only_if_debug_is_enabled(self, mock_logging):
+        mock_logger = mock_logging.getLogger.return_value
+        mock_logger.isEnabledFor.return_value = False
+
+        tracer = LoggingTracer()
+        tracer.trace('parser', 'parse_started', input=u'kitap')
+        mock_logging.getLogger.assert_called_with('parser')
+        assert_that(mock_logger.debug.called, equal_to(False))
+
+        mock_logger.isEnabledFor.return_value = True
+        tracer.trace('parser', 'parse_started', input=u'kitap')
+        mock_logger.debug.assert_called_with(u'%s', u'parser.parse_started(input=kitap)')
+
+if __name__ == '__main__':
+    unittest.main()
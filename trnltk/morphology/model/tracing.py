@@ -0,0 +1,188 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from contextlib import contextmanager
+import logging
+import threading
+
+class TraceEvent(object):
+    """
+    A structured event emitted by the parsers and the likelihood calculators.
+
+    Fields are kept as they are, e.g. morpheme containers or numpy arrays; they are formatted only when the event
+    is converted to a string.
+    """
+
+    def __init__(self, source, name, fields):
+        """
+        @param source: Name of the emitting component, same as the name of its logger
+        @type source: str
+        @type name: str
+        @type fields: dict
+        """
+        self.source = source
+        self.name = name
+        self.fields = fields
+
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+    def __unicode__(self):
+        fields_str = u', '.join([u'{}={}'.format(key, _format_field(self.fields[key])) for key in sorted(self.fields.keys())])
+        return u'{}.{}({})'.format(self.source, self.name, fields_str)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Tracer(object):
+    """
+    Receives the trace events. This one is a no-op and it is the default tracer.
+
+    Emitters check C{enabled} before creating an event, so a disabled tracer costs a single attribute lookup and
+    no formatting is ever done for it.
+    """
+
+    enabled = False
+
+    def trace(self, source, name, **fields):
+        """
+        @param source: Name of the emitting component, same as the name of its logger
+        @type source: str
+        @param name: Name of the event
+        @type name: str
+        """
+        pass
+
+
+NO_OP_TRACER = Tracer()
+
+
+class EventTracer(Tracer):
+    """
+    Creates a C{TraceEvent} for each trace and passes it to the sink.
+    """
+
+    enabled = True
+
+    def __init__(self, sink, sources=None):
+        """
+        @param sink: Function which receives the events
+        @type sink: function
+        @param sources: Sources to accept the events from. None for all sources
+        @type sources: collection of str or None
+        """
+        self._sink = sink
+        self._sources = frozenset(sources) if sources is not None else None
+
+    def trace(self, source, name, **fields):
+        if self._sources is None or source in self._sources:
+            self._sink(TraceEvent(source, name, fields))
+
+
+class RecordingTracer(EventTracer):
+    """
+    Keeps the events in memory, e.g. for examining a single parse.
+    """
+
+    def __init__(self, sources=None):
+        """
+        @type sources: collection of str or None
+        """
+        self.events = []
+        super(RecordingTracer, self).__init__(self.events.append, sources)
+
+    def get_events(self, name=None):
+        """
+        @param name: Name of the events to return. None for all events
+        @type name: str or None
+        @rtype: list of TraceEvent
+        """
+        if name is None:
+            return list(self.events)
+        return [event for event in self.events if event.name==name]
+
+    def clear(self):
+        del self.events[:]
+
+
+class LoggingTracer(EventTracer):
+    """
+    Writes the events to the debug log of the logger of their sources, e.g. events of the parser go to the logger
+    'parser'. Events are formatted only if the logger is enabled for debug.
+    """
+
+    def __init__(self, sources=None):
+        """
+        @type sources: collection of str or None
+        """
+        super(LoggingTracer, self).__init__(_log_event, sources)
+
+
+_tracer_of_thread = threading.local()
+
+def get_tracer():
+    """
+    @return: The tracer of the current thread, the no-op tracer if none is set
+    @rtype: Tracer
+    """
+    return getattr(_tracer_of_thread, 'tracer', NO_OP_TRACER)
+
+def set_tracer(tracer):
+    """
+    Sets the tracer of the current thread.
+    @param tracer: None for the no-op tracer
+    @type tracer: Tracer or None
+    @return: The previous tracer
+    @rtype: Tracer
+    """
+    previous = get_tracer()
+    _tracer_of_thread.tracer = tracer or NO_OP_TRACER
+    return previous
+
+@contextmanager
+def tracing(tracer):
+    """
+    Uses the tracer for the work done in the block, e.g. for a single request:
+
+        with tracing(RecordingTracer()) as tracer:
+            parser.parse(u'kitaplar')
+        print tracer.get_events()
+    @type tracer: Tracer
+    """
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def _log_event(event):
+    logger = logging.getLogger(event.source)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(u'%s', unicode(event))
+
+def _format_field(value):
+    if isinstance(value, unicode):
+        return value
+    elif isinstance(value, (list, tuple)):
+        return u'[' + u', '.join([_format_field(item) for item in value]) + u']'
+    elif isinstance(value, str):
+        return value.decode('utf-8', 'replace')
+    else:
+        try:
+            return unicode(value)
+        except UnicodeDecodeError:
+            return str(value).decode('utf-8', 'replace')
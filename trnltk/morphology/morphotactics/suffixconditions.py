@@ -21,6 +21,17 @@ class Specification(object):
     def is_satisfied_by(self, obj):
         raise NotImplementedError( "Should have implemented this" )
 
+    def compile(self):
+        """
+        Creates a predicate which gives the same result with C{is_satisfied_by} for a morpheme container.
+
+        Compiled predicates don't walk the specification tree and use the derivation bookkeeping of the morpheme
+        container instead of the transition lists. Specifications which cannot be compiled are interpreted.
+        @return: Function (morpheme container) -> bool
+        @rtype: function
+        """
+        return self.is_satisfied_by
+
     def __or__(self, other):
         return OrSpecification([self,other])
 
@@ -47,6 +58,23 @@ class AndSpecification(Specification):
 
         return True
 
+    def compile(self):
+        specifications = _flatten(self._specifications, AndSpecification, AlwaysTrueSpecification)
+        if any(isinstance(specification, AlwaysFalseSpecification) for specification in specifications):
+            return _always_false
+
+        predicates = [specification.compile() for specification in specifications]
+        if not predicates:
+            return _always_true
+        elif len(predicates)==1:
+            return predicates[0]
+        elif len(predicates)==2:
+            first, second = predicates
+            return lambda obj: first(obj) and second(obj)
+        else:
+            predicates = tuple(predicates)
+            return lambda obj: all(predicate(obj) for predicate in predicates)
+
     def __str__(self):
         return u' & '.join([unicode(c) for c in self._specifications])
 
@@ -64,6 +92,29 @@ class OrSpecification(Specification):
 
         return False
 
+    def compile(self):
+        specifications = _flatten(self._specifications, OrSpecification, AlwaysFalseSpecification)
+        if any(isinstance(specification, AlwaysTrueSpecification) for specification in specifications):
+            return _always_true
+
+        suffixes_since_derivation = _get_suffixes_since_derivation(specifications)
+        if suffixes_since_derivation:
+            # e.g. followed_by_one_from_group(...) is a single set check
+            suffix_names = frozenset(suffix.name for suffix in suffixes_since_derivation)
+            return lambda obj: obj.has_any_suffix_since_derivation_suffix(suffix_names)
+
+        predicates = [specification.compile() for specification in specifications]
+        if not predicates:
+            return _always_false
+        elif len(predicates)==1:
+            return predicates[0]
+        elif len(predicates)==2:
+            first, second = predicates
+            return lambda obj: first(obj) or second(obj)
+        else:
+            predicates = tuple(predicates)
+            return lambda obj: any(predicate(obj) for predicate in predicates)
+
     def __str__(self):
         return u' | '.join([unicode(c) for c in self._specifications])
 
@@ -77,6 +128,13 @@ class NotSpecification(Specification):
     def is_satisfied_by(self, obj):
         return not self._wrapped.is_satisfied_by(obj)
 
+    def compile(self):
+        if isinstance(self._wrapped, NotSpecification):
+            return self._wrapped._wrapped.compile()
+
+        predicate = self._wrapped.compile()
+        return lambda obj: not predicate(obj)
+
     def __str__(self):
         return u'~{}'.format(unicode(self._wrapped))
 
@@ -87,6 +145,9 @@ class AlwaysFalseSpecification(Specification):
     def is_satisfied_by(self, obj):
         return False
 
+    def compile(self):
+        return _always_false
+
     def __str__(self):
         return u'False'
 
@@ -97,6 +158,9 @@ class AlwaysTrueSpecification(Specification):
     def is_satisfied_by(self, obj):
         return True
 
+    def compile(self):
+        return _always_true
+
     def __str__(self):
         return u'True'
 
@@ -129,6 +193,14 @@ class HasSuffixFormSinceLastDerivation(Specification):
         else:
             return self._suffix in suffixes_since_derivation_suffix
 
+    def compile(self):
+        suffix = self._suffix
+        form_str = self._form_str
+        if form_str is not None:
+            return lambda morpheme_container: morpheme_container.has_suffix_form_since_derivation_suffix(suffix, form_str)
+        else:
+            return lambda morpheme_container: morpheme_container.has_suffix_since_derivation_suffix(suffix)
+
     def __str__(self):
         if self._form_str is not None:
             return u'has_suffix_form_since_last_deriv({}[{}])'.format(self._suffix, self._form_str)
@@ -158,6 +230,23 @@ class HasSuffixFormAsLastDerivation(Specification):
         else:
             return last_derivation_transition.suffix_form_application.suffix_form.suffix==self._suffix
 
+    def compile(self):
+        suffix = self._suffix
+        form_str = self._form_str
+
+        def predicate(morpheme_container):
+            last_derivation_transition = morpheme_container.get_last_derivation_transition()
+            if not last_derivation_transition:
+                return False
+
+            suffix_form = last_derivation_transition.suffix_form_application.suffix_form
+            if form_str:
+                return suffix_form.suffix==suffix and suffix_form.form==form_str
+            else:
+                return suffix_form.suffix==suffix
+
+        return predicate
+
     def __str__(self):
         if self._form_str:
             return u'has_suffix_form_as_last_deriv({}[{}])'.format(self._suffix, self._form_str)
@@ -178,6 +267,10 @@ class AppliesToRoot(Specification):
             return False
         return morpheme_container.get_root().str==self._root_str
 
+    def compile(self):
+        root_str = self._root_str
+        return lambda morpheme_container: morpheme_container.get_root().str==root_str
+
     def __str__(self):
         return u'applies_to_root({})'.format(self._root_str)
 
@@ -199,6 +292,10 @@ class LastSuffixGoesToState(Specification):
 
         return morpheme_container.get_last_transition().to_state.type==self._state_type
 
+    def compile(self):
+        state_type = self._state_type
+        return lambda morpheme_container: morpheme_container.has_transitions() and morpheme_container.get_last_transition().to_state.type==state_type
+
     def __str__(self):
         return u'suffix_goes_to({})'.format(self._state_type)
 
@@ -228,6 +325,24 @@ class HasLexemeAttributes(Specification):
 
         return all(r in morpheme_container.get_root().lexeme.attributes for r in self._lexeme_attrs)
 
+    def compile(self):
+        lexeme_attrs = tuple(self._lexeme_attrs)
+
+        def predicate(morpheme_container):
+            if morpheme_container.has_actual_suffix_form_of_non_transition_suffix():
+                return True
+
+            attributes = morpheme_container.get_root().lexeme.attributes
+            if not attributes:
+                return False
+
+            for lexeme_attr in lexeme_attrs:
+                if lexeme_attr not in attributes:
+                    return False
+            return True
+
+        return predicate
+
     def __str__(self):
         return u'has_lexeme_attributes({})'.format(self._lexeme_attrs)
 
@@ -256,6 +371,24 @@ class DoesntHaveLexemeAttributes(Specification):
 
         return not any(r in morpheme_container.get_root().lexeme.attributes for r in self._lexeme_attrs)
 
+    def compile(self):
+        lexeme_attrs = tuple(self._lexeme_attrs)
+
+        def predicate(morpheme_container):
+            if morpheme_container.has_actual_suffix_form_of_non_transition_suffix():
+                return True
+
+            attributes = morpheme_container.get_root().lexeme.attributes
+            if not attributes:
+                return True
+
+            for lexeme_attr in lexeme_attrs:
+                if lexeme_attr in attributes:
+                    return False
+            return True
+
+        return predicate
+
     def __str__(self):
         return u'doesnt_have_lexeme_attributes({})'.format(self._lexeme_attrs)
 
@@ -272,6 +405,10 @@ class RootHasSecondarySyntacticCategory(Specification):
             return False
         return morpheme_container.get_root().lexeme.secondary_syntactic_category==self._secondary_syntactic_category
 
+    def compile(self):
+        secondary_syntactic_category = self._secondary_syntactic_category
+        return lambda morpheme_container: morpheme_container.get_root().lexeme.secondary_syntactic_category==secondary_syntactic_category
+
     def __str__(self):
         return u'root_has_secondary_syntactic_category({})'.format(self._secondary_syntactic_category)
 
@@ -303,6 +440,23 @@ class HasLastNonBlankDerivation(Specification):
         else:
             return self._suffix==last_non_blank_derivation.suffix_form_application.suffix_form.suffix
 
+    def compile(self):
+        suffix = self._suffix
+        form_str = self._form_str
+
+        def predicate(morpheme_container):
+            last_non_blank_derivation = morpheme_container.get_last_non_blank_derivation()
+            if not last_non_blank_derivation:
+                return False
+
+            suffix_form = last_non_blank_derivation.suffix_form_application.suffix_form
+            if form_str is not None:
+                return suffix==suffix_form.suffix and form_str==suffix_form.form
+            else:
+                return suffix==suffix_form.suffix
+
+        return predicate
+
     def __str__(self):
         if self._form_str is not None:
             return u'has_last_non_blank_derivation({}[{}])'.format(self._suffix, self._form_str)
@@ -312,6 +466,38 @@ class HasLastNonBlankDerivation(Specification):
     def __repr__(self):
         return self.__str__()
 
+def _always_true(obj):
+    return True
+
+def _always_false(obj):
+    return False
+
+def _flatten(specifications, composite_class, neutral_class):
+    """
+    Lifts the specifications of the nested composites of the same type and drops the ones which don't affect the
+    result, e.g. (a | (b | c)) | False becomes a | b | c.
+    """
+    flattened = []
+    for specification in specifications:
+        if type(specification) is composite_class:
+            flattened.extend(_flatten(specification._specifications, composite_class, neutral_class))
+        elif not isinstance(specification, neutral_class):
+            flattened.append(specification)
+    return flattened
+
+def _get_suffixes_since_derivation(specifications):
+    """
+    @return: Suffixes if all of the specifications check a suffix without a form since the last derivation,
+        None otherwise
+    @rtype: list of Suffix or None
+    """
+    suffixes = []
+    for specification in specifications:
+        if type(specification) is not HasSuffixFormSinceLastDerivation or specification._form_str is not None:
+            return None
+        suffixes.append(specification._suffix)
+    return suffixes
+
 ########### preconditions
 def doesnt(condition):
     return ~condition
@@ -15,6 +15,8 @@ limitations under the License.
 """
 from trnltk.morphology.model.graphmodel import State
 from trnltk.morphology.model.morpheme import Suffix, ZeroTransitionSuffix, FreeTransitionSuffix
+from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
+from trnltk.morphology.phonetics.phonetics import Phonetics
 
 class EmptySuffixGraph(object):
     def __init__(self):
@@ -43,6 +45,9 @@ class EmptySuffixGraph(object):
     def get_all_states(self):
         return None
 
+    def get_all_suffixes(self):
+        return None
+
     def find_state(self, name):
         return None
 
@@ -55,6 +60,17 @@ class EmptySuffixGraph(object):
     def get_suffix(self, name):
         return None
 
+    def get_outputs_for_surface(self, state, surface):
+        """
+        @param state: State to get the outputs of
+        @type state: State
+        @param surface: Remaining surface to parse
+        @type surface: unicode
+        @return: Outputs of the state that can be applied to the surface. All outputs by default
+        @rtype: list or tuple of tuple (suffix, out_state)
+        """
+        return state.outputs
+
 
 class SuffixGraphDecorator(EmptySuffixGraph):
     def __init__(self, decorated):
@@ -71,6 +87,18 @@ class SuffixGraphDecorator(EmptySuffixGraph):
         self.register_suffixes()
         self.create_suffix_edges()
 
+        self.compile_suffix_forms()
+
+    def compile_suffix_forms(self):
+        """
+        Calculates the surface realizations and compiles the conditions of the suffix forms of the suffixes
+        registered in this decorator. Thus, suffix forms are not interpreted every time they are tried while parsing.
+        """
+        for suffix in self.all_suffixes.itervalues():
+            for suffix_form in suffix.suffix_forms:
+                suffix_form.realizations = Phonetics.compile_suffix_form(suffix_form.form)
+                suffix_form.compile_conditions()
+
     def get_default_root_state(self, root):
         state = self._find_default_root_state(root)
         if not state:
@@ -84,6 +112,18 @@ class SuffixGraphDecorator(EmptySuffixGraph):
     def get_all_states(self):
         return (self._decorated.get_all_states() or []) + self.all_states.values()
 
+    def get_all_suffixes(self):
+        return (self._decorated.get_all_suffixes() or []) + self.all_suffixes.values()
+
+    def freeze(self):
+        """
+        Flattens the decorator chain into a single graph. Must be called after C{initialize}.
+
+        States and suffixes of the returned graph can't be modified anymore.
+        @rtype: FrozenSuffixGraph
+        """
+        return FrozenSuffixGraph(self)
+
     def find_state(self, name):
         state_from_decorated = self._decorated.find_state(name)
         state_from_self = self.all_states[name] if self.all_states.has_key(name) else None
@@ -140,3 +180,149 @@ class SuffixGraphDecorator(EmptySuffixGraph):
             raise Exception(u'Suffix {} already exists in decorated or self!'.format(name))
         self.all_suffixes[name] = suffix
         return suffix
+
+
+class FrozenSuffixGraph(EmptySuffixGraph):
+    """
+    A compiled suffix graph, created by C{SuffixGraphDecorator.freeze}.
+
+    States and suffixes of all decorators are collected into flat tables, which are indexed by integer ids.
+    Every state and suffix gets its id in the table, thus a lookup doesn't go through the decorator chain.
+    Outputs of the states are converted to tuples.
+
+    Outputs of each state are also indexed by the first surface characters they can produce, see
+    C{get_outputs_for_surface}.
+    """
+
+    def __init__(self, suffix_graph):
+        """
+        @param suffix_graph: Initialized suffix graph to freeze
+        @type suffix_graph: SuffixGraphDecorator
+        """
+        EmptySuffixGraph.__init__(self)
+        self._suffix_graph = suffix_graph
+
+        self._states = tuple(suffix_graph.get_all_states())
+        self._suffixes = tuple(suffix_graph.get_all_suffixes())
+
+        self._state_ids = dict()
+        self._suffix_ids = dict()
+
+        for id, state in enumerate(self._states):
+            state.freeze(id)
+            self._state_ids[state.name] = id
+
+        for id, suffix in enumerate(self._suffixes):
+            suffix.id = id
+            self._suffix_ids[suffix.name] = id
+
+        self._zero_length_outputs = []       # state id -> outputs that can be applied without consuming surface
+        self._outputs_by_first_char = []     # state id -> {first char -> outputs}
+        for state in self._states:
+            self._index_outputs(state)
+
+    def _index_outputs(self, state):
+        first_chars_of_suffixes = {}
+        zero_length_suffixes = set()
+        for suffix in set([suffix for (suffix, to_state) in state.outputs]):
+            first_chars, zero_length = self._get_first_chars(suffix)
+            first_chars_of_suffixes[suffix] = first_chars
+            if zero_length:
+                zero_length_suffixes.add(suffix)
+
+        all_first_chars = set()
+        for first_chars in first_chars_of_suffixes.itervalues():
+            all_first_chars.update(first_chars)
+
+        # keep the order of the outputs, since the order of the parse results depends on it
+        self._zero_length_outputs.append(tuple([output for output in state.outputs if output[0] in zero_length_suffixes]))
+
+        outputs_by_first_char = {}
+        for first_char in all_first_chars:
+            outputs_by_first_char[first_char] = tuple([output for output in state.outputs
+                                                       if output[0] in zero_length_suffixes or first_char in first_chars_of_suffixes[output[0]]])
+        self._outputs_by_first_char.append(outputs_by_first_char)
+
+    def _get_first_chars(self, suffix):
+        first_chars = set()
+        zero_length = False
+        for suffix_form in suffix.suffix_forms:
+            realizations = suffix_form.realizations or Phonetics.compile_suffix_form(suffix_form.form)
+            for fitting_suffix_form, voicing_possible in realizations.itervalues():
+                if not fitting_suffix_form:
+                    zero_length = True
+                    continue
+
+                first_chars.add(fitting_suffix_form[0])
+                if len(fitting_suffix_form) == 1:
+                    # a single letter realization might be voiced at the end of the surface, e.g. k is matched with the voiced letter
+                    voiced_letter = TurkishAlphabet.voice(TurkishAlphabet.get_letter_for_char(fitting_suffix_form))
+                    if voiced_letter:
+                        first_chars.add(voiced_letter.char_value)
+
+        return first_chars, zero_length
+
+    def initialize(self):
+        raise Exception(u'Frozen suffix graph is already initialized')
+
+    def get_default_root_state(self, root):
+        return self._suffix_graph.get_default_root_state(root)
+
+    def _find_default_root_state(self, root):
+        return self._suffix_graph._find_default_root_state(root)
+
+    def get_all_states(self):
+        return list(self._states)
+
+    def get_all_suffixes(self):
+        return list(self._suffixes)
+
+    def find_state(self, name):
+        id = self._state_ids.get(name)
+        return self._states[id] if id is not None else None
+
+    def get_state(self, name):
+        id = self._state_ids.get(name)
+        if id is None:
+            raise Exception(u'State {} not found'.format(name))
+        return self._states[id]
+
+    def get_state_by_id(self, id):
+        """
+        @type id: int
+        @rtype: State
+        """
+        return self._states[id]
+
+    def find_suffix(self, name):
+        id = self._suffix_ids.get(name)
+        return self._suffixes[id] if id is not None else None
+
+    def get_suffix(self, name):
+        id = self._suffix_ids.get(name)
+        if id is None:
+            raise Exception(u'Suffix {} not found'.format(name))
+        return self._suffixes[id]
+
+    def get_suffix_by_id(self, id):
+        """
+        @type id: int
+        @rtype: Suffix
+        """
+        return self._suffixes[id]
+
+    def get_outputs_for_surface(self, state, surface):
+        """
+        Returns only the outputs of the state whose suffixes have a realization that can be the start of the
+        surface, or that can be applied without consuming any surface.
+        @type state: State
+        @type surface: unicode
+        @rtype: tuple of tuple (suffix, out_state)
+        """
+        if not surface:
+            return self._zero_length_outputs[state.id]
+
+        outputs = self._outputs_by_first_char[state.id].get(surface[0])
+        if outputs is None:
+            return self._zero_length_outputs[state.id]
+        return outputs
@@ -0,0 +1,256 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.phonetics.phonetics import Phonetics
+
+class SuffixGraphAnalysis(object):
+    """
+    Analyzes an initialized suffix graph to find out, for every state,
+        - if a terminal state is reachable
+        - the minimum and maximum surface length that can be consumed until a terminal state
+        - the zero length paths to terminal states
+
+    Conditions of the suffix forms are not considered, thus the results are bounds: a morpheme container which
+    doesn't fit them can never be a parse result, but one which fits might not be either.
+
+    Traversal stops at terminal states, thus the outputs of the terminal states are not considered.
+    """
+
+    def __init__(self, suffix_graph):
+        """
+        @param suffix_graph: Initialized suffix graph
+        @type suffix_graph: EmptySuffixGraph
+        """
+        self._states = suffix_graph.get_all_states() or []
+
+        self._suffix_length_ranges = {}     # suffix -> (min length, max length)
+        self._terminable_states = set()
+        self._min_lengths = {}              # state -> min length, only for terminable states
+        self._max_lengths = {}              # state -> max length or None if unbounded, only for terminable states
+        self._zero_length_paths = {}        # state -> zero length paths, calculated when asked
+
+        for state in self._states:
+            for (suffix, to_state) in state.outputs:
+                if not self._suffix_length_ranges.has_key(suffix):
+                    self._suffix_length_ranges[suffix] = self._calculate_suffix_length_range(suffix)
+
+        self._find_terminable_states()
+        self._calculate_min_lengths()
+        self._calculate_max_lengths()
+
+    def _calculate_suffix_length_range(self, suffix):
+        lengths = set()
+        for suffix_form in suffix.suffix_forms:
+            realizations = suffix_form.realizations or Phonetics.compile_suffix_form(suffix_form.form)
+            for fitting_suffix_form, voicing_possible in realizations.itervalues():
+                lengths.add(len(fitting_suffix_form))
+
+        if not lengths:
+            return None
+
+        return min(lengths), max(lengths)
+
+    def _get_traversable_outputs(self, state):
+        if state.type == State.TERMINAL:
+            return []
+        return [(suffix, to_state) for (suffix, to_state) in state.outputs if self._suffix_length_ranges[suffix]]
+
+    def _find_terminable_states(self):
+        self._terminable_states = set([state for state in self._states if state.type == State.TERMINAL])
+
+        changed = True
+        while changed:
+            changed = False
+            for state in self._states:
+                if state in self._terminable_states:
+                    continue
+                for (suffix, to_state) in self._get_traversable_outputs(state):
+                    if to_state in self._terminable_states:
+                        self._terminable_states.add(state)
+                        changed = True
+                        break
+
+    def _get_terminable_outputs(self, state):
+        return [(suffix, to_state) for (suffix, to_state) in self._get_traversable_outputs(state) if to_state in self._terminable_states]
+
+    def _calculate_min_lengths(self):
+        for state in self._terminable_states:
+            self._min_lengths[state] = 0 if state.type == State.TERMINAL else None
+
+        changed = True
+        while changed:
+            changed = False
+            for state in self._terminable_states:
+                for (suffix, to_state) in self._get_terminable_outputs(state):
+                    if self._min_lengths[to_state] is None:
+                        continue
+                    length = self._suffix_length_ranges[suffix][0] + self._min_lengths[to_state]
+                    if self._min_lengths[state] is None or length < self._min_lengths[state]:
+                        self._min_lengths[state] = length
+                        changed = True
+
+    def _calculate_max_lengths(self):
+        for state in self._terminable_states:
+            self._max_lengths[state] = 0 if state.type == State.TERMINAL else None
+
+        # longest paths are found after as many rounds as the number of states, unless there is a cycle which
+        # consumes surface. max lengths of the states which are still changing after that are unbounded
+        changed_states = set()
+        for i in range(len(self._terminable_states) + 1):
+            changed_states = set()
+            for state in self._terminable_states:
+                for (suffix, to_state) in self._get_terminable_outputs(state):
+                    if self._max_lengths[to_state] is None:
+                        continue
+                    length = self._suffix_length_ranges[suffix][1] + self._max_lengths[to_state]
+                    if self._max_lengths[state] is None or length > self._max_lengths[state]:
+                        self._max_lengths[state] = length
+                        changed_states.add(state)
+            if not changed_states:
+                break
+
+        unbounded_states = set(changed_states)
+        changed = True
+        while changed:
+            changed = False
+            for state in self._terminable_states:
+                if state in unbounded_states:
+                    continue
+                for (suffix, to_state) in self._get_terminable_outputs(state):
+                    if to_state in unbounded_states:
+                        unbounded_states.add(state)
+                        changed = True
+                        break
+
+        for state in unbounded_states:
+            self._max_lengths[state] = None
+
+    def can_terminate(self, state):
+        """
+        @type state: State
+        @return: True if a terminal state is reachable from the state
+        @rtype: bool
+        """
+        return state in self._terminable_states
+
+    def get_min_length(self, state):
+        """
+        @type state: State
+        @return: Min length of the surface to consume until a terminal state. None if the state can't terminate
+        @rtype: int or None
+        """
+        return self._min_lengths.get(state)
+
+    def get_max_length(self, state):
+        """
+        @type state: State
+        @return: Max length of the surface to consume until a terminal state. None if unbounded or the state can't
+            terminate
+        @rtype: int or None
+        """
+        return self._max_lengths.get(state)
+
+    def get_suffix_length_range(self, suffix):
+        """
+        @type suffix: Suffix
+        @return: Tuple (min length, max length) of the realizations of the suffix forms
+        @rtype: tuple
+        """
+        return self._suffix_length_ranges.get(suffix) or self._calculate_suffix_length_range(suffix)
+
+    def can_consume(self, state, length):
+        """
+        @type state: State
+        @type length: int
+        @return: False if a morpheme container at the state can never be a parse result with the given length of
+            remaining surface
+        @rtype: bool
+        """
+        if state not in self._terminable_states:
+            return False
+
+        if length < self._min_lengths[state]:
+            return False
+
+        max_length = self._max_lengths[state]
+        return max_length is None or length <= max_length
+
+    def can_consume_after(self, suffix, to_state, length):
+        """
+        @type suffix: Suffix
+        @type to_state: State
+        @type length: int
+        @return: False if applying the suffix to a morpheme container with the given length of remaining surface can
+            never end up in a parse result
+        @rtype: bool
+        """
+        if to_state not in self._terminable_states:
+            return False
+
+        length_range = self._suffix_length_ranges.get(suffix)
+        if not length_range:
+            return True
+
+        min_suffix_length, max_suffix_length = length_range
+        if length - min_suffix_length < self._min_lengths[to_state]:
+            return False
+
+        max_length = self._max_lengths[to_state]
+        return max_length is None or length - max_suffix_length <= max_length
+
+    def get_zero_length_paths(self, state):
+        """
+        Finds the paths which go to a terminal state without consuming any surface. Paths don't visit the same state
+        twice.
+        @type state: State
+        @return: Paths, where a path is a tuple of (suffix, to_state)
+        @rtype: list of tuple
+        """
+        if not self._zero_length_paths.has_key(state):
+            paths = []
+            self._find_zero_length_paths(state, (), set([state]), paths)
+            self._zero_length_paths[state] = paths
+
+        return self._zero_length_paths[state]
+
+    def _find_zero_length_paths(self, state, path, visited_states, paths):
+        if state.type == State.TERMINAL:
+            paths.append(path)
+            return
+
+        for (suffix, to_state) in self._get_terminable_outputs(state):
+            if self._suffix_length_ranges[suffix][0] == 0 and self._min_lengths[to_state] == 0 and to_state not in visited_states:
+                visited_states.add(to_state)
+                self._find_zero_length_paths(to_state, path + ((suffix, to_state),), visited_states, paths)
+                visited_states.remove(to_state)
+
+    def format_report(self):
+        """
+        Formats the analysis of all states, for debugging the changes in the suffix graph.
+        @rtype: unicode
+        """
+        lines = []
+        for state in sorted(self._states, key=lambda s: s.name):
+            if not self.can_terminate(state):
+                lines.append(u'{} : can not terminate'.format(state.name))
+                continue
+
+            max_length = self.get_max_length(state)
+            lines.append(u'{} : min length {}, max length {}, zero length paths {}'.format(state.name,
+                self.get_min_length(state), max_length if max_length is not None else u'unbounded',
+                len(self.get_zero_length_paths(state))))
+
+        return u'\n'.join(lines)
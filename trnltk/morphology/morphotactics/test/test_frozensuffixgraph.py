@@ -0,0 +1,96 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from trnltk.morphology.model.lexeme import Lexeme, SyntacticCategory
+from trnltk.morphology.model.root import Root
+from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
+from trnltk.morphology.morphotactics.copulasuffixgraph import CopulaSuffixGraph
+from trnltk.morphology.morphotactics.numeralsuffixgraph import NumeralSuffixGraph
+from trnltk.morphology.morphotactics.propernounsuffixgraph import ProperNounSuffixGraph
+
+class FrozenSuffixGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.suffix_graph = CopulaSuffixGraph(NumeralSuffixGraph(ProperNounSuffixGraph(BasicSuffixGraph())))
+        self.suffix_graph.initialize()
+
+        self.all_states = self.suffix_graph.get_all_states()
+        self.all_suffixes = self.suffix_graph.get_all_suffixes()
+
+        self.frozen_suffix_graph = self.suffix_graph.freeze()
+
+    def test_should_find_same_states_and_suffixes_with_decorated_graph(self):
+        assert_that(self.frozen_suffix_graph.get_all_states(), equal_to(self.all_states))
+        assert_that(self.frozen_suffix_graph.get_all_suffixes(), equal_to(self.all_suffixes))
+
+        for state in self.all_states:
+            assert_that(self.frozen_suffix_graph.get_state(state.name), same_instance(state))
+            assert_that(self.frozen_suffix_graph.get_state_by_id(state.id), same_instance(state))
+
+        for suffix in self.all_suffixes:
+            assert_that(self.frozen_suffix_graph.get_suffix(suffix.name), same_instance(suffix))
+            assert_that(self.frozen_suffix_graph.get_suffix_by_id(suffix.id), same_instance(suffix))
+
+        assert_that(self.frozen_suffix_graph.get_state(u'VERB_COPULA_WITH_TENSE'), same_instance(self.suffix_graph.VERB_COPULA_WITH_TENSE))
+        assert_that(self.frozen_suffix_graph.get_suffix(u'Pos'), same_instance(self.suffix_graph.get_suffix(u'Pos')))
+
+    def test_should_not_find_nonexisting_states_and_suffixes(self):
+        assert_that(self.frozen_suffix_graph.find_state(u'NONEXISTING'), none())
+        assert_that(self.frozen_suffix_graph.find_suffix(u'NONEXISTING'), none())
+        self.assertRaises(Exception, self.frozen_suffix_graph.get_state, u'NONEXISTING')
+        self.assertRaises(Exception, self.frozen_suffix_graph.get_suffix, u'NONEXISTING')
+
+    def test_should_freeze_outputs_of_states(self):
+        state = self.frozen_suffix_graph.get_state(u'NOUN_ROOT')
+        assert_that(state.outputs, instance_of(tuple))
+        assert_that(state.outputs, is_not(empty()))
+        self.assertRaises(Exception, state.add_out_suffix, self.frozen_suffix_graph.get_suffix(u'Pos'), state)
+
+    def test_should_get_outputs_for_surface(self):
+        state = self.frozen_suffix_graph.get_state(u'NOUN_WITH_AGREEMENT')
+        A3pl = self.frozen_suffix_graph.get_suffix(u'A3Pl_Noun')
+        Pnon = self.frozen_suffix_graph.get_suffix(u'Pnon_Noun')
+        P1sg = self.frozen_suffix_graph.get_suffix(u'P1Sg_Noun')
+
+        def suffixes_for_surface(state, surface):
+            return [suffix for (suffix, to_state) in self.frozen_suffix_graph.get_outputs_for_surface(state, surface)]
+
+        noun_root = self.frozen_suffix_graph.get_state(u'NOUN_ROOT')
+        assert_that(suffixes_for_surface(noun_root, u'lar'), has_item(A3pl))
+        assert_that(suffixes_for_surface(noun_root, u'ım'), is_not(has_item(A3pl)))
+
+        assert_that(suffixes_for_surface(state, u''), has_item(Pnon))
+        assert_that(suffixes_for_surface(state, u''), is_not(has_item(P1sg)))
+        assert_that(suffixes_for_surface(state, u'ım'), has_item(P1sg))
+        assert_that(suffixes_for_surface(state, u'm'), has_item(P1sg))
+        assert_that(suffixes_for_surface(state, u'xyz'), equal_to(suffixes_for_surface(state, u'')))
+
+        for state in self.all_states:
+            for surface in [u'', u'a', u'lar', u'dan', u'ğı', u"'", u'yor']:
+                outputs = self.frozen_suffix_graph.get_outputs_for_surface(state, surface)
+                assert_that(list(outputs), equal_to([output for output in state.outputs if output in outputs]))
+
+    def test_should_get_default_root_state(self):
+        verb_root = Root(u'gel', Lexeme(u'gelmek', u'gel', SyntacticCategory.VERB, None, None), None, None)
+        degil_root = Root(u'değil', Lexeme(u'değil', u'değil', SyntacticCategory.VERB, None, None), None, None)
+
+        assert_that(self.frozen_suffix_graph.get_default_root_state(verb_root), same_instance(self.suffix_graph.get_state(u'VERB_ROOT')))
+        assert_that(self.frozen_suffix_graph.get_default_root_state(degil_root), same_instance(self.suffix_graph.VERB_DEGIL_ROOT))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,11 +17,14 @@ limitations under the License.
 import unittest
 from hamcrest import *
 from mock import Mock
-from trnltk.morphology.model.lexeme import LexemeAttribute
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import LexemeAttribute, Lexeme, SyntacticCategory, SecondarySyntacticCategory
 from trnltk.morphology.contextless.parser.parser import SuffixFormApplication
-from trnltk.morphology.morphotactics.suffixconditions import comes_after, has_lexeme_attributes
+from trnltk.morphology.model.morphemecontainer import MorphemeContainer
+from trnltk.morphology.model.root import Root
+from trnltk.morphology.morphotactics.suffixconditions import comes_after, has_lexeme_attributes, doesnt_have_lexeme_attribute, comes_after_derivation, comes_after_last_non_blank_derivation, followed_by_one_from_group, followed_by_suffix_goes_to, applies_to_root, root_has_secondary_syntactic_category, doesnt, AlwaysTrueSpecification, AlwaysFalseSpecification
 from trnltk.morphology.morphotactics.basicsuffixgraph import Suffix
-from trnltk.morphology.model.morpheme import SuffixForm, Transition
+from trnltk.morphology.model.morpheme import SuffixForm, Transition, SuffixGroup, ZeroTransitionSuffix
 
 class SuffixConditionsTest(unittest.TestCase):
 
@@ -111,6 +114,58 @@ class SuffixConditionsTest(unittest.TestCase):
         self.assert_lexeme_attr_matches    (~has_lexeme_attributes([C_T, C_AR]), [C_T])
         self.assert_lexeme_attr_matches_not(~has_lexeme_attributes([C_T, C_AR]), [C_T, C_AR])
 
+    def test_compiled_conditions_should_give_same_results(self):
+        NOUN_ROOT = State("NOUN_ROOT", State.TRANSFER, SyntacticCategory.NOUN)
+        NOUN_DERIV = State("NOUN_DERIV", State.DERIVATIONAL, SyntacticCategory.NOUN)
+        ADJ_ROOT = State("ADJ_ROOT", State.TRANSFER, SyntacticCategory.ADJECTIVE)
+        ADJ_TERMINAL = State("ADJ_TERMINAL", State.TERMINAL, SyntacticCategory.ADJECTIVE)
+
+        group = SuffixGroup("G")
+        s1 = Suffix("S-1", group)
+        s2 = Suffix("S-2", group)
+        s3 = Suffix("S-3")
+        zero = ZeroTransitionSuffix("Zero")
+        for suffix, form_str in [(s1, u"lAr"), (s1, u""), (s2, u"cI"), (s3, u"lI")]:
+            suffix.add_suffix_form(form_str)
+
+        lexeme = Lexeme(u"kitap", u"kitap", SyntacticCategory.NOUN, SecondarySyntacticCategory.TIME, {LexemeAttribute.Voicing})
+        root = Root(u"kitap", lexeme, None, None)
+
+        def container(*transitions):
+            morpheme_container = MorphemeContainer(root, NOUN_ROOT, u"")
+            for suffix, form_str, actual_suffix_form, to_state in transitions:
+                suffix_form = suffix.get_suffix_form(form_str)
+                morpheme_container.add_transition(SuffixFormApplication(suffix_form, actual_suffix_form, actual_suffix_form), to_state)
+            return morpheme_container
+
+        morpheme_containers = [
+            container(),
+            container((s1, u"lAr", u"lar", NOUN_ROOT)),
+            container((s1, u"", u"", NOUN_DERIV)),
+            container((zero, u"", u"", NOUN_DERIV), (s3, u"lI", u"lı", ADJ_ROOT)),
+            container((s1, u"lAr", u"lar", NOUN_DERIV), (s2, u"cI", u"cı", ADJ_ROOT), (s3, u"lI", u"lı", ADJ_TERMINAL)),
+            container((s2, u"cI", u"cı", NOUN_DERIV), (s1, u"", u"", ADJ_ROOT), (zero, u"", u"", NOUN_DERIV), (s3, u"lI", u"lı", ADJ_TERMINAL))
+        ]
+
+        conditions = [
+            comes_after(s1), comes_after(s1, u"lAr"), comes_after(s1, u""), ~comes_after(s3),
+            comes_after(s1) & ~comes_after(s3, u"lI"), comes_after(s2) | comes_after(s3) | comes_after(s1, u"lAr"),
+            comes_after_derivation(s1), comes_after_derivation(s1, u""), comes_after_derivation(s2, u"cI"),
+            comes_after_last_non_blank_derivation(s2), comes_after_last_non_blank_derivation(s1, u"lAr"),
+            followed_by_one_from_group(group), doesnt(followed_by_one_from_group(group)),
+            followed_by_suffix_goes_to(State.DERIVATIONAL), doesnt(followed_by_suffix_goes_to(State.TERMINAL)),
+            has_lexeme_attributes([LexemeAttribute.Voicing]), has_lexeme_attributes([LexemeAttribute.Voicing, LexemeAttribute.Doubling]),
+            doesnt_have_lexeme_attribute(LexemeAttribute.Voicing), doesnt_have_lexeme_attribute(LexemeAttribute.Doubling),
+            applies_to_root(u"kitap"), ~applies_to_root(u"kalem"), root_has_secondary_syntactic_category(SecondarySyntacticCategory.TIME),
+            AlwaysTrueSpecification() & comes_after(s2), AlwaysFalseSpecification() | comes_after(s2), ~~comes_after(s3),
+            AlwaysFalseSpecification() & comes_after(s2), AlwaysTrueSpecification() | comes_after(s2)
+        ]
+
+        for condition in conditions:
+            predicate = condition.compile()
+            for morpheme_container in morpheme_containers:
+                assert_that(predicate(morpheme_container), equal_to(condition.is_satisfied_by(morpheme_container)),
+                    u'{} for {}'.format(condition, morpheme_container))
 
     def assert_suffixes_matches(self, condition, suffix_form_tuples):
         self.do_assert_suffixes_matches(condition, suffix_form_tuples, True)
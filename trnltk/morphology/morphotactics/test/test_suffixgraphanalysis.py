@@ -0,0 +1,120 @@
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from hamcrest import *
+from trnltk.morphology.model.graphmodel import State
+from trnltk.morphology.model.lexeme import SyntacticCategory
+from trnltk.morphology.morphotactics.basicsuffixgraph import BasicSuffixGraph
+from trnltk.morphology.morphotactics.copulasuffixgraph import CopulaSuffixGraph
+from trnltk.morphology.morphotactics.numeralsuffixgraph import NumeralSuffixGraph
+from trnltk.morphology.morphotactics.propernounsuffixgraph import ProperNounSuffixGraph
+from trnltk.morphology.morphotactics.suffixgraph import SuffixGraphDecorator, EmptySuffixGraph
+from trnltk.morphology.morphotactics.suffixgraphanalysis import SuffixGraphAnalysis
+
+class SimpleSuffixGraph(SuffixGraphDecorator):
+    def __init__(self):
+        super(SimpleSuffixGraph, self).__init__(EmptySuffixGraph())
+
+    def register_states(self):
+        self.ROOT = self._register_state(u'ROOT', State.TRANSFER, SyntacticCategory.NOUN)
+        self.DERIV = self._register_state(u'DERIV', State.DERIVATIONAL, SyntacticCategory.NOUN)
+        self.TERMINAL = self._register_state(u'TERMINAL', State.TERMINAL, SyntacticCategory.NOUN)
+        self.DEAD_END = self._register_state(u'DEAD_END', State.TRANSFER, SyntacticCategory.NOUN)
+
+    def register_suffixes(self):
+        self.Plural = self._register_suffix(u'Plural')
+        self.Plural.add_suffix_form(u'lAr')
+        self.Case = self._register_suffix(u'Case')
+        self.Case.add_suffix_form(u'+yA')
+        self.Case.add_suffix_form(u'')
+        self.Deriv = self._register_suffix(u'Deriv')
+        self.Deriv.add_suffix_form(u'cI')
+        self.Zero = self._register_zero_transition_suffix(u'Zero')
+        self.NoForm = self._register_suffix(u'NoForm')
+
+    def create_suffix_edges(self):
+        self.ROOT.add_out_suffix(self.Plural, self.ROOT)
+        self.ROOT.add_out_suffix(self.Case, self.TERMINAL)
+        self.ROOT.add_out_suffix(self.Zero, self.DERIV)
+        self.ROOT.add_out_suffix(self.NoForm, self.TERMINAL)
+        self.DERIV.add_out_suffix(self.Deriv, self.TERMINAL)
+        self.TERMINAL.add_out_suffix(self.Plural, self.DEAD_END)
+        self.DEAD_END.add_out_suffix(self.Plural, self.ROOT)
+        self.DEAD_END.add_out_suffix(self.NoForm, self.TERMINAL)
+
+class SuffixGraphAnalysisTest(unittest.TestCase):
+
+    def setUp(self):
+        self.suffix_graph = SimpleSuffixGraph()
+        self.suffix_graph.initialize()
+        self.analysis = SuffixGraphAnalysis(self.suffix_graph)
+
+    def test_should_find_terminable_states(self):
+        assert_that(self.analysis.can_terminate(self.suffix_graph.ROOT), equal_to(True))
+        assert_that(self.analysis.can_terminate(self.suffix_graph.DERIV), equal_to(True))
+        assert_that(self.analysis.can_terminate(self.suffix_graph.TERMINAL), equal_to(True))
+        assert_that(self.analysis.can_terminate(self.suffix_graph.DEAD_END), equal_to(True))
+
+        assert_that(self.analysis.can_consume(self.suffix_graph.TERMINAL, 0), equal_to(True))
+        assert_that(self.analysis.can_consume(self.suffix_graph.TERMINAL, 1), equal_to(False))
+
+    def test_should_calculate_lengths(self):
+        assert_that(self.analysis.get_suffix_length_range(self.suffix_graph.Case), equal_to((0, 2)))
+        assert_that(self.analysis.get_suffix_length_range(self.suffix_graph.Plural), equal_to((3, 3)))
+
+        assert_that(self.analysis.get_min_length(self.suffix_graph.ROOT), equal_to(0))
+        assert_that(self.analysis.get_max_length(self.suffix_graph.ROOT), none())
+        assert_that(self.analysis.get_min_length(self.suffix_graph.DERIV), equal_to(2))
+        assert_that(self.analysis.get_max_length(self.suffix_graph.DERIV), equal_to(2))
+        assert_that(self.analysis.get_min_length(self.suffix_graph.DEAD_END), equal_to(3))
+        assert_that(self.analysis.get_max_length(self.suffix_graph.DEAD_END), none())
+
+        assert_that(self.analysis.can_consume(self.suffix_graph.DERIV, 1), equal_to(False))
+        assert_that(self.analysis.can_consume(self.suffix_graph.DERIV, 2), equal_to(True))
+        assert_that(self.analysis.can_consume(self.suffix_graph.DERIV, 3), equal_to(False))
+        assert_that(self.analysis.can_consume(self.suffix_graph.ROOT, 100), equal_to(True))
+
+        assert_that(self.analysis.can_consume_after(self.suffix_graph.Deriv, self.suffix_graph.TERMINAL, 2), equal_to(True))
+        assert_that(self.analysis.can_consume_after(self.suffix_graph.Deriv, self.suffix_graph.TERMINAL, 3), equal_to(False))
+        assert_that(self.analysis.can_consume_after(self.suffix_graph.Zero, self.suffix_graph.DERIV, 1), equal_to(False))
+
+    def test_should_find_zero_length_paths(self):
+        ROOT = self.suffix_graph.ROOT
+        TERMINAL = self.suffix_graph.TERMINAL
+
+        assert_that(self.analysis.get_zero_length_paths(ROOT), equal_to([((self.suffix_graph.Case, TERMINAL),)]))
+        assert_that(self.analysis.get_zero_length_paths(TERMINAL), equal_to([()]))
+        assert_that(self.analysis.get_zero_length_paths(self.suffix_graph.DERIV), equal_to([]))
+
+        assert_that(self.analysis.format_report(), contains_string(u'DERIV : min length 2, max length 2, zero length paths 0'))
+
+    def test_should_analyze_full_graph(self):
+        suffix_graph = CopulaSuffixGraph(NumeralSuffixGraph(ProperNounSuffixGraph(BasicSuffixGraph())))
+        suffix_graph.initialize()
+        analysis = SuffixGraphAnalysis(suffix_graph)
+
+        for state in suffix_graph.get_all_states():
+            if state.type == State.TERMINAL:
+                assert_that(analysis.get_min_length(state), equal_to(0))
+                assert_that(analysis.get_max_length(state), equal_to(0))
+
+        assert_that(analysis.can_terminate(suffix_graph.get_state(u'NOUN_ROOT')), equal_to(True))
+        assert_that(analysis.get_min_length(suffix_graph.get_state(u'NOUN_ROOT')), equal_to(0))
+        assert_that(analysis.get_max_length(suffix_graph.get_state(u'NOUN_ROOT')), none())
+        assert_that(analysis.get_min_length(suffix_graph.get_state(u'VERB_TENSE_DERIV')), greater_than(0))
+
+if __name__ == '__main__':
+    unittest.main()
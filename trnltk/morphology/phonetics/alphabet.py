@@ -44,6 +44,9 @@ class TurkishLetter(object):
 
         self._check_consistency()
 
+        # letters are used as keys of the voicing maps, hash is calculated once
+        self._hash = hash((self.char_value, self.upper_case_char_value))
+
     def _check_consistency(self):
         if ((self.voiceless or self.continuant) and self.vowel) or (
             not self.vowel and (self.frontal or self.rounded)):
@@ -60,7 +63,7 @@ class TurkishLetter(object):
         return self.char_value==other.char_value and self.upper_case_char_value==other.upper_case_char_value
 
     def __hash__(self):
-        return hash((self.char_value, self.upper_case_char_value))
+        return self._hash
 
 class TurkishAlphabet(object):
     L_a =  TurkishLetter(u'a', u'A', 1, vowel=True)
@@ -118,22 +121,79 @@ class TurkishAlphabet(object):
     Lower_Case_Letter_Map = None
     Upper_Case_Letter_Map = None
 
+    # flat tables indexed by code point, for both lower and upper case chars of the letters.
+    # code points of all letters are small (max is 'ş'), thus the tables are small too
+    Letters_By_Code_Point = None
+    Vowels_By_Code_Point = None
+
+    _unknown_letters = {}
+
     @classmethod
     def get_letter_for_char(cls, char):
         """
         @type char: str or unicode
         @rtype: TurkishLetter
         """
+        code_point = ord(char)
+        if code_point < len(TurkishAlphabet.Letters_By_Code_Point):
+            letter = TurkishAlphabet.Letters_By_Code_Point[code_point]
+            if letter:
+                return letter
 
-        assert char and len(char)==1
+        letter = TurkishAlphabet._unknown_letters.get(char)
+        if not letter:
+            letter = TurkishLetter(char, char.upper(), 99)
+            TurkishAlphabet._unknown_letters[char] = letter
 
-        if TurkishAlphabet.Lower_Case_Letter_Map.has_key(char):
-            return TurkishAlphabet.Lower_Case_Letter_Map[char]
+        return letter
 
-        elif TurkishAlphabet.Upper_Case_Letter_Map.has_key(char):
-            return TurkishAlphabet.Upper_Case_Letter_Map[char]
+    @classmethod
+    def is_vowel(cls, char):
+        """
+        @type char: str or unicode
+        @rtype: bool
+        """
+        code_point = ord(char)
+        return code_point < len(TurkishAlphabet.Vowels_By_Code_Point) and TurkishAlphabet.Vowels_By_Code_Point[code_point]
+
+    @classmethod
+    def count_vowels(cls, seq):
+        """
+        @type seq: str or unicode
+        @rtype: int
+        """
+        vowels_by_code_point = TurkishAlphabet.Vowels_By_Code_Point
+        table_size = len(vowels_by_code_point)
 
-        return TurkishLetter(char, char.upper(), 99)
+        vowel_count = 0
+        for c in seq:
+            code_point = ord(c)
+            if code_point < table_size and vowels_by_code_point[code_point]:
+                vowel_count += 1
+
+        return vowel_count
+
+    @classmethod
+    def get_last_vowel_and_last_letter(cls, seq):
+        """
+        Finds the last vowel and the last letter of a sequence in one pass, starting from the end.
+        @type seq: str or unicode
+        @return: Tuple (last vowel or None, last letter)
+        @rtype: tuple
+        """
+        last_letter = cls.get_letter_for_char(seq[-1])
+        if last_letter.vowel:
+            return last_letter, last_letter
+
+        vowels_by_code_point = TurkishAlphabet.Vowels_By_Code_Point
+        table_size = len(vowels_by_code_point)
+
+        for i in xrange(len(seq) - 2, -1, -1):
+            code_point = ord(seq[i])
+            if code_point < table_size and vowels_by_code_point[code_point]:
+                return TurkishAlphabet.Letters_By_Code_Point[code_point], last_letter
+
+        return None, last_letter
 
     @classmethod
     def get_letter_for_upper_case_char(cls, char):
@@ -190,5 +250,16 @@ class TurkishAlphabet(object):
                 TurkishAlphabet.Lower_Case_Letter_Map[letter.char_value] = letter
                 TurkishAlphabet.Upper_Case_Letter_Map[letter.upper_case_char_value] = letter
 
+            table_size = max([ord(c) for c in TurkishAlphabet.Lower_Case_Letter_Map.keys() + TurkishAlphabet.Upper_Case_Letter_Map.keys()]) + 1
+            TurkishAlphabet.Letters_By_Code_Point = [None] * table_size
+
+            # lower case chars take precedence, as in the maps
+            for char, letter in TurkishAlphabet.Upper_Case_Letter_Map.iteritems():
+                TurkishAlphabet.Letters_By_Code_Point[ord(char)] = letter
+            for char, letter in TurkishAlphabet.Lower_Case_Letter_Map.iteritems():
+                TurkishAlphabet.Letters_By_Code_Point[ord(char)] = letter
+
+            TurkishAlphabet.Vowels_By_Code_Point = [bool(letter and letter.vowel) for letter in TurkishAlphabet.Letters_By_Code_Point]
+
 
 TurkishAlphabet._initialize()
\ No newline at end of file
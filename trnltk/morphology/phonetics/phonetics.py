@@ -15,7 +15,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
-from trnltk.morphology.model.lexeme import LexemeAttribute
+from trnltk.morphology.model.lexeme import LexemeAttributeFlags
 
 class PhoneticExpectation(object):
     VowelStart = 'VowelStart'
@@ -44,8 +44,91 @@ class PhoneticAttributes(object):
 
     HasNoVowel = "HasNoVowel"
 
+    ALL = sorted({
+        LastLetterVowel, LastLetterConsonant, LastVowelFrontal, LastVowelBack, LastVowelRounded, LastVowelUnrounded,
+        LastLetterVoiceless, LastLetterNotVoiceless, LastLetterContinuant, LastLetterNotContinuant,
+        LastLetterVoicedStop, LastLetterVoicelessStop, FirstLetterVowel, FirstLetterConsonant, HasNoVowel
+    })
+
+
+class PhoneticAttributeFlags(object):
+    """
+    Int flag representation of phonetic attributes. Checking a flag is cheaper than checking a string in a set.
+    """
+    LastLetterVowel = 1 << 0
+    LastLetterConsonant = 1 << 1
+
+    LastVowelFrontal = 1 << 2
+    LastVowelBack = 1 << 3
+    LastVowelRounded = 1 << 4
+    LastVowelUnrounded = 1 << 5
+
+    LastLetterVoiceless = 1 << 6
+    LastLetterNotVoiceless = 1 << 7
+    LastLetterContinuant = 1 << 8
+    LastLetterNotContinuant = 1 << 9
+
+    LastLetterVoicedStop = 1 << 10
+    LastLetterVoicelessStop = 1 << 11
+
+    FirstLetterVowel = 1 << 12
+    FirstLetterConsonant = 1 << 13
+
+    HasNoVowel = 1 << 14
+
+    _attributes_of_flags = {}
+
+    @classmethod
+    def to_flags(cls, attributes):
+        """
+        @type attributes: set of str or None
+        @rtype: int
+        """
+        flags = 0
+        if attributes:
+            for attribute in attributes:
+                flags |= cls._flags_of_attributes[attribute]
+        return flags
+
+    @classmethod
+    def to_attributes(cls, flags):
+        """
+        @type flags: int
+        @return: Attributes for the flags. Same set is returned for same flags, so it shouldn't be modified
+        @rtype: frozenset of str
+        """
+        attributes = cls._attributes_of_flags.get(flags)
+        if attributes is None:
+            attributes = frozenset([attribute for attribute, flag in cls._flags_of_attributes.iteritems() if flags & flag])
+            cls._attributes_of_flags[flags] = attributes
+        return attributes
+
+PhoneticAttributeFlags._flags_of_attributes = dict((attribute, getattr(PhoneticAttributeFlags, attribute)) for attribute in PhoneticAttributes.ALL)
+
 
 class Phonetics(object):
+    # Results of the phonetic calculations only depend on a few things, like the last letter of the word, the phonetic
+    # attributes and the suffix form. Thus they are memoized with these keys, instead of the words.
+    _applicability_cache = {}       # (form, last letter is vowel) -> bool
+    _application_cache = {}         # (form, last char, phonetic attribute flags, no voicing) -> (voiced last char or None, fitting form)
+    _expectations_cache = {}        # (expectations, form) -> bool
+    _plain_sequence_cache = {}      # (last letter, last vowel) -> phonetic attribute flags
+    _realizations_cache = {}        # form -> {phonetic class -> (fitting form, voicing possible)}
+
+    # only these attributes of a surface matter for the realization of a suffix form
+    PHONETIC_CLASS_MASK = PhoneticAttributeFlags.LastLetterVowel | PhoneticAttributeFlags.LastLetterVoiceless |\
+                          PhoneticAttributeFlags.LastVowelBack | PhoneticAttributeFlags.LastVowelUnrounded
+
+    PHONETIC_CLASSES = [phonetic_class for phonetic_class in range(PHONETIC_CLASS_MASK + 1) if phonetic_class & ~PHONETIC_CLASS_MASK == 0]
+
+    @classmethod
+    def clear_caches(cls):
+        cls._applicability_cache.clear()
+        cls._application_cache.clear()
+        cls._expectations_cache.clear()
+        cls._plain_sequence_cache.clear()
+        cls._realizations_cache.clear()
+
     @classmethod
     def is_suffix_form_applicable(cls, word, form_str):
         """
@@ -63,7 +146,20 @@ class Phonetics(object):
         word = word.strip()
         form_str = form_str.strip()
 
-        phonetic_attributes = cls.calculate_phonetic_attributes_of_plain_sequence(word)
+        # only the last letter of the word matters
+        last_letter_vowel = TurkishAlphabet.get_letter_for_char(word[-1]).vowel
+        key = (form_str, last_letter_vowel)
+        applicable = cls._applicability_cache.get(key)
+        if applicable is None:
+            applicable = cls._is_suffix_form_applicable(last_letter_vowel, form_str)
+            cls._applicability_cache[key] = applicable
+
+        return applicable
+
+    @classmethod
+    def _is_suffix_form_applicable(cls, last_letter_vowel, form_str):
+        if not form_str or not form_str.strip():
+            return True
 
         # ci, dik, +yacak, +iyor, +ar, +yi, +im, +yla
 
@@ -74,25 +170,25 @@ class Phonetics(object):
             optional_letter = TurkishAlphabet.get_letter_for_char(form_str[1])
             if optional_letter.vowel:
                 #+iyor, +ar, +im
-                if PhoneticAttributes.LastLetterVowel in phonetic_attributes:
+                if last_letter_vowel:
                     # ata, dana
-                    return cls.is_suffix_form_applicable(word, form_str[2:])
+                    return cls._is_suffix_form_applicable(last_letter_vowel, form_str[2:])
                 else:
                     # yap, kitap
                     return True
 
             else:
                 # +yacak, +yi, +yla
-                if PhoneticAttributes.LastLetterVowel in phonetic_attributes:
+                if last_letter_vowel:
                     #ata, dana
                     return True
                 else:
                     # yap, kitap
-                    return cls.is_suffix_form_applicable(word, form_str[2:])
+                    return cls._is_suffix_form_applicable(last_letter_vowel, form_str[2:])
 
         else:
             if first_form_letter.vowel:
-                return PhoneticAttributes.LastLetterVowel not in phonetic_attributes
+                return not last_letter_vowel
             else:
                 return True
 
@@ -111,12 +207,97 @@ class Phonetics(object):
         @return: Tuple (word, applied suffix form)
         @rtype: tuple
         """
+        return cls.apply_flags(word, PhoneticAttributeFlags.to_flags(phonetic_attributes), form_str, LexemeAttributeFlags.to_flags(lexeme_attributes))
+
+    @classmethod
+    def apply_flags(cls, word, phonetic_attribute_flags, form_str, lexeme_attribute_flags=0):
+        """
+        Same as C{apply}, but with the flag representations of phonetic attributes and lexeme attributes.
+        @type word: unicode
+        @type phonetic_attribute_flags: int
+        @type form_str: unicode
+        @type lexeme_attribute_flags: int
+        @return: Tuple (word, applied suffix form)
+        @rtype: tuple
+        """
         if not form_str or not form_str.strip():
             return word, u''
 
         if not word or not word.strip():
             return None, None
 
+        # only the last letter of the word can be modified
+        no_voicing = bool(lexeme_attribute_flags & LexemeAttributeFlags.NoVoicing)
+        key = (form_str, word[-1], phonetic_attribute_flags, no_voicing)
+        application = cls._application_cache.get(key)
+        if application is None:
+            modified_word, fitting_suffix_form = cls._apply(word, phonetic_attribute_flags, form_str, no_voicing)
+            application = (modified_word[-1] if modified_word != word else None, fitting_suffix_form)
+            cls._application_cache[key] = application
+
+        modified_last_char, fitting_suffix_form = application
+        if modified_last_char:
+            return word[:-1] + modified_last_char, fitting_suffix_form
+        else:
+            return word, fitting_suffix_form
+
+    @classmethod
+    def _apply(cls, word, phonetic_attribute_flags, form_str, no_voicing):
+        fitting_suffix_form, voicing_possible = cls._realize(phonetic_attribute_flags, form_str)
+        if voicing_possible:
+            word = cls.voice_last_letter(word, phonetic_attribute_flags, no_voicing)
+        return word, fitting_suffix_form
+
+    @classmethod
+    def voice_last_letter(cls, word, phonetic_attribute_flags, no_voicing):
+        """
+        Voices the last letter of the word, if the word has a voiceless stop at the end and voicing is not disabled.
+        Should be called only if the realization of the suffix form starts with a vowel.
+        @type word: unicode
+        @type phonetic_attribute_flags: int
+        @type no_voicing: bool
+        @rtype: unicode
+        """
+        if not no_voicing and phonetic_attribute_flags & PhoneticAttributeFlags.LastLetterVoicelessStop:
+            voiced_letter = TurkishAlphabet.voice(TurkishAlphabet.get_letter_for_char(word[-1]))
+            if voiced_letter:
+                return word[:-1] + voiced_letter.char_value
+        return word
+
+    @classmethod
+    def compile_suffix_form(cls, form_str):
+        """
+        Calculates all surface realizations of a suffix form, one for each phonetic class.
+
+        Realization of a suffix form only depends on a few phonetic attributes of the surface it is applied to.
+        Phonetic class of a surface is these attributes, see C{get_phonetic_class}.
+        @type form_str: unicode
+        @return: Map of phonetic class to tuple (fitting suffix form, voicing possible). Same map is returned for
+            same form, so it shouldn't be modified
+        @rtype: dict
+        """
+        realizations = cls._realizations_cache.get(form_str)
+        if realizations is None:
+            realizations = {}
+            for phonetic_class in cls.PHONETIC_CLASSES:
+                realizations[phonetic_class] = cls._realize(phonetic_class, form_str)
+            cls._realizations_cache[form_str] = realizations
+        return realizations
+
+    @classmethod
+    def get_phonetic_class(cls, phonetic_attribute_flags):
+        """
+        @type phonetic_attribute_flags: int
+        @return: Part of the phonetic attribute flags that matters for the realization of a suffix form
+        @rtype: int
+        """
+        return phonetic_attribute_flags & cls.PHONETIC_CLASS_MASK
+
+    @classmethod
+    def _realize(cls, phonetic_attribute_flags, form_str):
+        if not form_str or not form_str.strip():
+            return u'', False
+
         # ci, dik, +yacak, +iyor, +ar, +yi, +im, +yla
 
         first_form_letter = TurkishAlphabet.get_letter_for_char(form_str[0])
@@ -126,42 +307,39 @@ class Phonetics(object):
             optional_letter = TurkishAlphabet.get_letter_for_char(form_str[1])
             if optional_letter.vowel:
                 #+iyor, +ar, +im
-                if PhoneticAttributes.LastLetterVowel in phonetic_attributes:
+                if phonetic_attribute_flags & PhoneticAttributeFlags.LastLetterVowel:
                     # ata, dana
-                    return cls.apply(word, phonetic_attributes, form_str[2:], lexeme_attributes)
+                    return cls._realize(phonetic_attribute_flags, form_str[2:])
                 else:
                     # yap, kitap
-                    return cls._handle_phonetics(word, phonetic_attributes, form_str[1:], lexeme_attributes)
+                    return cls._handle_phonetics(phonetic_attribute_flags, form_str[1:])
 
             else:
                 # +yacak, +yi, +yla
-                if PhoneticAttributes.LastLetterVowel in phonetic_attributes:
+                if phonetic_attribute_flags & PhoneticAttributeFlags.LastLetterVowel:
                     #ata, dana
-                    return cls._handle_phonetics(word, phonetic_attributes, form_str[1:], lexeme_attributes)
+                    return cls._handle_phonetics(phonetic_attribute_flags, form_str[1:])
                 else:
                     # yap, kitap
-                    return cls.apply(word, phonetic_attributes, form_str[2:], lexeme_attributes)
+                    return cls._realize(phonetic_attribute_flags, form_str[2:])
 
         else:
-            return cls._handle_phonetics(word, phonetic_attributes, form_str, lexeme_attributes)
+            return cls._handle_phonetics(phonetic_attribute_flags, form_str)
 
     @classmethod
-    def _handle_phonetics(cls, word, phonetic_attributes, form_str, lexeme_attributes=None):
-        lexeme_attributes = lexeme_attributes or []
-        phonetic_attributes = phonetic_attributes or []
-
+    def _handle_phonetics(cls, phonetic_attribute_flags, form_str):
         first_letter_of_form = TurkishAlphabet.get_letter_for_char(form_str[0])
 
-        # first apply voicing if possible
-        if LexemeAttribute.NoVoicing not in lexeme_attributes and PhoneticAttributes.LastLetterVoicelessStop in phonetic_attributes and first_letter_of_form.vowel:
-            voiced_letter = TurkishAlphabet.voice(TurkishAlphabet.get_letter_for_char(word[-1]))
-            if voiced_letter:
-                word = word[:-1] + voiced_letter.char_value
+        # voicing of the word is possible if the form starts with a vowel
+        voicing_possible = first_letter_of_form.vowel
 
-        # then try devoicing
-        if PhoneticAttributes.LastLetterVoiceless in phonetic_attributes and TurkishAlphabet.devoice(first_letter_of_form):
+        # try devoicing
+        if phonetic_attribute_flags & PhoneticAttributeFlags.LastLetterVoiceless and TurkishAlphabet.devoice(first_letter_of_form):
             form_str = TurkishAlphabet.devoice(first_letter_of_form).char_value + form_str[1:]
 
+        last_vowel_back = phonetic_attribute_flags & PhoneticAttributeFlags.LastVowelBack
+        last_vowel_unrounded = phonetic_attribute_flags & PhoneticAttributeFlags.LastVowelUnrounded
+
         applied = u''
 
         for i in range(len(form_str)):
@@ -174,23 +352,23 @@ class Phonetics(object):
             letter = TurkishAlphabet.get_letter_for_char(c)
             if letter.vowel and letter.upper_case_char_value == c:
                 if c == u'A':
-                    if PhoneticAttributes.LastVowelBack in phonetic_attributes:
+                    if last_vowel_back:
                         applied += u'a'
                     else:
                         applied += u'e'
                 elif c == u'I':
-                    if PhoneticAttributes.LastVowelBack in phonetic_attributes:
-                        if PhoneticAttributes.LastVowelUnrounded in phonetic_attributes or next_c == '!':
+                    if last_vowel_back:
+                        if last_vowel_unrounded or next_c == '!':
                             applied += u'ı'
                         else:
                             applied += u'u'
                     else:
-                        if PhoneticAttributes.LastVowelUnrounded in phonetic_attributes or next_c == '!':
+                        if last_vowel_unrounded or next_c == '!':
                             applied += u'i'
                         else:
                             applied += u'ü'
                 elif c == u'O':
-                    if PhoneticAttributes.LastVowelBack in phonetic_attributes:
+                    if last_vowel_back:
                         applied += u'o'
                     else:
                         applied += u'ö'
@@ -198,7 +376,7 @@ class Phonetics(object):
             else:
                 applied = applied + c
 
-        return word, applied
+        return applied, voicing_possible
 
     @classmethod
     def expectations_satisfied(cls, phonetic_expectations, form_str):
@@ -216,13 +394,19 @@ class Phonetics(object):
 
         form_str = form_str.strip()
 
-        expectation_satisfaction_map = dict()
+        key = (tuple(phonetic_expectations), form_str)
+        satisfied = cls._expectations_cache.get(key)
+        if satisfied is None:
+            expectation_satisfaction_map = dict()
 
-        for phonetic_expectation in phonetic_expectations:
-            expectation_satisfaction_map[phonetic_expectation] = cls._expectation_satisfied(phonetic_expectation,
-                form_str)
+            for phonetic_expectation in phonetic_expectations:
+                expectation_satisfaction_map[phonetic_expectation] = cls._expectation_satisfied(phonetic_expectation,
+                    form_str)
 
-        return all(expectation_satisfaction_map.values())
+            satisfied = all(expectation_satisfaction_map.values())
+            cls._expectations_cache[key] = satisfied
+
+        return satisfied
 
 
     @classmethod
@@ -254,18 +438,26 @@ class Phonetics(object):
         @type lexeme_attributes: set of unicode
         @rtype: set
         """
+        phonetic_attribute_flags = cls.calculate_phonetic_attribute_flags(word, LexemeAttributeFlags.to_flags(lexeme_attributes))
+        return set(PhoneticAttributeFlags.to_attributes(phonetic_attribute_flags))
 
-        phonetic_attributes = cls.calculate_phonetic_attributes_of_plain_sequence(word)
-        if lexeme_attributes and LexemeAttribute.InverseHarmony in lexeme_attributes:
-            if PhoneticAttributes.LastVowelBack in phonetic_attributes:
-                phonetic_attributes.remove(PhoneticAttributes.LastVowelBack)
-                phonetic_attributes.add(PhoneticAttributes.LastVowelFrontal)
+    @classmethod
+    def calculate_phonetic_attribute_flags(cls, word, lexeme_attribute_flags):
+        """
+        Same as C{calculate_phonetic_attributes}, but with the flag representations of the attributes.
+        @type word: unicode
+        @type lexeme_attribute_flags: int
+        @rtype: int
+        """
+        phonetic_attribute_flags = cls.calculate_phonetic_attribute_flags_of_plain_sequence(word)
+        if lexeme_attribute_flags & LexemeAttributeFlags.InverseHarmony:
+            if phonetic_attribute_flags & PhoneticAttributeFlags.LastVowelBack:
+                phonetic_attribute_flags = phonetic_attribute_flags & ~PhoneticAttributeFlags.LastVowelBack | PhoneticAttributeFlags.LastVowelFrontal
 
-            elif PhoneticAttributes.LastVowelFrontal in phonetic_attributes:
-                phonetic_attributes.remove(PhoneticAttributes.LastVowelFrontal)
-                phonetic_attributes.add(PhoneticAttributes.LastVowelBack)
+            elif phonetic_attribute_flags & PhoneticAttributeFlags.LastVowelFrontal:
+                phonetic_attribute_flags = phonetic_attribute_flags & ~PhoneticAttributeFlags.LastVowelFrontal | PhoneticAttributeFlags.LastVowelBack
 
-        return phonetic_attributes
+        return phonetic_attribute_flags
 
     @classmethod
     def calculate_phonetic_attributes_of_plain_sequence(cls, seq):
@@ -274,48 +466,66 @@ class Phonetics(object):
         @type seq: unicode
         @rtype: set
         """
-        attrs = []
+        return set(PhoneticAttributeFlags.to_attributes(cls.calculate_phonetic_attribute_flags_of_plain_sequence(seq)))
+
+    @classmethod
+    def calculate_phonetic_attribute_flags_of_plain_sequence(cls, seq):
+        """
+        Same as C{calculate_phonetic_attributes_of_plain_sequence}, but with the flag representation of the attributes.
+        @type seq: unicode
+        @rtype: int
+        """
+        last_vowel, last_letter = TurkishAlphabet.get_last_vowel_and_last_letter(seq)
+
+        key = (last_letter, last_vowel)
+        phonetic_attribute_flags = cls._plain_sequence_cache.get(key)
+        if phonetic_attribute_flags is None:
+            phonetic_attribute_flags = cls._calculate_phonetic_attribute_flags(last_vowel, last_letter)
+            cls._plain_sequence_cache[key] = phonetic_attribute_flags
+
+        return phonetic_attribute_flags
+
+    @classmethod
+    def _calculate_phonetic_attribute_flags(cls, last_vowel, last_letter):
+        flags = 0
 
-        last_vowel = cls.get_last_vowel(seq)
-        last_letter = TurkishAlphabet.get_letter_for_char(seq[-1])
         if last_vowel:
             if last_vowel.rounded:
-                attrs.append(PhoneticAttributes.LastVowelRounded)
+                flags |= PhoneticAttributeFlags.LastVowelRounded
             else:
-                attrs.append(PhoneticAttributes.LastVowelUnrounded)
+                flags |= PhoneticAttributeFlags.LastVowelUnrounded
 
             if last_vowel.frontal:
-                attrs.append(PhoneticAttributes.LastVowelFrontal)
+                flags |= PhoneticAttributeFlags.LastVowelFrontal
             else:
-                attrs.append(PhoneticAttributes.LastVowelBack)
+                flags |= PhoneticAttributeFlags.LastVowelBack
 
         if last_letter.vowel:
-            attrs.append(PhoneticAttributes.LastLetterVowel)
+            flags |= PhoneticAttributeFlags.LastLetterVowel
         else:
-            attrs.append(PhoneticAttributes.LastLetterConsonant)
+            flags |= PhoneticAttributeFlags.LastLetterConsonant
 
         if last_letter.voiceless:
-            attrs.append(PhoneticAttributes.LastLetterVoiceless)
+            flags |= PhoneticAttributeFlags.LastLetterVoiceless
             if not last_letter.continuant:
-                attrs.append(PhoneticAttributes.LastLetterVoicelessStop)
+                flags |= PhoneticAttributeFlags.LastLetterVoicelessStop
         else:
-            attrs.append(PhoneticAttributes.LastLetterNotVoiceless)
+            flags |= PhoneticAttributeFlags.LastLetterNotVoiceless
             if not last_letter.continuant and not last_letter.vowel:
-                attrs.append(PhoneticAttributes.LastLetterVoicedStop)
+                flags |= PhoneticAttributeFlags.LastLetterVoicedStop
 
         if last_letter.continuant:
-            attrs.append(PhoneticAttributes.LastLetterContinuant)
+            flags |= PhoneticAttributeFlags.LastLetterContinuant
         else:
-            attrs.append(PhoneticAttributes.LastLetterNotContinuant)
+            flags |= PhoneticAttributeFlags.LastLetterNotContinuant
 
-        return set(attrs)
+        return flags
 
     @classmethod
     def get_last_vowel(cls, seq):
-        for s in reversed(seq):
-            turkish_letter = TurkishAlphabet.get_letter_for_char(s)
-            if turkish_letter.vowel:
-                return turkish_letter
+        if not seq:
+            return None
+        return TurkishAlphabet.get_last_vowel_and_last_letter(seq)[0]
 
     @classmethod
     def application_matches(cls, word, applied_str, voicing_allowed):
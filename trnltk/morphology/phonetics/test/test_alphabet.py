@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+Copyright  2012  Ali Ok (aliokATapacheDOTorg)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from trnltk.morphology.phonetics.alphabet import TurkishAlphabet
+
+class TurkishAlphabetTest(unittest.TestCase):
+    def test_should_get_letter_for_char(self):
+        for letter in TurkishAlphabet.Turkish_Letters:
+            self.assertIs(TurkishAlphabet.get_letter_for_char(letter.char_value), letter)
+            self.assertIs(TurkishAlphabet.get_letter_for_char(letter.upper_case_char_value), letter)
+
+        self.assertIs(TurkishAlphabet.get_letter_for_char(u'I'), TurkishAlphabet.L_ii)
+        self.assertIs(TurkishAlphabet.get_letter_for_char(u'İ'), TurkishAlphabet.L_i)
+
+        unknown_letter = TurkishAlphabet.get_letter_for_char(u'3')
+        self.assertEqual(unknown_letter.char_value, u'3')
+        self.assertEqual(unknown_letter.alphabetic_index, 99)
+        self.assertFalse(unknown_letter.vowel)
+        self.assertEqual(TurkishAlphabet.get_letter_for_char(u'€').char_value, u'€')
+
+    def test_should_find_vowels(self):
+        self.assertTrue(TurkishAlphabet.is_vowel(u'ı'))
+        self.assertTrue(TurkishAlphabet.is_vowel(u'Ü'))
+        self.assertFalse(TurkishAlphabet.is_vowel(u'ş'))
+        self.assertFalse(TurkishAlphabet.is_vowel(u'3'))
+        self.assertFalse(TurkishAlphabet.is_vowel(u'€'))
+
+        self.assertEqual(TurkishAlphabet.count_vowels(u''), 0)
+        self.assertEqual(TurkishAlphabet.count_vowels(u'kşt'), 0)
+        self.assertEqual(TurkishAlphabet.count_vowels(u'ağaç'), 2)
+        self.assertEqual(TurkishAlphabet.count_vowels(u'İSTANBUL'), 3)
+
+    def test_should_get_last_vowel_and_last_letter(self):
+        self.assertEqual(TurkishAlphabet.get_last_vowel_and_last_letter(u'kitap'), (TurkishAlphabet.L_a, TurkishAlphabet.L_p))
+        self.assertEqual(TurkishAlphabet.get_last_vowel_and_last_letter(u'elma'), (TurkishAlphabet.L_a, TurkishAlphabet.L_a))
+        self.assertEqual(TurkishAlphabet.get_last_vowel_and_last_letter(u'üst'), (TurkishAlphabet.L_uu, TurkishAlphabet.L_t))
+        self.assertEqual(TurkishAlphabet.get_last_vowel_and_last_letter(u'TBMM'), (None, TurkishAlphabet.L_m))
+        self.assertEqual(TurkishAlphabet.get_last_vowel_and_last_letter(u'x'), (None, TurkishAlphabet.L_x))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,8 +15,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import unittest
-from trnltk.morphology.model.lexeme import LexemeAttribute
-from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticExpectation, PhoneticAttributes
+from trnltk.morphology.model.lexeme import LexemeAttribute, LexemeAttributeFlags
+from trnltk.morphology.phonetics.phonetics import Phonetics, PhoneticExpectation, PhoneticAttributes, PhoneticAttributeFlags
 
 ac = Phonetics.is_suffix_form_applicable
 def ap(word, form_str, lexeme_attributes=None):
@@ -262,5 +262,69 @@ class PhoneticExpectationsTest(unittest.TestCase):
         self.assertFalse(am(u'yapacağım', u'yapacak', False))
         self.assertFalse(am(u'armudunu', u'armut', False))
 
+    def test_should_use_memoized_results_for_words_with_same_phonetics(self):
+        Phonetics.clear_caches()
+
+        self.assertEqual(ap(u'kitap', u'+yI'), u'kitabı')
+        self.assertEqual(ap(u'sırap', u'+yI'), u'sırabı')
+        self.assertEqual(apnv(u'sırap', u'+yI'), u'sırapı')
+        self.assertEqual(ap(u'kitap', u'lAr'), u'kitaplar')
+        self.assertEqual(ap(u'kitap', u'+yI'), u'kitabı')
+
+        self.assertTrue(ac(u'elma', u'+yI'))
+        self.assertFalse(ac(u'elma', u'Im'))
+        self.assertFalse(ac(u'kara', u'Im'))
+        self.assertTrue(ac(u'kitap', u'Im'))
+
+        self.assertTrue(es([V], u'+yI'))
+        self.assertFalse(es([V, C], u'Im'))
+        self.assertFalse(es([V, C], u'Im'))
+
+    def test_should_convert_attributes_to_flags_and_back(self):
+        attrs = cpa(u'kitap')
+        flags = PhoneticAttributeFlags.to_flags(attrs)
+
+        self.assertEqual(flags, Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(u'kitap'))
+        self.assertTrue(flags & PhoneticAttributeFlags.LastLetterVoicelessStop)
+        self.assertFalse(flags & PhoneticAttributeFlags.LastLetterVowel)
+        self.assertEqual(PhoneticAttributeFlags.to_attributes(flags), attrs)
+        self.assertEqual(PhoneticAttributeFlags.to_flags(None), 0)
+
+        lexeme_attribute_flags = LexemeAttributeFlags.to_flags({LexemeAttribute.NoVoicing, LexemeAttribute.InverseHarmony})
+        self.assertEqual(lexeme_attribute_flags, LexemeAttributeFlags.NoVoicing | LexemeAttributeFlags.InverseHarmony)
+        self.assertEqual(LexemeAttributeFlags.to_attributes(lexeme_attribute_flags), {LexemeAttribute.NoVoicing, LexemeAttribute.InverseHarmony})
+
+        self.assertEqual(Phonetics.apply_flags(u'kitap', flags, u'+yI'), (u'kitab', u'ı'))
+        self.assertEqual(Phonetics.apply_flags(u'kitap', flags, u'+yI', LexemeAttributeFlags.NoVoicing), (u'kitap', u'ı'))
+
+    def test_should_not_share_memoized_phonetic_attrs(self):
+        attrs = cpa(u'elma')
+        attrs.add(PhoneticAttributes.HasNoVowel)
+
+        self.assertFalse(PhoneticAttributes.HasNoVowel in cpa(u'elma'))
+        self.assertFalse(PhoneticAttributes.HasNoVowel in cpa(u'pala'))
+
+    def test_should_compile_suffix_forms(self):
+        def realize(word, form_str):
+            flags = Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(word)
+            return Phonetics.compile_suffix_form(form_str)[Phonetics.get_phonetic_class(flags)]
+
+        self.assertEqual(realize(u'kitap', u'+yI'), (u'ı', True))
+        self.assertEqual(realize(u'elma', u'+yI'), (u'yı', False))
+        self.assertEqual(realize(u'gül', u'+yI'), (u'ü', True))
+        self.assertEqual(realize(u'kitap', u'dA'), (u'ta', False))
+        self.assertEqual(realize(u'ev', u'dA'), (u'de', False))
+        self.assertEqual(realize(u'kitap', u'lArI!'), (u'ları', False))
+        self.assertEqual(realize(u'ev', u''), (u'', False))
+
+        self.assertTrue(Phonetics.compile_suffix_form(u'+Iyor') is Phonetics.compile_suffix_form(u'+Iyor'))
+
+        for word in [u'kitap', u'elma', u'gül', u'ev', u'sırap', u'armut', u'kalem', u'ördek']:
+            flags = Phonetics.calculate_phonetic_attribute_flags_of_plain_sequence(word)
+            for form_str in [u'+yI', u'+Iyor', u'dIr', u'+yAcAk', u'lArI!', u'cI', u'Im']:
+                fitting_suffix_form, voicing_possible = Phonetics.compile_suffix_form(form_str)[Phonetics.get_phonetic_class(flags)]
+                modified_word = Phonetics.voice_last_letter(word, flags, False) if voicing_possible else word
+                self.assertEqual((modified_word, fitting_suffix_form), Phonetics.apply_flags(word, flags, form_str))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file